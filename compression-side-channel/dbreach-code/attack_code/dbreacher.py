@@ -69,3 +69,20 @@ class DBREACHer:
 
     def getCompressibilityScoreOfCurrentGuess(self) -> float:
         raise NotImplementedError
+
+    # ---- 공통 구현(자식에서 더 빠른 방식으로 덮어쓸 수 있음) ----
+    def amplifyUntilShrunk(self, lo_hint=None, hi_hint=None, max_bytes=None) -> bool:
+        """
+        shrink될 때까지 증폭. 기본은 +1B 선형 스텝.
+        lo_hint/hi_hint: shrink 지점 예상 구간(탐색형 구현에서만 사용).
+        max_bytes: max_bytes까지 증폭해도 안 줄면 멈추고 False(가지치기용).
+        증폭 상한에 닿으면 RuntimeError.
+        """
+        shrunk = False
+        added = 0
+        while not shrunk:
+            if max_bytes is not None and added >= max_bytes:
+                return False
+            shrunk = self.addCompressibleByteAndCheckIfShrunk()
+            added += 1
+        return shrunk
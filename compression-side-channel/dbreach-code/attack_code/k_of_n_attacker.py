@@ -1,19 +1,44 @@
+import heapq
+import os
 import dbreacher
 
+# 1이면 기본으로 branch-and-bound 가지치기 모드(kOfNAttacker(pruned=...)가 우선)
+PRUNE = os.getenv("DBREACH_KOFN_PRUNE", "0") == "1"
+
 class kOfNAttacker():
-    def __init__(self, k, dbreacher : dbreacher.DBREACHer, guesses, tiesOn):
+    def __init__(self, k, dbreacher : dbreacher.DBREACHer, guesses, tiesOn, pruned = None):
         self.k = k
         self.n = len(guesses)
         self.guesses = guesses
         self.dbreacher = dbreacher
         self.compressibilityScores = dict()
         self.tiesOn = tiesOn
+        # 가지치기 모드: 현재 k번째 점수(= k번째로 작은 bytesShrunk)보다 더 증폭해야 하는 guess는
+        # top-k에 들 수 없으므로 그 지점에서 증폭을 멈추고 prunedGuesses[guess] = 당시 bound로 기록.
+        # bound를 넘긴(>) 경우만 자르므로 tiesOn 여부와 관계없이 getTopKGuesses 결과는 동일.
+        self.pruned = PRUNE if pruned is None else pruned
+        self.prunedGuesses = dict()
+        self._bestBytes = []  # k개 최소 bytesShrunk의 max-heap(음수)
 
-    def setUp(self) -> bool: 
+    def setUp(self) -> bool:
         self.compressibilityScores = dict()
+        self.prunedGuesses = dict()
+        self._bestBytes = []
         success = self.dbreacher.reinsertFillers()
         return success
 
+    def _bound(self):
+        """top-k 경계 bytesShrunk. 아직 k개가 측정되지 않았으면 None."""
+        if self.pruned and len(self._bestBytes) >= self.k:
+            return -self._bestBytes[0]
+        return None
+
+    def _recordBytes(self, b):
+        if len(self._bestBytes) < self.k:
+            heapq.heappush(self._bestBytes, -b)
+        elif b < -self._bestBytes[0]:
+            heapq.heapreplace(self._bestBytes, -b)
+
     def tryAllGuesses(self, verbose = False) -> bool:
         for guess in self.guesses:
             shrunk = self.dbreacher.insertGuessAndCheckIfShrunk(guess)
@@ -21,12 +46,18 @@ class kOfNAttacker():
                 if verbose:
                     print("table shrunk too early on guess " + guess)
                 return False
-            while not shrunk:
-                shrunk = self.dbreacher.addCompressibleByteAndCheckIfShrunk()
+            bound = self._bound()
+            if not self.dbreacher.amplifyUntilShrunk(max_bytes=bound):
+                if verbose:
+                    print("\"" + guess + "\" worse than bound " + str(bound))
+                self.prunedGuesses[guess] = bound
+                continue
             score = self.dbreacher.getCompressibilityScoreOfCurrentGuess()
             if verbose:
                 print("\"" + guess + "\" score = " + str(score))
             self.compressibilityScores[guess] = score
+            if self.pruned:
+                self._recordBytes(self.dbreacher.getBytesShrunkForCurrentGuess())
         return True
 
     def getTopKGuesses(self):
@@ -41,4 +72,3 @@ class kOfNAttacker():
                     break
 
         return winners
-
@@ -0,0 +1,74 @@
+# mongo_flush_bench.py
+"""
+MongoDB flush 전략(fsync_lock / fsync / inotify)별 update 한 번당 지연 비교.
+
+전략마다 컬렉션을 새로 만들고 문서 하나를 update_one → flush_and_wait 하는 것을 반복하면서
+  - update + flush 지연(ms): mean / p50 / p95 / max
+  - 대기 상한을 넘긴 횟수(timeouts)
+  - --settle 초 뒤 다시 읽은 할당 크기가 flush 직후 값과 다른 비율(stale, 너무 일찍 깬 경우)
+을 출력한다.
+
+사용: python3 mongo_flush_bench.py [--updates 100] [--modes fsync_lock fsync inotify] [--csv out.csv]
+"""
+import argparse
+import random
+import string
+import time
+
+import utils.mongodb_utils as utils
+
+parser = argparse.ArgumentParser(description="Compare per-update latency of MongoDB flush strategies")
+parser.add_argument("--db", default="test")
+parser.add_argument("--table", default="flush_bench")
+parser.add_argument("--modes", nargs="+", default=list(utils.MONGO_FLUSH_STRATEGIES),
+                    choices=list(utils.MONGO_FLUSH_STRATEGIES))
+parser.add_argument("--updates", type=int, default=100, help="updates (one flush each) per strategy")
+parser.add_argument("--doc-size", type=int, default=2000, help="length of the updated document value")
+parser.add_argument("--settle", type=float, default=0.0,
+                    help="if > 0, re-read the size after this many seconds to count stale reads")
+parser.add_argument("--csv", default=None, help="optional per-update CSV output")
+args = parser.parse_args()
+
+rng = random.Random(0)
+alphabet = string.ascii_letters + string.digits + string.punctuation
+
+out = open(args.csv, "w") if args.csv else None
+if out:
+    out.write("mode,update,latency_ms,alloc,stale\n")
+
+print("mode,updates,mean_ms,p50_ms,p95_ms,max_ms,timeouts,stale")
+for mode in args.modes:
+    control = utils.MongoDBController(args.db, flush_mode=mode)
+    control.drop_table(args.table)
+    control.create_basic_table(args.table)
+    control.insert_row(args.table, 1, ''.join(rng.choices(alphabet, k=args.doc_size)))
+    control.flush_and_wait(args.table)
+
+    lat = []
+    stale = 0
+    for i in range(args.updates):
+        value = ''.join(rng.choices(alphabet, k=args.doc_size))
+        t0 = time.perf_counter()
+        control.update_row(args.table, 1, value)
+        control.flush_and_wait(args.table)
+        dt = (time.perf_counter() - t0) * 1e3
+        lat.append(dt)
+        size = control.get_table_size_alloc(args.table)
+        late = False
+        if args.settle > 0:
+            time.sleep(args.settle)
+            late = control.get_table_size_alloc(args.table) != size
+            stale += late
+        if out:
+            out.write(f"{mode},{i},{dt:.3f},{size},{int(late)}\n")
+
+    lat.sort()
+    n = len(lat)
+    stale_s = f"{stale / n:.3f}" if args.settle > 0 else ""
+    print(f"{mode},{n},{sum(lat) / n:.2f},{lat[n // 2]:.2f},{lat[min(n - 1, int(n * 0.95))]:.2f},"
+          f"{lat[-1]:.2f},{control.flush_timeouts},{stale_s}")
+    control.drop_table(args.table)
+    control.close()
+
+if out:
+    out.close()
@@ -0,0 +1,210 @@
+# multi_table_engine.py
+"""
+여러 victim 테이블에서 독립 trial N개를 lock-step으로 돌리는 엔진.
+
+FLUSH TABLES는 서버 전역이므로, 각 레인(테이블 + DBREACHerImpl + attacker)이
+flush_and_wait를 부르면 바로 flush하지 않고 모든 활성 레인이 flush를 요청할 때까지 기다린다.
+마지막 레인이 도착하면 FLUSH를 한 번만 실행하고 전부 깨운다.
+adaptive flush는 요청한 레인 전원의 테이블(.ibd)이 반영될 때까지 기다린다(tables=).
+→ 한 번의 flush 비용으로 N개 테이블의 업데이트가 반영되고, 각 레인은 자기 .ibd만 stat 한다.
+
+레인은 setUp → tryAllGuesses 재시도 루프를 상태기계로 돌리며, 한 레인의 세팅 실패/재시도나
+종료는 다른 레인을 막지 않는다(끝난 레인은 배리어에서 빠짐).
+"""
+import threading
+import time
+
+
+class _FlushBarrier:
+    def __init__(self, control):
+        self.control = control
+        self.cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.tables = []
+        self.generation = 0
+        self.flushes = 0       # 실제 실행된 FLUSH 수
+        self.requests = 0      # 레인들이 요청한 flush 수
+
+    def join(self):
+        with self.cond:
+            self.active += 1
+
+    def leave(self):
+        with self.cond:
+            self.active -= 1
+            self._maybe_flush()
+
+    def wait(self, tablename):
+        with self.cond:
+            gen = self.generation
+            self.waiting += 1
+            self.requests += 1
+            self.tables.append(tablename)
+            self._maybe_flush()
+            while gen == self.generation:
+                self.cond.wait()
+
+    def _maybe_flush(self):
+        # cond 보유 상태에서 호출. 활성 레인 전원이 대기 중이면 SQL 쓰기도 없으므로 안전.
+        if self.waiting == 0 or self.waiting < self.active:
+            return
+        # 첫 테이블만 기다리면 adaptive 모드에서 나머지 레인이 stale 크기를 읽으므로 전부 넘긴다
+        self.control.flush_and_wait(self.tables[0], tables=list(dict.fromkeys(self.tables)))
+        self.flushes += 1
+        self.waiting = 0
+        self.tables = []
+        self.generation += 1
+        self.cond.notify_all()
+
+
+class _LaneController:
+    """레인별 컨트롤러 프록시: SQL은 공유 연결에 직렬화, flush는 배리어로 합침."""
+
+    def __init__(self, control, barrier: _FlushBarrier, sql_lock: threading.Lock):
+        self._control = control
+        self._barrier = barrier
+        self._lock = sql_lock
+
+    def __getattr__(self, name):
+        attr = getattr(self._control, name)
+        if not callable(attr):
+            return attr
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+        return locked
+
+    def flush_and_wait(self, tablename, sleep_sec=0.2):
+        self._barrier.wait(tablename)
+
+
+class TrialLane:
+    """
+    테이블 하나에 대한 trial 상태기계.
+    상태: "setup" → "measure" → "done" | "failed"
+    setUp 실패 / tryAllGuesses 실패(경계 깨짐, 증폭 상한)는 setup으로 되돌아가 재시도.
+    """
+
+    def __init__(self, name: str, attacker, max_setup_attempts: int = 10, verbose: bool = False):
+        self.name = name
+        self.attacker = attacker
+        self.max_setup_attempts = max_setup_attempts
+        self.verbose = verbose
+        self.state = "setup"
+        self.attempts = 0
+        self.error = None
+        self.elapsed = 0.0
+
+    def step(self):
+        """상태 하나 진행."""
+        if self.state == "setup":
+            if self.attempts >= self.max_setup_attempts:
+                self.state = "failed"
+                return
+            self.attempts += 1
+            self.state = "measure" if self.attacker.setUp() else "setup"
+        elif self.state == "measure":
+            try:
+                ok = self.attacker.tryAllGuesses(verbose=self.verbose)
+            except RuntimeError as e:
+                self.error = str(e)
+                ok = False
+            self.state = "done" if ok else "setup"
+
+    def run(self):
+        t0 = time.time()
+        try:
+            while self.state not in ("done", "failed"):
+                self.step()
+        except Exception as e:
+            self.state = "failed"
+            self.error = repr(e)
+        self.elapsed = time.time() - t0
+
+
+class MultiTableEngine:
+    """
+    사용법:
+        engine = MultiTableEngine(control)
+        for i in range(N):
+            ctl = engine.lane_controller()
+            ctl.drop_table(f"victimtable_{i}"); ctl.create_basic_table(...)
+            dbreach = dbreacher_impl.DBREACHerImpl(ctl, f"victimtable_{i}", ...)
+            engine.add_lane(f"victimtable_{i}", k_of_n_attacker.kOfNAttacker(...))
+        lanes = engine.run()
+    """
+
+    def __init__(self, control):
+        self.control = control
+        self.sql_lock = threading.Lock()
+        self.barrier = _FlushBarrier(control)
+        self.lanes = []
+
+    def lane_controller(self) -> _LaneController:
+        return _LaneController(self.control, self.barrier, self.sql_lock)
+
+    def add_lane(self, name: str, attacker, max_setup_attempts: int = 10, verbose: bool = False) -> TrialLane:
+        lane = TrialLane(name, attacker, max_setup_attempts, verbose)
+        self.lanes.append(lane)
+        return lane
+
+    def _run_lane(self, lane: TrialLane):
+        try:
+            lane.run()
+        finally:
+            self.barrier.leave()
+
+    def run(self):
+        # 스레드 시작 전에 전원 등록해야 먼저 도착한 레인이 혼자 flush하지 않음
+        for _ in self.lanes:
+            self.barrier.join()
+        threads = [threading.Thread(target=self._run_lane, args=(lane,), name=lane.name, daemon=True)
+                   for lane in self.lanes]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        return self.lanes
+
+    def report(self) -> dict:
+        return {
+            "lanes": len(self.lanes),
+            "done": sum(1 for l in self.lanes if l.state == "done"),
+            "failed": sum(1 for l in self.lanes if l.state == "failed"),
+            "flushes": self.barrier.flushes,
+            "flush_requests": self.barrier.requests,
+        }
+
+
+if __name__ == "__main__":
+    # 시뮬레이터로 k-of-n 레인 N개를 돌려보는 데모
+    import random
+    import string
+    import sys
+    import dbreacher_impl
+    import k_of_n_attacker
+    from utils.simulated_mariadb import SimulatedMariaDBController
+
+    num_lanes = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    maxRowSize = 200
+    fillerCharSet = string.printable.replace(string.ascii_lowercase, '').replace('*', '')
+
+    engine = MultiTableEngine(SimulatedMariaDBController())
+    secrets = []
+    for i in range(num_lanes):
+        table = f"victimtable_{i}"
+        ctl = engine.lane_controller()
+        ctl.drop_table(table)
+        ctl.create_basic_table(table, varchar_len=maxRowSize, compressed=True, encrypted=True)
+        guesses = ["".join(random.choices(string.ascii_lowercase, k=random.randint(10, 20))) for _ in range(20)]
+        ctl.insert_row(table, 1, guesses[0])
+        secrets.append(guesses[0])
+        dbreach = dbreacher_impl.DBREACHerImpl(ctl, table, 100, maxRowSize, fillerCharSet, ord('*'))
+        engine.add_lane(table, k_of_n_attacker.kOfNAttacker(1, dbreach, guesses, True))
+
+    for lane, secret in zip(engine.run(), secrets):
+        top = lane.attacker.getTopKGuesses() if lane.state == "done" else []
+        print(lane.name, lane.state, lane.attempts, [g for _, g in top] == [secret])
+    print(engine.report())
@@ -0,0 +1,77 @@
+# size_oracle_bench.py
+"""
+크기 오라클(stat / fstat / sql) 지연과 일치도 비교.
+
+테이블에 filler 행을 하나씩 넣으면서 flush 후 각 오라클로 할당 크기를 여러 번 읽고
+  - 오라클별 조회 지연(us): mean / p50 / p95
+  - 기준(stat 가능하면 stat, 아니면 sql) 대비 값이 일치한 비율
+을 출력한다. datadir가 마운트되지 않은 호스트에선 stat/fstat은 자동으로 건너뜀.
+
+사용: python3 size_oracle_bench.py [--rows 60] [--reads 20] [--db flask_db] [--csv out.csv]
+"""
+import argparse
+import time
+
+import utils.mariadb_utils as utils
+
+parser = argparse.ArgumentParser(description="Compare latency/agreement of table size oracles")
+parser.add_argument("--db", default="flask_db")
+parser.add_argument("--table", default="oracle_bench")
+parser.add_argument("--rows", type=int, default=60, help="number of filler rows to insert (one measurement step each)")
+parser.add_argument("--reads", type=int, default=20, help="reads per oracle per step")
+parser.add_argument("--csv", default=None, help="optional per-read CSV output")
+args = parser.parse_args()
+
+control = utils.MariaDBController(args.db)
+oracles = [utils.make_size_oracle(name, control) for name in utils.SIZE_ORACLES]
+
+control.drop_table(args.table)
+control.create_basic_table(args.table, varchar_len=200, compressed=True, encrypted=True)
+control.flush_and_wait(args.table)
+
+usable = []
+for o in oracles:
+    try:
+        o.allocated(args.table)
+        usable.append(o)
+    except OSError as e:
+        print(f"[BENCH] skip {o.name}: {e}")
+if not usable:
+    raise SystemExit("no usable size oracle")
+ref = usable[0]
+
+latencies = {o.name: [] for o in usable}
+agree = {o.name: 0 for o in usable}
+steps = 0
+out = open(args.csv, "w") if args.csv else None
+if out:
+    out.write("step,oracle,value,latency_us\n")
+
+for step in range(args.rows):
+    control.insert_row(args.table, step, utils.get_filler_str(200))
+    control.flush_and_wait(args.table)
+    values = {}
+    for o in usable:
+        for _ in range(args.reads):
+            t0 = time.perf_counter()
+            v = o.allocated(args.table)
+            dt = (time.perf_counter() - t0) * 1e6
+            latencies[o.name].append(dt)
+            if out:
+                out.write(f"{step},{o.name},{v},{dt:.1f}\n")
+        values[o.name] = v
+    steps += 1
+    for o in usable:
+        agree[o.name] += values[o.name] == values[ref.name]
+
+print("oracle,mean_us,p50_us,p95_us,agreement_vs_" + ref.name)
+for o in usable:
+    lat = sorted(latencies[o.name])
+    n = len(lat)
+    print(f"{o.name},{sum(lat) / n:.1f},{lat[n // 2]:.1f},{lat[min(n - 1, int(n * 0.95))]:.1f},{agree[o.name] / steps:.3f}")
+
+for o in oracles:
+    o.close()
+if out:
+    out.close()
+control.drop_table(args.table)
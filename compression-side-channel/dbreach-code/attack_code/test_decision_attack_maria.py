@@ -1,4 +1,6 @@
 import utils.mariadb_utils as utils
+import utils.op_profile as op_profile
+from utils.table_pool import TablePool
 import dbreacher
 import dbreacher_impl
 import decision_attacker
@@ -6,6 +8,7 @@ import random
 import string
 import time
 import sys
+import os
 import numpy as np
 maxRowSize = 200
 
@@ -35,46 +38,84 @@ if sys.argv[1] == "--emails":
             email = line.strip().lower()
             possibilities.append(email)
 
+fillerCharSet = string.printable.replace(string.ascii_lowercase, '').replace('*', '')
+if sys.argv[1] == "--emails":
+    fillerCharSet = fillerCharSet.replace('_', '').replace('.', '').replace('@', '')
+
+# 압축 알고리즘/레벨: 지정하면 trial마다 SET GLOBAL로 맞추고 SHOW VARIABLES로 확인(미지정이면 서버 설정)
+COMPRESSION_ALGO = os.getenv("DBREACH_COMPRESSION_ALGO")
+COMPRESSION_LEVEL = os.getenv("DBREACH_COMPRESSION_LEVEL")
+
+def apply_compression():
+    if not COMPRESSION_ALGO:
+        return
+    level = int(COMPRESSION_LEVEL) if COMPRESSION_LEVEL else None
+    active = control.set_compression(COMPRESSION_ALGO, level)
+    print("[ENV] " + str(active), file=sys.stderr)
+
+apply_compression()
+
+# DBREACH_TABLE_POOL=N(>0)이면 다음 N개 trial의 테이블을 백그라운드 연결에서 미리 준비
+POOL_DEPTH = int(os.getenv("DBREACH_TABLE_POOL", "0"))
+
 print("true_label,num_secrets,b_no,b_guess,b_yes,setup_time,per_guess_time")
 
 secrets_to_try = [1, 20, 40, 60, 80, 100, 120, 140, 160, 180, 200, 220, 240]
 secrets_to_try.reverse()
+jobs = []
 for num_secrets in secrets_to_try:
     random.shuffle(possibilities)
     for trial in range(0, 200, num_secrets):
-        success = False
+        picked = [possibilities[(trial + i) % len(possibilities)] for i in range(num_secrets * 2)]
+        jobs.append((num_secrets, picked[:num_secrets], picked[num_secrets:]))
+
+def prepare(ctl, tbl, job):
+    """시크릿 삽입 + 경계 세팅까지. (attacker, dbreacher, setup_time) 반환."""
+    num_secrets, secrets, wrong_guesses = job
+    for secret_idx, secret in enumerate(secrets):
+        ctl.insert_row(tbl, secret_idx, secret)
+    dbreacher = dbreacher_impl.DBREACHerImpl(ctl, tbl, num_secrets, maxRowSize, fillerCharSet, ord('*'))
+    attacker = decision_attacker.decisionAttacker(dbreacher, secrets + wrong_guesses)
+    setupStart = time.time()
+    while not attacker.setUp():
+        setupStart = time.time()
+    return attacker, dbreacher, time.time() - setupStart
+
+def prepared_trials():
+    if POOL_DEPTH > 0:
+        pool = TablePool(lambda: utils.MariaDBController("flask_db"), prepare, jobs, depth=POOL_DEPTH)
+        for job, tbl, (attacker, dbreacher, setup_time) in pool:
+            apply_compression()
+            pool.adopt(dbreacher, control)
+            yield job, attacker, setup_time
+            pool.release(tbl)
+        pool.close()
+        return
+    for job in jobs:
+        apply_compression()
         control.drop_table(table)
         control.create_basic_table(table,
             varchar_len=maxRowSize,
             compressed=True,
             encrypted=True)
-        guesses = []
-        correct_guesses = set()
-        for secret_idx in range(num_secrets):
-            secret = possibilities[(trial + secret_idx) % len(possibilities)]
-            control.insert_row(table, secret_idx, secret)
-            guesses.append(secret)
-            correct_guesses.add(secret)
-
-        for secret_idx in range(num_secrets, num_secrets*2):
-            wrong_guess = possibilities[(trial + secret_idx) % len(possibilities)]
-            guesses.append(wrong_guess)
-
-        fillerCharSet = string.printable.replace(string.ascii_lowercase, '').replace('*', '')
-        if sys.argv[1] == "--emails":
-            fillerCharSet = fillerCharSet.replace('_', '').replace('.', '').replace('@', '')
-        dbreacher = dbreacher_impl.DBREACHerImpl(control, table, num_secrets, maxRowSize, fillerCharSet, ord('*'))
-
-        attacker = decision_attacker.decisionAttacker(dbreacher, guesses)
-        while not success:
-            setupStart = time.time()
-            success = attacker.setUp()
-            setupEnd = time.time()
-            if success:
-                success = attacker.tryAllGuesses()
-            end = time.time()
-        refScores = attacker.getGuessAndReferenceScores()
-        for guess, score_tuple in refScores:
-            label = 1 if guess in correct_guesses else 0
-            print(str(label)+","+str(num_secrets)+","+str(score_tuple[0])+","+str(score_tuple[1])+","+str(score_tuple[2]) +","+str(setupEnd - setupStart)+","+str((end-setupEnd)/num_secrets))
+        attacker, _, setup_time = prepare(control, table, job)
+        yield job, attacker, setup_time
 
+for (num_secrets, secrets, _), attacker, setup_time in prepared_trials():
+    correct_guesses = set(secrets)
+    setupEnd = time.time()
+    success = attacker.tryAllGuesses()
+    end = time.time()
+    while not success:
+        setupStart = time.time()
+        success = attacker.setUp()
+        setupEnd = time.time()
+        setup_time = setupEnd - setupStart
+        if success:
+            success = attacker.tryAllGuesses()
+        end = time.time()
+    refScores = attacker.getGuessAndReferenceScores()
+    for guess, score_tuple in refScores:
+        label = 1 if guess in correct_guesses else 0
+        print(str(label)+","+str(num_secrets)+","+str(score_tuple[0])+","+str(score_tuple[1])+","+str(score_tuple[2]) +","+str(setup_time)+","+str((end-setupEnd)/num_secrets))
+    op_profile.get_profiler().end_trial(f"k={num_secrets}")
@@ -1,11 +1,14 @@
 # test_k_of_n_attack_maria.py (교체본)
 import utils.mariadb_utils as utils
+import utils.attack_log as attack_log
+import utils.op_profile as op_profile
 import dbreacher_impl
 import decision_attacker
 import random
 import string
 import time
 import sys
+import os
 
 # ----------------- 인자 파싱(안전) -----------------
 mode = "--random"           # 기본 모드
@@ -34,6 +37,20 @@ control = utils.MariaDBController(
     container_datadir="/var/lib/mysql",
 )
 
+# 압축 알고리즘/레벨: 지정하면 trial마다 SET GLOBAL로 맞추고 SHOW VARIABLES로 확인
+# (run_k_of_n_experiments.py가 조합별로 넘겨줌, 미지정이면 서버 설정 그대로)
+COMPRESSION_ALGO = os.getenv("DBREACH_COMPRESSION_ALGO")
+COMPRESSION_LEVEL = os.getenv("DBREACH_COMPRESSION_LEVEL")
+
+def apply_compression():
+    if not COMPRESSION_ALGO:
+        return
+    level = int(COMPRESSION_LEVEL) if COMPRESSION_LEVEL else None
+    active = control.set_compression(COMPRESSION_ALGO, level)
+    attack_log.get_logger().info("ENV", "%s", active)
+
+apply_compression()
+
 # 초기 테이블(압축+암호화) — 첫 실행 시점에 한번 만들어 선행 검증
 control.drop_table(table)
 control.create_basic_table(
@@ -74,14 +91,18 @@ if mode == "--emails":
     fset = fset - {'_', '.', '@'}
 fillerCharSet = ''.join(sorted(fset))
 
-print("records_on_page,k,accuracy_n_500,accuracy_n_750,accuracy_n_1000,accuracy_n_1250,accuracy_n_1500,setup_time,per_guess_time")
+# 결과 CSV는 로그와 분리된 스트림으로(DBREACH_CSV_OUT, 기본 stdout)
+results = attack_log.results()
+results.write_row("records_on_page", "k", "accuracy_n_500", "accuracy_n_750", "accuracy_n_1000",
+                  "accuracy_n_1250", "accuracy_n_1500", "setup_time", "per_guess_time")
 
 for num_secrets in secrets_to_try:
     random.shuffle(possibilities)
 
     # trial 루프 (원 코드대로 1회)
     for trial in range(1):
-        # 매 trial마다 테이블을 다시 깨끗하게 (압축+암호화)
+        # 매 trial마다 압축 설정 확인 후 테이블을 다시 깨끗하게 (압축+암호화, 새 설정으로 재압축)
+        apply_compression()
         control.drop_table(table)
         control.create_basic_table(
             table,
@@ -159,8 +180,10 @@ for num_secrets in secrets_to_try:
         end = time.time()
         per_guess_time = (end - setupEnd) / max(len(guesses), 1)
 
-        print(
-            f"{num_secrets},{num_secrets},"
-            f"{accuracy_500},{accuracy_750},{accuracy_1000},{accuracy_1250},{accuracy_1500},"
-            f"{setupEnd - setupStart},{per_guess_time}"
-        )
+        results.write_row(num_secrets, num_secrets,
+                          accuracy_500, accuracy_750, accuracy_1000, accuracy_1250, accuracy_1500,
+                          setupEnd - setupStart, per_guess_time)
+        # 세팅 방식별(row/bulk/restore) 재세팅 시간
+        attack_log.get_logger().info("SETUP", "%s", dbreach.setupReport())
+        # DBREACH_PROFILE=1이면 이 trial의 연산별 지연을 DBREACH_PROFILE_CSV에 기록
+        op_profile.get_profiler().end_trial(f"k={num_secrets};trial={trial}")
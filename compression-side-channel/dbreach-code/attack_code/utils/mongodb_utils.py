@@ -0,0 +1,418 @@
+# utils/mongodb_utils.py
+"""
+MongoDB(WiredTiger) 컨트롤러: MariaDBController와 같은 메서드 이름으로 컬렉션/문서를 다룬다.
+
+  테이블 = 컬렉션, 행 = {'id': idx, 'value': data} 문서
+  크기 신호 = 컬렉션 .wt 파일의 할당 바이트(st_blocks*512, `ls -s --block-size=1`과 같은 값)
+
+.wt 경로는 collstats의 wiredTiger.uri에서 한 번만 구해 캐시하고, fd를 열어 둔 채 os.fstat으로 읽는다
+(측정마다 ls 프로세스를 fork하지 않음). DROP/재생성 시에는 경로와 fd를 버리고 다시 구한다.
+
+압축 알고리즘은 컬렉션 생성 시 configString(block_compressor=...)으로 정해지므로
+set_compression()은 다음 create_basic_table()부터 적용된다.
+
+flush 전략(DBREACH_MONGO_FLUSH_MODE):
+  fsync_lock  기존 방식(기본). fsync(lock=True) → .wt mtime을 0.1s × 30회 폴링 → fsyncUnlock
+  fsync       전역 락 없이 fsync → mtime을 지수 백오프로 폴링(flush_timeout까지)
+  inotify     전역 락 없이 fsync, .wt에 건 inotify watch로 바뀌는 순간 깨어남.
+              inotify를 못 쓰는 환경(비 Linux, watch 한도 초과 등)이면 fsync 폴링으로 대체
+  락 없는 두 방식은 실제 mongod에서 mongo_flush_bench.py --settle로 stale 읽기가 없다고 확인되기 전까지 opt-in.
+"""
+import ctypes
+import os
+import select
+import struct
+import time
+
+from pymongo import MongoClient, UpdateOne
+
+from utils import op_profile
+
+# WiredTiger 데이터 디렉터리(컨테이너의 mongod --dbpath, 읽기 전용 마운트면 충분)
+MONGO_DBPATH = os.getenv("DBREACH_MONGO_DBPATH", "/var/lib/mongodb")
+# snappy | zlib | zstd | none (WiredTiger 기본값은 snappy)
+MONGO_COMPRESSOR = os.getenv("DBREACH_MONGO_COMPRESSOR", "snappy")
+# fsync 후 .wt mtime 변화 폴링(기존 스크립트와 같은 0.1s × 30회)
+FLUSH_POLL_S = 0.1
+FLUSH_MAX_POLLS = 30
+# flush 전략과 변화 대기 상한(기존 폴링 상한 3s와 같음). 기본은 검증된 기존 방식(fsync_lock)
+MONGO_FLUSH_MODE = os.getenv("DBREACH_MONGO_FLUSH_MODE", "fsync_lock")
+MONGO_FLUSH_TIMEOUT_S = float(os.getenv("DBREACH_MONGO_FLUSH_TIMEOUT_S", "3.0"))
+FLUSH_POLL_MIN_S = 0.001   # fsync 폴링 첫 간격
+FLUSH_POLL_MAX_S = 0.05    # 백오프 상한
+INOTIFY_QUIET_S = 0.002    # 마지막 이벤트 뒤 이만큼 조용해야 체크포인트 쓰기가 끝난 것으로 봄
+
+_STATS_URI_PREFIX = "statistics:table:"
+
+_prof = op_profile.get_profiler()
+
+
+# ----- inotify(ctypes, 추가 의존성 없음) -----
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HDR = struct.Struct("iIII")   # wd, mask, cookie, len (뒤에 name[len])
+
+
+class Inotify:
+    """파일 watch 몇 개를 위한 최소 inotify 래퍼. 쓸 수 없으면 생성 시 OSError."""
+
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE
+
+    def __init__(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        try:
+            self._add_watch = libc.inotify_add_watch
+            self._rm_watch = libc.inotify_rm_watch
+            init1 = libc.inotify_init1
+        except AttributeError:
+            raise OSError("inotify not available") from None
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+
+    def add(self, path) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e), path)
+        return wd
+
+    def remove(self, wd):
+        self._rm_watch(self.fd, wd)   # 파일이 이미 지워졌으면 커널이 watch를 없앴으므로 실패해도 무시
+
+    def read(self) -> set:
+        """쌓인 이벤트를 전부 읽어 wd 집합으로 반환(없으면 빈 집합)."""
+        wds = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return wds
+            off = 0
+            while off < len(buf):
+                wd, _mask, _cookie, n = _EVENT_HDR.unpack_from(buf, off)
+                wds.add(wd)
+                off += _EVENT_HDR.size + n
+
+    def wait(self, timeout) -> bool:
+        return bool(select.select([self.fd], [], [], max(0.0, timeout))[0])
+
+    def close(self):
+        os.close(self.fd)
+
+
+# ----- flush 전략 -----
+class FsyncLockFlush:
+    """기존 스크립트의 flush_and_wait_for_change: 락을 건 채 mtime 폴링."""
+    name = "fsync_lock"
+
+    def __init__(self, ctrl):
+        self.ctrl = ctrl
+
+    def flush(self, tablename, old_mtime, sleep_sec=FLUSH_POLL_S):
+        fd = self.ctrl._fd(tablename)
+        self.ctrl._fsync(lock=True)
+        try:
+            polls = 0
+            while os.fstat(fd).st_mtime_ns == old_mtime:
+                polls += 1
+                if polls > FLUSH_MAX_POLLS:
+                    return False
+                self.ctrl._sleep(sleep_sec)
+        finally:
+            t_sql = _prof.now()
+            self.ctrl.client.admin.command("fsyncUnlock")
+            _prof.record("sql", t_sql)
+        return True
+
+    def forget(self, tablename):
+        pass
+
+    def close(self):
+        pass
+
+
+class FsyncPollFlush:
+    """락 없이 fsync 후 mtime을 1ms부터 두 배씩 늘려 가며 폴링."""
+    name = "fsync"
+
+    def __init__(self, ctrl):
+        self.ctrl = ctrl
+
+    def flush(self, tablename, old_mtime, sleep_sec=None):
+        fd = self.ctrl._fd(tablename)
+        self.ctrl._fsync()
+        deadline = time.perf_counter() + self.ctrl.flush_timeout
+        delay = FLUSH_POLL_MIN_S
+        while True:
+            t_stat = _prof.now()
+            changed = os.fstat(fd).st_mtime_ns != old_mtime
+            _prof.record("stat", t_stat)
+            if changed:
+                return True
+            if time.perf_counter() >= deadline:
+                return False
+            self.ctrl._sleep(delay)
+            delay = min(delay * 2, FLUSH_POLL_MAX_S)
+
+    def forget(self, tablename):
+        pass
+
+    def close(self):
+        pass
+
+
+class InotifyFlush:
+    """
+    락 없이 fsync, .wt 파일 inotify 이벤트로 완료 감지.
+    watch는 fsync 전에 걸려 있으므로 fsync 도중 쓰인 블록도 이벤트 큐에 남는다.
+    fsync가 돌아온 시점에 이미 바뀌었으면 체크포인트가 끝난 것이므로 바로 반환하고,
+    그 뒤에 바뀐 경우엔 블록을 나눠 쓰는 중일 수 있어 INOTIFY_QUIET_S 동안 이벤트가 없을 때 반환.
+    """
+    name = "inotify"
+
+    def __init__(self, ctrl):
+        self.ctrl = ctrl
+        self._wds = {}   # 컬렉션 -> watch descriptor
+        try:
+            self.inotify = Inotify()
+        except OSError:
+            self.inotify = None
+        self._fallback = FsyncPollFlush(ctrl)
+
+    def flush(self, tablename, old_mtime, sleep_sec=None):
+        wd = self._watch(tablename)
+        if wd is None:
+            return self._fallback.flush(tablename, old_mtime)
+        self.inotify.read()   # 이전 flush 이후 쌓인 이벤트 버림
+        self.ctrl._fsync()
+        fd = self.ctrl._fd(tablename)
+        deadline = time.perf_counter() + self.ctrl.flush_timeout
+        waited = False
+        while True:
+            t_stat = _prof.now()
+            changed = wd in self.inotify.read() or os.fstat(fd).st_mtime_ns != old_mtime
+            _prof.record("stat", t_stat)
+            if changed:
+                if waited:
+                    self._wait_quiet(wd, deadline)
+                return True
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            t_wait = _prof.now()
+            self.inotify.wait(remaining)
+            _prof.record("sleep", t_wait)
+            waited = True
+
+    def _wait_quiet(self, wd, deadline):
+        t_wait = _prof.now()
+        while time.perf_counter() < deadline and self.inotify.wait(INOTIFY_QUIET_S):
+            if wd not in self.inotify.read():
+                break
+        _prof.record("sleep", t_wait)
+
+    def _watch(self, tablename):
+        if self.inotify is None:
+            return None
+        wd = self._wds.get(tablename)
+        if wd is None:
+            try:
+                wd = self.inotify.add(self.ctrl.collection_path(tablename))
+            except OSError:
+                return None
+            self._wds[tablename] = wd
+        return wd
+
+    def forget(self, tablename):
+        wd = self._wds.pop(tablename, None)
+        if wd is not None:
+            self.inotify.remove(wd)
+
+    def close(self):
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+        self._wds.clear()
+
+
+MONGO_FLUSH_STRATEGIES = {s.name: s for s in (FsyncLockFlush, FsyncPollFlush, InotifyFlush)}
+
+
+def make_flush_strategy(name, ctrl):
+    try:
+        return MONGO_FLUSH_STRATEGIES[name](ctrl)
+    except KeyError:
+        raise ValueError(f"알 수 없는 flush 전략: {name} (가능: {', '.join(MONGO_FLUSH_STRATEGIES)})") from None
+
+
+class MongoDBController:
+    def __init__(
+        self,
+        db: str = "test",
+        host: str = None,
+        port: int = None,
+        dbpath: str = None,
+        block_compressor: str = None,
+        flush_mode: str = None,
+        flush_timeout: float = None,
+    ):
+        self.db_name = db
+        self.host = host or os.environ.get("MONGO_HOST", "localhost")
+        self.port = port or int(os.environ.get("MONGO_PORT", "27017"))
+        self.dbpath = dbpath or MONGO_DBPATH
+        self.block_compressor = block_compressor or MONGO_COMPRESSOR
+        self.flush_mode = flush_mode or MONGO_FLUSH_MODE
+        self.flush_timeout = MONGO_FLUSH_TIMEOUT_S if flush_timeout is None else float(flush_timeout)
+
+        self.client = MongoClient(self.host, self.port)
+        self.db = self.client[self.db_name]
+
+        self._paths = {}    # 컬렉션 -> .wt 경로(collstats에서 한 번만)
+        self._fds = {}      # 컬렉션 -> 열어 둔 fd
+        self._mtimes = {}   # 컬렉션 -> 마지막 flush 후 mtime_ns
+        self.flush_hist = op_profile.Histogram()   # flush_and_wait 지연(ns)
+        self.flush_timeouts = 0
+        self.flush_strategy = make_flush_strategy(self.flush_mode, self)
+
+    # ----- 경로/크기 -----
+    def collection_path(self, tablename):
+        path = self._paths.get(tablename)
+        if path is None:
+            uri = self.db.command("collstats", tablename)["wiredTiger"]["uri"]
+            path = os.path.join(self.dbpath, uri[len(_STATS_URI_PREFIX):] + ".wt")
+            self._paths[tablename] = path
+        return path
+
+    def _fd(self, tablename):
+        fd = self._fds.get(tablename)
+        if fd is None:
+            fd = os.open(self.collection_path(tablename), os.O_RDONLY)
+            self._fds[tablename] = fd
+        return fd
+
+    def forget(self, tablename):
+        """DROP/재생성 뒤에는 다른 파일이므로 캐시한 경로와 fd를 버림."""
+        self.flush_strategy.forget(tablename)
+        self._paths.pop(tablename, None)
+        self._mtimes.pop(tablename, None)
+        fd = self._fds.pop(tablename, None)
+        if fd is not None:
+            os.close(fd)
+
+    def get_table_size_alloc(self, tablename):
+        t0 = _prof.now()
+        size = os.fstat(self._fd(tablename)).st_blocks * 512
+        _prof.record("stat", t0)
+        return size
+
+    def get_table_size_logical(self, tablename):
+        # 참고용(압축 전 문서 크기 합)
+        return int(self.db.command("collstats", tablename)["size"])
+
+    # ----- 컬렉션 -----
+    def drop_table(self, tablename):
+        self.forget(tablename)
+        self.db.drop_collection(tablename)
+
+    def create_basic_table(self, tablename, varchar_len=None, compressed=True, encrypted=False):
+        """varchar_len/encrypted는 MariaDBController와의 호환용(WiredTiger는 무시)."""
+        compressor = self.block_compressor if compressed else "none"
+        self.forget(tablename)
+        self.db.create_collection(
+            tablename, storageEngine={"wiredTiger": {"configString": f"block_compressor={compressor}"}})
+
+    def truncate_table(self, tablename):
+        # WiredTiger는 삭제해도 파일을 바로 줄이지 않으므로 신호 기준선이 필요하면 drop/create를 쓸 것
+        self.db[tablename].delete_many({})
+
+    # ----- 문서 -----
+    def insert_row(self, tablename: str, idx: int, data: str):
+        self.db[tablename].insert_one({"id": idx, "value": data})
+
+    def insert_rows(self, tablename: str, rows):
+        rows = [{"id": idx, "value": data} for idx, data in rows]
+        if rows:
+            self.db[tablename].insert_many(rows, ordered=True)
+
+    def update_row(self, tablename: str, idx: int, data: str):
+        # 파이프라인 형식 $set(기존 스크립트와 동일): 문서를 통째로 다시 씀
+        self.db[tablename].update_one({"id": idx}, [{"$set": {"value": data}}])
+
+    def update_rows(self, tablename: str, rows):
+        """rows: [(id, data), ...] — bulk_write 한 번(한 왕복)으로 여러 문서를 갱신."""
+        ops = [UpdateOne({"id": idx}, [{"$set": {"value": data}}]) for idx, data in rows]
+        if ops:
+            self.db[tablename].bulk_write(ops, ordered=True)
+
+    def delete_row(self, tablename: str, idx: int):
+        self.db[tablename].delete_one({"id": idx})
+
+    def delete_rows_range(self, tablename: str, lo: int, hi: int):
+        self.db[tablename].delete_many({"id": {"$gte": lo, "$lte": hi}})
+
+    def flush_writes(self):
+        """MariaDBController 호환(쓰기 합치기 없음)."""
+
+    # ----- 압축 설정 -----
+    def compression_variables(self) -> dict:
+        return {"block_compressor": self.block_compressor}
+
+    def set_compression(self, algorithm: str, level: int = None) -> dict:
+        """다음에 만드는 컬렉션의 block_compressor. 레벨은 컬렉션 단위로 지정할 수 없음."""
+        if level is not None:
+            raise ValueError("WiredTiger block_compressor has no per-collection level")
+        self.block_compressor = algorithm
+        return self.compression_variables()
+
+    # ----- flush -----
+    def _fsync(self, lock=False):
+        t0 = _prof.now()
+        self.client.admin.command("fsync", lock=lock)
+        _prof.record("flush", t0)
+
+    @staticmethod
+    def _sleep(seconds):
+        t0 = _prof.now()
+        time.sleep(seconds)
+        _prof.record("sleep", t0)
+
+    def flush_and_wait(self, tablename, sleep_sec=FLUSH_POLL_S):
+        """
+        체크포인트를 강제하고 .wt가 바뀔 때까지 대기(방식은 flush_mode).
+        sleep_sec는 fsync_lock의 폴링 간격(기존 스크립트와 같은 0.1s).
+        """
+        t_wait = _prof.now()
+        if not self.flush_strategy.flush(tablename, self._mtimes.get(tablename, 0), sleep_sec):
+            self.flush_timeouts += 1
+        self._mtimes[tablename] = os.fstat(self._fd(tablename)).st_mtime_ns
+        self.flush_hist.add(_prof.now() - t_wait)
+        _prof.record("flush_wait", t_wait)
+
+    def flush_report(self):
+        """flush_and_wait 지연 요약(ms). 분위수는 버킷 중앙값(오차 ≤ 6.25%)."""
+        h = self.flush_hist
+        if not h.n:
+            return {"mode": self.flush_mode, "count": 0}
+        return {
+            "mode": self.flush_mode,
+            "count": h.n,
+            "total_s": h.total / 1e9,
+            "mean_ms": h.total / h.n / 1e6,
+            "p50_ms": h.percentile(0.5) / 1e6,
+            "p95_ms": h.percentile(0.95) / 1e6,
+            "max_ms": h.max / 1e6,
+            "timeouts": self.flush_timeouts,
+        }
+
+    def close(self):
+        for t in list(self._fds):
+            self.forget(t)
+        self.flush_strategy.close()
+        self.client.close()
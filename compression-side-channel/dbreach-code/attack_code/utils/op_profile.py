@@ -0,0 +1,307 @@
+# utils/op_profile.py
+"""
+공격 hot path 계측: 연산 종류 × 공격 페이즈별 호출 수와 지연 히스토그램.
+
+연산(leaf, 서로 겹치지 않음):
+  sql    cur.execute/executemany (FLUSH 제외)
+  flush  FLUSH TABLES 문
+  stat   .ibd 크기/시그니처 조회(os.stat/fstat/SEEK_DATA)
+  sleep  flush 대기 중 time.sleep
+  + flush_wait: flush_and_wait 한 번 전체(위 연산들을 포함하므로 leaf 아님)
+페이즈(DBREACHerImpl): filler, reinsert, guess, amp, ref. 페이즈 밖의 연산은 other.
+  페이즈는 중첩되면 바깥 것이 이긴다(ref 안의 guess/amp는 ref로 집계).
+  페이즈 wall 시간 - leaf 연산 합 = 그 페이즈의 python(파이썬 쪽 오버헤드).
+스레드(multi_table_engine 레인)마다 히스토그램을 따로 쌓고 end_trial/summary에서 합친다.
+  레인들이 동시에 돌면 시간 합이 벽시계를 넘으므로, share 분모는 경과 시간 × 페이즈를 돈 스레드 수.
+
+히스토그램은 HDR식 로그-선형 버킷(2배 구간마다 16칸, 상대 오차 ≤ 6.25%, 나노초 단위).
+기록 한 번은 perf_counter_ns 두 번 + 정수 연산 몇 개라 SQL 왕복/flush(수백 µs~수백 ms) 대비 무시할 수준.
+
+환경변수:
+  DBREACH_PROFILE      1이면 켬(기본 0: 모든 호출이 즉시 반환, 커서도 감싸지 않음)
+  DBREACH_PROFILE_CSV  trial별 요약 CSV 경로(end_trial()마다 append)
+켜져 있으면 종료 시 전체 요약을 stderr에 출력.
+
+    prof = op_profile.get_profiler()
+    with prof.phase("amp"): ...
+    t0 = prof.now(); ...; prof.record("stat", t0)
+    prof.end_trial("records=10,k=1")
+"""
+import atexit
+import math
+import os
+import sys
+import threading
+import time
+
+PROFILE = os.getenv("DBREACH_PROFILE", "0") == "1"
+PROFILE_CSV = os.getenv("DBREACH_PROFILE_CSV")
+
+PHASES = ("filler", "reinsert", "guess", "amp", "ref", "other")
+LEAF_OPS = ("sql", "flush", "stat", "sleep")
+
+_SUB_BITS = 4
+_SUB = 1 << _SUB_BITS
+
+_CSV_HEADER = "trial,phase,op,count,total_ms,mean_us,p50_us,p90_us,p99_us,max_us\n"
+
+
+def _bucket(v: int) -> int:
+    if v < _SUB:
+        return v
+    e = v.bit_length() - _SUB_BITS - 1
+    return ((e + 1) << _SUB_BITS) + (v >> e) - _SUB
+
+
+def _bucket_mid(i: int) -> float:
+    if i < _SUB:
+        return float(i)
+    e = (i >> _SUB_BITS) - 1
+    lo = (_SUB + (i & (_SUB - 1))) << e
+    return lo + ((1 << e) - 1) / 2
+
+
+class Histogram:
+    """나노초 지연 히스토그램(희소 dict 버킷)."""
+
+    __slots__ = ("counts", "n", "total", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.n = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, ns: int):
+        b = _bucket(ns) if ns > 0 else 0
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.n += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def merge(self, other: "Histogram"):
+        # other가 다른 스레드에서 아직 기록 중일 수 있어 스냅숏으로 순회
+        for b, c in list(other.counts.items()):
+            self.counts[b] = self.counts.get(b, 0) + c
+        self.n += other.n
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """q(0..1) 분위수(ns, nearest-rank, 버킷 중앙값)."""
+        if not self.n:
+            return 0.0
+        rank = max(1, math.ceil(q * self.n))
+        seen = 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank:
+                return min(_bucket_mid(b), float(self.max))
+        return float(self.max)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("prof", "name", "t0")
+
+    def __init__(self, prof, name):
+        self.prof = prof
+        self.name = name
+
+    def __enter__(self):
+        self.prof._tls.phase = self.name
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.prof._add(self.name, "wall", time.perf_counter_ns() - self.t0)
+        self.prof._tls.phase = None
+        self.prof._phase_threads.add(threading.get_ident())
+        return False
+
+
+class OpProfiler:
+    def __init__(self, enabled: bool = PROFILE, csv_path: str = PROFILE_CSV):
+        self.enabled = enabled
+        self.csv_path = csv_path
+        self._tls = threading.local()
+        self._lock = threading.Lock()
+        self._thread_hists = []   # 스레드별 {(phase, op) -> Histogram}, 현재 trial
+        self._phase_threads = set()   # 페이즈(wall)를 기록한 스레드 id
+        self._total = {}   # 끝난 trial 누적
+        self._trials = 0
+        self._t_start = time.perf_counter_ns()
+        if enabled and csv_path and not os.path.exists(csv_path):
+            with open(csv_path, "w") as f:
+                f.write(_CSV_HEADER)
+
+    # ----- 기록 -----
+    now = staticmethod(time.perf_counter_ns)
+
+    def phase(self, name: str):
+        """페이즈 구간. 이미 페이즈 안이면(중첩) 아무것도 안 함."""
+        if not self.enabled or getattr(self._tls, "phase", None) is not None:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, op: str, t0: int):
+        """now()로 받은 t0부터 지금까지를 op 한 번으로 기록."""
+        if not self.enabled:
+            return
+        self._add(getattr(self._tls, "phase", None) or "other", op, time.perf_counter_ns() - t0)
+
+    def _add(self, phase, op, ns):
+        # 스레드 로컬 dict라 기록 경로엔 락이 없다(처음 한 번 등록할 때만)
+        hists = getattr(self._tls, "hists", None)
+        if hists is None:
+            hists = self._tls.hists = {}
+            with self._lock:
+                self._thread_hists.append(hists)
+        h = hists.get((phase, op))
+        if h is None:
+            h = hists[(phase, op)] = Histogram()
+        h.add(ns)
+
+    def _take_trial(self) -> dict:
+        """스레드별 현재 trial 히스토그램을 합쳐 돌려주고 비운다."""
+        merged = {}
+        with self._lock:
+            for hists in self._thread_hists:
+                for key in list(hists):
+                    h = hists.pop(key)
+                    if key in merged:
+                        merged[key].merge(h)
+                    else:
+                        merged[key] = h
+        return merged
+
+    def _peek_trial(self) -> dict:
+        merged = {}
+        with self._lock:
+            for hists in self._thread_hists:
+                for key, h in list(hists.items()):
+                    merged.setdefault(key, Histogram()).merge(h)
+        return merged
+
+    # ----- 집계 -----
+    @staticmethod
+    def _rows(hists):
+        """(phase, op, Histogram) — 페이즈마다 python(= wall - leaf 합) 포함."""
+        out = []
+        for phase in PHASES:
+            ops = {op: h for (p, op), h in hists.items() if p == phase}
+            if not ops:
+                continue
+            for op in LEAF_OPS + ("flush_wait", "wall"):
+                if op in ops:
+                    out.append((phase, op, ops[op]))
+            if "wall" in ops:
+                py = Histogram()
+                py.n = ops["wall"].n
+                py.total = max(0, ops["wall"].total - sum(ops[op].total for op in LEAF_OPS if op in ops))
+                out.append((phase, "python", py))
+        return out
+
+    def end_trial(self, label="") -> list:
+        """
+        현재 trial 통계를 CSV에 쓰고 누적에 합친 뒤 초기화. (phase, op, count, total_ms) 목록 반환.
+        레인 스레드가 기록 중일 때 부르면 그 순간까지의 값만 이번 trial로 잡힌다.
+        """
+        if not self.enabled:
+            return []
+        hists = self._take_trial()
+        rows = self._rows(hists)
+        if self.csv_path:
+            label = str(label).replace(",", ";")
+            with open(self.csv_path, "a") as f:
+                for phase, op, h in rows:
+                    # python은 wall - leaf 합이라 분포가 없음 → 분위수 칸은 비움
+                    dist = ",".join(f"{v / 1e3:.1f}" for v in (h.percentile(0.5), h.percentile(0.9),
+                                                              h.percentile(0.99), h.max)) if h.counts else ",,,"
+                    f.write(f"{label or self._trials},{phase},{op},{h.n},{h.total / 1e6:.3f},"
+                            f"{h.total / max(h.n, 1) / 1e3:.1f},{dist}\n")
+        for key, h in hists.items():
+            if key in self._total:
+                self._total[key].merge(h)
+            else:
+                self._total[key] = h
+        self._trials += 1
+        return [(phase, op, h.n, h.total / 1e6) for phase, op, h in rows]
+
+    def summary(self) -> str:
+        """지금까지(진행 중 trial 포함) 페이즈 × 연산 요약 표."""
+        trial = self._peek_trial()
+        hists = {k: Histogram() for k in set(self._total) | set(trial)}
+        for src in (self._total, trial):
+            for k, h in src.items():
+                hists[k].merge(h)
+        elapsed = (time.perf_counter_ns() - self._t_start) / 1e9
+        threads = max(1, len(self._phase_threads))
+        # 스레드 시간 기준: 레인 N개가 동시에 돌면 분모도 N배
+        budget = elapsed * threads
+        lines = [f"[PROFILE] {self._trials} trials, {elapsed:.1f}s since start, {threads} thread(s)",
+                 f"{'phase':<9}{'op':<11}{'count':>9}{'total_s':>10}{'share':>7}"
+                 f"{'mean_ms':>9}{'p50_ms':>9}{'p99_ms':>9}{'max_ms':>9}"]
+        for phase, op, h in self._rows(hists):
+            share = h.total / 1e9 / budget if budget > 0 else 0.0
+            if op == "python" or not h.counts:
+                lines.append(f"{phase:<9}{op:<11}{h.n:>9}{h.total / 1e9:>10.2f}{share:>7.1%}")
+                continue
+            lines.append(f"{phase:<9}{op:<11}{h.n:>9}{h.total / 1e9:>10.2f}{share:>7.1%}"
+                         f"{h.total / h.n / 1e6:>9.2f}{h.percentile(0.5) / 1e6:>9.2f}"
+                         f"{h.percentile(0.99) / 1e6:>9.2f}{h.max / 1e6:>9.2f}")
+        return "\n".join(lines)
+
+    def dump(self, fp=None):
+        if self.enabled and (self._total or any(self._thread_hists)):
+            print(self.summary(), file=fp or sys.stderr)
+
+
+class TimedCursor:
+    """DB-API 커서 래퍼: execute/executemany를 sql 또는 flush로 기록, 나머지는 그대로 위임."""
+
+    def __init__(self, cur, prof: OpProfiler):
+        self._cur = cur
+        self._prof = prof
+
+    def execute(self, query, args=None):
+        t0 = time.perf_counter_ns()
+        try:
+            return self._cur.execute(query, args)
+        finally:
+            self._prof.record("flush" if query.startswith("FLUSH") else "sql", t0)
+
+    def executemany(self, query, args):
+        t0 = time.perf_counter_ns()
+        try:
+            return self._cur.executemany(query, args)
+        finally:
+            self._prof.record("sql", t0)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+_profiler = None
+
+
+def get_profiler() -> OpProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = OpProfiler()
+        if _profiler.enabled:
+            atexit.register(_profiler.dump)
+    return _profiler
@@ -0,0 +1,275 @@
+# utils/oracle_trace.py
+"""
+오라클 트레이스 기록/재생.
+
+RecordingController: 실제(또는 시뮬레이터) 컨트롤러를 감싸서 모든 쓰기와
+  get_table_size_alloc 결과를 바이너리 트레이스로 남긴다.
+ReplayController: 트레이스를 읽어 같은 순서로 크기를 돌려준다(DB 없이 결정적).
+  공격 코드가 기록 때와 다른 쓰기를 하면 경고하고(divergences 증가) 앞쪽에서 다시 맞춰 본다.
+
+트레이스 형식(zlib 압축):
+  b"DBRT1" + 이벤트 수 N + 문자열 수 S
+  op[N] (uint8) / table[N] (uint32, 문자열 테이블 인덱스) / a[N] (int64) / b[N] (uint64)
+  문자열 길이[S] (uint32) + utf-8 바이트
+쓰기 데이터는 (crc32 << 32 | 길이)만 저장(재생 시 일치 확인용).
+"""
+import struct
+import warnings
+import zlib
+from array import array
+
+OP_INSERT = 1
+OP_UPDATE = 2
+OP_DELETE = 3
+OP_DELETE_RANGE = 4
+OP_SIZE = 5
+OP_FLUSH = 6
+OP_DROP = 7
+OP_CREATE = 8
+
+_OP_NAMES = {OP_INSERT: "insert", OP_UPDATE: "update", OP_DELETE: "delete",
+             OP_DELETE_RANGE: "delete_range", OP_SIZE: "size", OP_FLUSH: "flush",
+             OP_DROP: "drop", OP_CREATE: "create"}
+
+_MAGIC = b"DBRT1"
+_HEADER = struct.Struct("<5sQQ")
+
+
+def _data_key(data: str) -> int:
+    raw = data.encode("utf-8", errors="replace")
+    return (zlib.crc32(raw) << 32) | len(raw)
+
+
+class OracleTrace:
+    def __init__(self):
+        self.ops = array("B")
+        self.tables = array("I")
+        self.a = array("q")
+        self.b = array("Q")
+        self.strings = []
+        self._string_idx = {}
+
+    def __len__(self):
+        return len(self.ops)
+
+    def _intern(self, s: str) -> int:
+        idx = self._string_idx.get(s)
+        if idx is None:
+            idx = self._string_idx[s] = len(self.strings)
+            self.strings.append(s)
+        return idx
+
+    def append(self, op: int, table: str, a: int = 0, b: int = 0):
+        self.ops.append(op)
+        self.tables.append(self._intern(table))
+        self.a.append(a)
+        self.b.append(b)
+
+    def event(self, i: int):
+        return self.ops[i], self.strings[self.tables[i]], self.a[i], self.b[i]
+
+    def save(self, path: str):
+        strs = [s.encode("utf-8") for s in self.strings]
+        lens = array("I", [len(s) for s in strs])
+        payload = b"".join([
+            _HEADER.pack(_MAGIC, len(self.ops), len(strs)),
+            self.ops.tobytes(), self.tables.tobytes(), self.a.tobytes(), self.b.tobytes(),
+            lens.tobytes(), b"".join(strs),
+        ])
+        with open(path, "wb") as f:
+            f.write(zlib.compress(payload, 6))
+
+    @classmethod
+    def load(cls, path: str) -> "OracleTrace":
+        with open(path, "rb") as f:
+            payload = zlib.decompress(f.read())
+        magic, n, ns = _HEADER.unpack_from(payload, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"not an oracle trace: {path}")
+        t = cls()
+        off = _HEADER.size
+        for arr in (t.ops, t.tables, t.a, t.b):
+            size = arr.itemsize * n
+            arr.frombytes(payload[off:off + size])
+            off += size
+        lens = array("I")
+        lens.frombytes(payload[off:off + 4 * ns])
+        off += 4 * ns
+        for ln in lens:
+            t._intern(payload[off:off + ln].decode("utf-8"))
+            off += ln
+        return t
+
+    def summary(self) -> dict:
+        counts = {}
+        for op in self.ops:
+            name = _OP_NAMES.get(op, str(op))
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+
+class RecordingController:
+    """컨트롤러 래퍼: 호출은 그대로 넘기고 이벤트만 기록. save()로 저장."""
+
+    def __init__(self, inner, path: str = None):
+        self.inner = inner
+        self.path = path
+        self.trace = OracleTrace()
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def drop_table(self, tablename):
+        self.trace.append(OP_DROP, tablename)
+        return self.inner.drop_table(tablename)
+
+    def create_basic_table(self, tablename, varchar_len=500, compressed=True, encrypted=True):
+        self.trace.append(OP_CREATE, tablename, varchar_len, int(compressed))
+        return self.inner.create_basic_table(tablename, varchar_len, compressed, encrypted)
+
+    def insert_row(self, tablename, idx, data):
+        self.trace.append(OP_INSERT, tablename, idx, _data_key(data))
+        return self.inner.insert_row(tablename, idx, data)
+
+    def insert_rows(self, tablename, rows):
+        rows = list(rows)
+        for idx, data in rows:
+            self.trace.append(OP_INSERT, tablename, idx, _data_key(data))
+        return self.inner.insert_rows(tablename, rows)
+
+    def update_row(self, tablename, idx, data):
+        self.trace.append(OP_UPDATE, tablename, idx, _data_key(data))
+        return self.inner.update_row(tablename, idx, data)
+
+    def delete_row(self, tablename, idx):
+        self.trace.append(OP_DELETE, tablename, idx)
+        return self.inner.delete_row(tablename, idx)
+
+    def delete_rows_range(self, tablename, lo, hi):
+        self.trace.append(OP_DELETE_RANGE, tablename, lo, hi)
+        return self.inner.delete_rows_range(tablename, lo, hi)
+
+    def flush_and_wait(self, tablename, *args, **kwargs):
+        self.trace.append(OP_FLUSH, tablename)
+        return self.inner.flush_and_wait(tablename, *args, **kwargs)
+
+    def get_table_size_alloc(self, tablename):
+        size = self.inner.get_table_size_alloc(tablename)
+        self.trace.append(OP_SIZE, tablename, size)
+        return size
+
+    def save(self, path: str = None):
+        self.trace.save(path or self.path)
+
+
+class ReplayController:
+    """
+    트레이스 재생. 쓰기/flush 호출은 다음 이벤트와 맞춰 보고 커서를 옮기며,
+    get_table_size_alloc은 해당 테이블의 다음 SIZE 값을 돌려준다.
+    불일치 시 resync_window 안에서 같은 이벤트를 찾아 건너뛰고, 못 찾으면 커서를 그대로 둔다.
+    """
+
+    def __init__(self, trace, resync_window: int = 64, warn: bool = True):
+        self.trace = OracleTrace.load(trace) if isinstance(trace, str) else trace
+        self.pos = 0
+        self.resync_window = resync_window
+        self.warn = warn
+        self.divergences = 0
+        self.flush_mode = "replay"
+        self.flush_count = 0
+        self.flush_timeouts = 0
+
+    def _diverged(self, expected, got):
+        self.divergences += 1
+        if self.warn and self.divergences == 1:
+            warnings.warn(f"trace diverged at event {self.pos}: expected {expected}, got {got}", RuntimeWarning)
+
+    def _match(self, op, table, a=0, b=0):
+        want = (op, table, a, b)
+        n = len(self.trace)
+        if self.pos < n and self.trace.event(self.pos) == want:
+            self.pos += 1
+            return
+        self._diverged(self.trace.event(self.pos) if self.pos < n else None, want)
+        for i in range(self.pos + 1, min(n, self.pos + 1 + self.resync_window)):
+            if self.trace.event(i) == want:
+                self.pos = i + 1
+                return
+
+    def drop_table(self, tablename):
+        self._match(OP_DROP, tablename)
+
+    def create_basic_table(self, tablename, varchar_len=500, compressed=True, encrypted=True):
+        self._match(OP_CREATE, tablename, varchar_len, int(compressed))
+
+    def insert_row(self, tablename, idx, data):
+        self._match(OP_INSERT, tablename, idx, _data_key(data))
+
+    def insert_rows(self, tablename, rows):
+        for idx, data in rows:
+            self.insert_row(tablename, idx, data)
+
+    def update_row(self, tablename, idx, data):
+        self._match(OP_UPDATE, tablename, idx, _data_key(data))
+
+    def delete_row(self, tablename, idx):
+        self._match(OP_DELETE, tablename, idx)
+
+    def delete_rows_range(self, tablename, lo, hi):
+        self._match(OP_DELETE_RANGE, tablename, lo, hi)
+
+    def flush_and_wait(self, tablename, sleep_sec=0.2, tables=None):
+        self.flush_count += 1
+        self._match(OP_FLUSH, tablename)
+
+    def get_table_size_alloc(self, tablename):
+        n = len(self.trace)
+        for i in range(self.pos, n):
+            op, table, a, _ = self.trace.event(i)
+            if op == OP_SIZE and table == tablename:
+                if i != self.pos:
+                    self._diverged(self.trace.event(self.pos), (OP_SIZE, tablename))
+                self.pos = i + 1
+                return a
+        raise EOFError(f"trace exhausted: no more sizes for {tablename}")
+
+    def flush_report(self):
+        return {"mode": self.flush_mode, "count": self.flush_count,
+                "divergences": self.divergences, "events_used": self.pos, "events": len(self.trace)}
+
+
+if __name__ == "__main__":
+    # 시뮬레이터로 k-of-n trial 하나를 기록한 뒤 같은 시드로 재생해 결과가 같은지 확인
+    import random
+    import string
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import dbreacher_impl
+    import k_of_n_attacker
+    from utils.simulated_mariadb import SimulatedMariaDBController
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "/tmp/dbreach_trace.bin"
+    fillerCharSet = string.printable.replace(string.ascii_lowercase, '').replace('*', '')
+
+    def trial(control):
+        random.seed(1234)
+        guesses = ["".join(random.choices(string.ascii_lowercase, k=15)) for _ in range(10)]
+        control.drop_table("victimtable")
+        control.create_basic_table("victimtable", varchar_len=200, compressed=True, encrypted=True)
+        control.insert_row("victimtable", 1, guesses[0])
+        dbreach = dbreacher_impl.DBREACHerImpl(control, "victimtable", 100, 200, fillerCharSet, ord('*'),
+                                               rng=random.Random(5678))
+        attacker = k_of_n_attacker.kOfNAttacker(1, dbreach, guesses, True)
+        while not (attacker.setUp() and attacker.tryAllGuesses()):
+            pass
+        return attacker.getTopKGuesses()
+
+    rec = RecordingController(SimulatedMariaDBController(), path)
+    recorded = trial(rec)
+    rec.save()
+    print("recorded", len(rec.trace), "events,", os.path.getsize(path), "bytes", rec.trace.summary())
+
+    rep = ReplayController(path)
+    replayed = trial(rep)
+    print("replay matches:", recorded == replayed, rep.flush_report())
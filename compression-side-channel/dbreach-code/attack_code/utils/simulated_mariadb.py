@@ -0,0 +1,342 @@
+# utils/simulated_mariadb.py
+"""
+MariaDB(InnoDB page compression) 없이 DBREACH 실험을 돌리기 위한 순수 파이썬 시뮬레이터.
+
+MariaDBController와 같은 메서드를 제공해서 DBREACHerImpl / decisionAttacker /
+kOfNAttacker에 그대로 꽂아 쓸 수 있다. 모델은 단순화되어 있음:
+  - 행은 PK 순서로 16KB 리프 페이지에 배치(오름차순 삽입 시 InnoDB처럼 새 행만 오른쪽 페이지로 split)
+  - 페이지 바이트 = FIL 헤더 + 레코드(헤더/id/trx_id/roll_ptr/data) + 0 패딩 + 트레일러
+  - 각 페이지를 설정된 알고리즘으로 압축, 4KB(punch hole 단위)로 올림한 값이 할당 크기
+    (압축 길이는 utils/incremental_size.py로 계산: zlib은 직전 페이지 상태와의 공통 접두를 재사용,
+     그 외 알고리즘은 내용 해시 캐시. DBREACH_SIM_INCREMENTAL=0이면 매번 전체 압축)
+  - 삭제된 레코드의 잔여 바이트(garbage)와 purge 지연은 모델링하지 않음
+"""
+import bz2
+import copy
+import lzma
+import os
+import zlib
+
+from utils.incremental_size import IncrementalSizer
+
+PAGE_SIZE = 16384
+BLOCK_SIZE = 4096                  # punch hole 단위(파일시스템 블록)
+FIL_HEADER = 38
+FIL_TRAILER = 8
+PAGE_HEADER = 56 + 26              # index 헤더 + infimum/supremum
+REC_HEADER = 5
+REC_SYS_COLS = 4 + 6 + 7           # id + DB_TRX_ID + DB_ROLL_PTR
+SLOT_SIZE = 2                      # page directory 슬롯(레코드 4개당 1개로 근사)
+PAGE_CAPACITY = PAGE_SIZE - FIL_HEADER - FIL_TRAILER - PAGE_HEADER
+# 새 .ibd의 FSP_HDR/IBUF_BITMAP/INODE 페이지 할당분(실측: 빈 테이블 16KB = 3블록 + 루트 1블록)
+SYSTEM_PAGES_ALLOC = 3 * BLOCK_SIZE
+
+SIM_ALGO = os.getenv("DBREACH_SIM_ALGO", "zlib")
+SIM_LEVEL = int(os.getenv("DBREACH_SIM_LEVEL", "6"))
+SIM_INCREMENTAL = os.getenv("DBREACH_SIM_INCREMENTAL", "1") != "0"
+
+
+# ----- 압축기 -----
+def get_compressor(algorithm: str, level: int = 6):
+    """innodb_compression_algorithm 이름 -> bytes->bytes 압축 함수"""
+    if algorithm == "zlib":
+        return lambda data: zlib.compress(data, level)
+    if algorithm == "lz4":
+        import lz4.block  # 선택 의존성
+        return lambda data: lz4.block.compress(data, store_size=False)
+    if algorithm == "snappy":
+        import snappy  # 선택 의존성(python-snappy)
+        return snappy.compress
+    if algorithm == "lzma":
+        return lambda data: lzma.compress(data, preset=level, check=lzma.CHECK_NONE)
+    if algorithm == "bzip2":
+        return lambda data: bz2.compress(data, max(1, min(9, level)))
+    if algorithm == "none":
+        return lambda data: data
+    raise ValueError(f"지원하지 않는 압축 알고리즘: {algorithm}")
+
+
+def page_alloc_bytes(compressed_len: int) -> int:
+    """압축된 페이지 한 장의 디스크 할당 크기(4KB 올림, 압축 이득 없으면 16KB 그대로)."""
+    stored = FIL_HEADER + compressed_len + FIL_TRAILER
+    if stored >= PAGE_SIZE:
+        return PAGE_SIZE
+    return -(-stored // BLOCK_SIZE) * BLOCK_SIZE
+
+
+def _record_len(data: str) -> int:
+    return REC_HEADER + REC_SYS_COLS + (2 if len(data) > 127 else 1) + len(data)
+
+
+class _Page:
+    __slots__ = ("page_no", "ids", "used", "alloc")
+
+    def __init__(self, page_no: int):
+        self.page_no = page_no
+        self.ids = []       # 이 페이지의 PK(정렬 상태 유지)
+        self.used = 0       # 레코드 + 디렉터리 바이트
+        self.alloc = None   # 캐시된 할당 크기(None이면 재압축 필요)
+
+
+class _SimTable:
+    def __init__(self, varchar_len: int, compressed: bool):
+        self.varchar_len = varchar_len
+        self.compressed = compressed
+        self.rows = {}              # id -> data
+        self.trx = {}               # id -> 마지막으로 쓴 trx id
+        self.pages = []             # 리프 페이지(키 범위 순)
+        self.next_page_no = 3       # 0..2는 시스템 페이지
+        self.root_alloc = None      # 리프가 여러 장일 때 내부(루트) 페이지 캐시
+
+
+class SimulatedMariaDBController:
+    """
+    MariaDBController 대체품(메모리 내 InnoDB 페이지 압축 모델).
+    flush_and_wait는 즉시 반환하고, get_table_size_alloc은 바뀐 페이지만 재압축한다.
+    """
+
+    def __init__(
+        self,
+        db: str = "flask_db",
+        algorithm: str = None,
+        level: int = None,
+        datadir: str = None,
+    ):
+        self.db_name = db
+        self.datadir = datadir
+        self.algorithm = algorithm or SIM_ALGO
+        self.level = SIM_LEVEL if level is None else int(level)
+        self._set_compressor()
+        self.tables = {}
+        self._snapshots = {}
+        self._trx_id = 1
+
+        # MariaDBController와 같은 통계 필드
+        self.flush_mode = "simulated"
+        self.flush_count = 0
+        self.flush_timeouts = 0
+
+    # ---------- DDL ----------
+    def drop_table(self, tablename):
+        self.tables.pop(tablename, None)
+        self._snapshots.pop(tablename, None)
+
+    def create_basic_table(self, tablename, varchar_len=500, compressed=True, encrypted=True):
+        # 암호화는 압축 뒤에 적용되므로 할당 크기에 영향 없음
+        if tablename in self.tables:
+            raise ValueError(f"Table '{tablename}' already exists")
+        self.tables[tablename] = _SimTable(varchar_len, compressed)
+
+    def truncate_table(self, tablename):
+        t = self._table(tablename)
+        self.tables[tablename] = _SimTable(t.varchar_len, t.compressed)
+        self._snapshots.pop(tablename, None)
+
+    def compression_variables(self) -> dict:
+        return {"innodb_compression_algorithm": self.algorithm, "innodb_compression_level": str(self.level)}
+
+    def set_compression(self, algorithm: str, level: int = None) -> dict:
+        """SET GLOBAL innodb_compression_algorithm/level 대응. 이후 쓰이는 페이지부터 적용."""
+        self.algorithm = algorithm
+        if level is not None:
+            self.level = int(level)
+        self._set_compressor()
+        return self.compression_variables()
+
+    def _set_compressor(self):
+        self._compress = get_compressor(self.algorithm, self.level)
+        self._sizer = IncrementalSizer(self.algorithm, self.level, self._compress) if SIM_INCREMENTAL else None
+
+    def _compressed_len(self, data: bytes, stream) -> int:
+        if self._sizer is not None:
+            return self._sizer.size(data, stream)
+        return len(self._compress(data))
+
+    # ---------- CRUD ----------
+    def _table(self, tablename) -> _SimTable:
+        try:
+            return self.tables[tablename]
+        except KeyError:
+            raise ValueError(f"Table '{tablename}' doesn't exist") from None
+
+    def _find_page(self, t: _SimTable, idx: int) -> _Page:
+        # idx가 들어갈 리프: 첫 키가 idx 이하인 마지막 페이지(없으면 첫 페이지)
+        target = t.pages[0]
+        for p in t.pages:
+            if p.ids and p.ids[0] <= idx:
+                target = p
+            elif p.ids:
+                break
+        return target
+
+    def _touch(self, t: _SimTable, page: _Page):
+        page.alloc = None
+        t.root_alloc = None
+
+    def _split(self, t: _SimTable, page: _Page, idx: int):
+        pos = t.pages.index(page)
+        new = _Page(t.next_page_no)
+        t.next_page_no += 1
+        if idx == page.ids[-1] and pos == len(t.pages) - 1:
+            # 오름차순 삽입: 새 행만 오른쪽으로
+            move = [idx]
+        else:
+            move = page.ids[len(page.ids) // 2:]
+        page.ids = page.ids[:len(page.ids) - len(move)]
+        new.ids = move
+        page.used = sum(_record_len(t.rows[i]) for i in page.ids)
+        new.used = sum(_record_len(t.rows[i]) for i in new.ids)
+        t.pages.insert(pos + 1, new)
+        self._touch(t, page)
+        self._touch(t, new)
+
+    def _next_trx(self) -> int:
+        self._trx_id += 1
+        return self._trx_id
+
+    def insert_row(self, tablename: str, idx: int, data: str):
+        t = self._table(tablename)
+        idx = int(idx)
+        if idx in t.rows:
+            raise ValueError(f"Duplicate entry '{idx}' for key 'PRIMARY'")
+        if len(data) > t.varchar_len:
+            raise ValueError(f"Data too long for column 'data' at row {idx}")
+        if not t.pages:
+            t.pages.append(_Page(t.next_page_no))
+            t.next_page_no += 1
+        t.rows[idx] = data
+        t.trx[idx] = self._next_trx()
+        page = self._find_page(t, idx)
+        lo = 0
+        while lo < len(page.ids) and page.ids[lo] < idx:
+            lo += 1
+        page.ids.insert(lo, idx)
+        page.used += _record_len(data)
+        self._touch(t, page)
+        if page.used + SLOT_SIZE * (len(page.ids) // 4 + 2) > PAGE_CAPACITY and len(page.ids) > 1:
+            self._split(t, page, idx)
+
+    def update_row(self, tablename: str, idx: int, data: str):
+        t = self._table(tablename)
+        idx = int(idx)
+        if idx not in t.rows:
+            return  # UPDATE ... WHERE id=없는값 -> 0 rows affected
+        page = self._find_page(t, idx)
+        page.used += _record_len(data) - _record_len(t.rows[idx])
+        t.rows[idx] = data
+        t.trx[idx] = self._next_trx()
+        self._touch(t, page)
+        if page.used + SLOT_SIZE * (len(page.ids) // 4 + 2) > PAGE_CAPACITY and len(page.ids) > 1:
+            self._split(t, page, idx)
+
+    def delete_row(self, tablename: str, idx: int):
+        t = self._table(tablename)
+        idx = int(idx)
+        if idx not in t.rows:
+            return
+        page = self._find_page(t, idx)
+        page.ids.remove(idx)
+        page.used -= _record_len(t.rows[idx])
+        del t.rows[idx]
+        del t.trx[idx]
+        self._touch(t, page)
+        if not page.ids and len(t.pages) > 1:
+            t.pages.remove(page)
+
+    def insert_rows(self, tablename: str, rows):
+        for idx, data in rows:
+            self.insert_row(tablename, idx, data)
+
+    def delete_rows_range(self, tablename: str, lo: int, hi: int):
+        t = self._table(tablename)
+        for idx in [i for i in t.rows if lo <= i <= hi]:
+            self.delete_row(tablename, idx)
+
+    # ---------- 크기 ----------
+    def _page_bytes(self, t: _SimTable, page: _Page) -> bytes:
+        out = bytearray()
+        out += page.page_no.to_bytes(4, "big") + bytes(FIL_HEADER - 4)
+        out += bytes(PAGE_HEADER)
+        for i in page.ids:
+            data = t.rows[i].encode("latin-1", errors="replace")
+            out += len(data).to_bytes(2 if len(data) > 127 else 1, "big")
+            out += bytes(REC_HEADER)
+            out += ((i ^ 0x80000000) & 0xFFFFFFFF).to_bytes(4, "big")
+            out += t.trx[i].to_bytes(6, "big")
+            out += bytes(7)
+            out += data
+        # page directory: 레코드 4개당 슬롯 하나(오프셋)
+        slots = bytearray()
+        for n in range(0, len(page.ids), 4):
+            slots += (PAGE_HEADER + FIL_HEADER + n * 32).to_bytes(2, "big")
+        free = PAGE_SIZE - FIL_TRAILER - len(out) - len(slots)
+        out += bytes(max(0, free)) + slots + bytes(FIL_TRAILER)
+        return bytes(out[:PAGE_SIZE])
+
+    def _page_alloc(self, t: _SimTable, page: _Page) -> int:
+        if page.alloc is None:
+            if t.compressed:
+                page.alloc = page_alloc_bytes(self._compressed_len(self._page_bytes(t, page), (id(t), page.page_no)))
+            else:
+                page.alloc = PAGE_SIZE
+        return page.alloc
+
+    def _root_alloc(self, t: _SimTable) -> int:
+        # 리프가 1장이면 그 페이지가 루트. 여러 장이면 node pointer만 담긴 루트 페이지 추가.
+        if len(t.pages) <= 1:
+            return 0
+        if t.root_alloc is None:
+            ptrs = bytearray()
+            for p in t.pages:
+                ptrs += (p.ids[0] if p.ids else 0).to_bytes(4, "big") + p.page_no.to_bytes(4, "big")
+            body = bytes(PAGE_HEADER) + bytes(ptrs)
+            page = bytes(FIL_HEADER) + body + bytes(PAGE_SIZE - FIL_HEADER - len(body))
+            t.root_alloc = (page_alloc_bytes(self._compressed_len(page, (id(t), "root"))) if t.compressed
+                            else PAGE_SIZE)
+        return t.root_alloc
+
+    def get_table_size_alloc(self, tablename):
+        t = self._table(tablename)
+        leaves = sum(self._page_alloc(t, p) for p in t.pages) if t.pages else BLOCK_SIZE
+        return SYSTEM_PAGES_ALLOC + leaves + self._root_alloc(t)
+
+    def get_page_alloc_map(self, tablename):
+        """페이지 번호별 할당 4KB 블록 수(MariaDBController.get_page_alloc_map과 같은 형식).
+        리프가 여러 장일 때의 내부 루트 페이지는 맨 끝 번호로 둔다."""
+        t = self._table(tablename)
+        blocks = [1, 1, 1]  # 시스템 페이지 0..2 (SYSTEM_PAGES_ALLOC)
+        blocks += [0] * (t.next_page_no - 3)
+        if not t.pages:
+            blocks.append(1)
+        for p in t.pages:
+            blocks[p.page_no] = self._page_alloc(t, p) // BLOCK_SIZE
+        if len(t.pages) > 1:
+            blocks.append(self._root_alloc(t) // BLOCK_SIZE)
+        return blocks
+
+    def get_table_size_logical(self, tablename):
+        t = self._table(tablename)
+        return PAGE_SIZE * max(1, len(t.pages) + (1 if len(t.pages) > 1 else 0))
+
+    # ---------- 스냅숏 ----------
+    def snapshot_table(self, tablename):
+        self._snapshots[tablename] = copy.deepcopy(self._table(tablename))
+
+    def has_snapshot(self, tablename) -> bool:
+        return tablename in self._snapshots
+
+    def restore_table(self, tablename) -> bool:
+        self.tables[tablename] = copy.deepcopy(self._snapshots[tablename])
+        return True
+
+    def drop_snapshot(self, tablename):
+        self._snapshots.pop(tablename, None)
+
+    # ---------- flush ----------
+    def flush_and_wait(self, tablename, sleep_sec=0.2, tables=None):
+        # 시뮬레이터는 쓰기가 즉시 반영되므로 대기 없음
+        self.flush_count += 1
+
+    def flush_report(self):
+        return {"mode": self.flush_mode, "count": self.flush_count,
+                "total_s": 0.0, "timeouts": 0}
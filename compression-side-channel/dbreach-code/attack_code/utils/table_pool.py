@@ -0,0 +1,159 @@
+# utils/table_pool.py
+"""
+victim 테이블 풀: 다음 trial의 테이블을 백그라운드 스레드(자기 연결)에서 미리 준비.
+
+trial i를 측정하는 동안 워커가 trial i+1용 테이블을 만들고(create), 시크릿을 넣고,
+경계 세팅까지(prepare 콜백) 끝내 둔다. 다 쓴 테이블은 release()하면 워커가
+TRUNCATE(이름 재사용) 또는 DROP으로 치운다 → drop/create/sleep이 측정 경로에서 빠짐.
+
+    pool = TablePool(lambda: utils.MariaDBController("flask_db"), prepare, jobs, depth=1)
+    for job, table, payload in pool:
+        ...측정(메인 연결)...
+        pool.release(table)
+    pool.close()
+
+prepare(ctl, table, job) -> payload 는 워커 연결(ctl)로 실행된다.
+payload 안의 DBREACHerImpl 등은 측정 전에 pool.adopt(dbreach, control)로 메인 연결에 옮겨 붙인다.
+
+주의: 워커의 FLUSH TABLES는 서버 전역이라 측정 쪽 flush와 겹칠 수 있지만,
+신호는 테이블별 .ibd 할당 크기라 결과에는 영향이 없다(측정 중 I/O만 늘어남).
+"""
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class TablePool:
+    def __init__(self, make_controller, prepare, jobs, depth: int = 1, prefix: str = "victimtable_pool",
+                 recycle: str = "truncate", varchar_len: int = 200, compressed: bool = True, encrypted: bool = True):
+        if recycle not in ("truncate", "drop"):
+            raise ValueError(f"recycle은 truncate|drop: {recycle}")
+        self.make_controller = make_controller
+        self.prepare = prepare
+        self.jobs = iter(jobs)
+        self.prefix = prefix
+        self.recycle = recycle
+        self.table_kwargs = dict(varchar_len=varchar_len, compressed=compressed, encrypted=encrypted)
+        self._ready = queue.SimpleQueue()
+        self._slots = threading.Semaphore(max(1, depth))  # 미리 준비해 둘 테이블 수
+        self._released = queue.SimpleQueue()
+        self._free = []         # TRUNCATE로 비운, 재사용 가능한 테이블 이름
+        self._next_id = 0
+        self._stop = threading.Event()
+        self.control = None     # 워커 전용 컨트롤러(스레드 안에서 생성)
+        self.prepared = 0
+        self.recycled = 0
+        self.prepare_seconds = []
+        self._thread = threading.Thread(target=self._run, name="table-pool", daemon=True)
+        self._thread.start()
+
+    # ----- 워커 -----
+    def _recycle_released(self):
+        while True:
+            try:
+                table = self._released.get_nowait()
+            except queue.Empty:
+                return
+            if self.recycle == "truncate":
+                self.control.truncate_table(table)
+                self._free.append(table)
+            else:
+                self.control.drop_table(table)
+            self.recycled += 1
+
+    def _new_table(self) -> str:
+        if self._free:
+            return self._free.pop()
+        table = f"{self.prefix}_{self._next_id}"
+        self._next_id += 1
+        self.control.drop_table(table)
+        self.control.create_basic_table(table, **self.table_kwargs)
+        return table
+
+    def _run(self):
+        try:
+            self.control = self.make_controller()
+            for job in self.jobs:
+                if not self._acquire_slot():
+                    break
+                self._recycle_released()
+                t0 = time.time()
+                table = self._new_table()
+                payload = self.prepare(self.control, table, job)
+                if hasattr(self.control, "flush_writes"):
+                    self.control.flush_writes()
+                self.prepare_seconds.append(time.time() - t0)
+                self.prepared += 1
+                self._ready.put((job, table, payload))
+            self._ready.put(_DONE)
+        except BaseException as e:
+            self._ready.put(e)
+            return
+        # 남은 release 처리(close 전까지)
+        while not self._stop.is_set():
+            self._recycle_released()
+            self._stop.wait(0.05)
+        self._recycle_released()
+
+    def _acquire_slot(self) -> bool:
+        # 빈 자리를 기다리는 동안에도 release된 테이블은 치움
+        while not self._stop.is_set():
+            if self._slots.acquire(timeout=0.05):
+                return True
+            self._recycle_released()
+        return False
+
+    # ----- 메인 -----
+    def get(self, timeout=None):
+        """다음 준비된 (job, table, payload). 작업이 끝났으면 None."""
+        item = self._ready.get(timeout=timeout)
+        if item is _DONE:
+            self._ready.put(_DONE)
+            return None
+        if isinstance(item, BaseException):
+            raise RuntimeError("table pool worker failed") from item
+        self._slots.release()
+        return item
+
+    def __iter__(self):
+        while True:
+            item = self.get()
+            if item is None:
+                return
+            yield item
+
+    def release(self, table: str):
+        self._released.put(table)
+
+    def adopt(self, dbreach, control):
+        """워커 연결로 준비한 DBREACHerImpl을 메인 연결로 옮김(스냅숏 기록 포함).
+
+        TRUNCATE/재생성된 테이블은 tablespace가 새로 생기므로 메인 쪽 size oracle의 캐시(fstat fd 등)와
+        이전 trial의 스냅숏 기록을 버린다(안 버리면 unlink된 옛 .ibd를 계속 읽음).
+        """
+        table = dbreach.table
+        if hasattr(control, "size_oracle"):
+            control.size_oracle.forget(table)
+        if hasattr(control, "_snapshots"):
+            snaps = getattr(self.control, "_snapshots", None)
+            if snaps is not None and table in snaps:
+                control._snapshots[table] = snaps[table]
+            else:
+                control._snapshots.pop(table, None)
+        dbreach.control = control
+        return dbreach
+
+    def report(self) -> dict:
+        secs = self.prepare_seconds
+        return {"prepared": self.prepared, "recycled": self.recycled,
+                "prepare_mean_s": sum(secs) / len(secs) if secs else 0.0}
+
+    def close(self, drop: bool = True):
+        """워커 정지. drop=True면 풀이 만든 테이블을 모두 DROP."""
+        self._stop.set()
+        self._thread.join()
+        if drop and self.control is not None:
+            for i in range(self._next_id):
+                self.control.drop_table(f"{self.prefix}_{i}")
@@ -0,0 +1,271 @@
+# compression_curves.py
+"""
+압축 곡선 탐색기: 압축 바이트를 n개 늘릴 때 압축 크기가 어떻게 변하는지(n = 0..points-1).
+
+패턴은 데이터로 선언한다(PATTERNS). 문자열 = prefix + 세그먼트들 + suffix.
+  세그먼트 (src, base, lo, hi): 길이 L = base + clamp(n - lo, 0, hi - lo)  (hi=None이면 상한 없음)
+    src가 한 글자면 src * L, 아니면 src[:L]
+  filler: prefix + suffix 전체 길이(대문자 랜덤, 0이면 prefix/suffix 없음 → trial 하나로 충분)
+  reserve: filler에서 빼 둘 길이(prefix 길이는 randint(0, filler - reserve))
+같은 패턴을 여러 알고리즘(lz4 block/frame, snappy, zlib 레벨별, lzma)에 돌린다.
+trial의 prefix/suffix는 (seed, 패턴, trial)로만 정해지므로 알고리즘끼리 같은 입력을 쓴다.
+
+(패턴, 알고리즘)마다 작업 하나를 ProcessPoolExecutor에 던지고, 결과는 <out>/<알고리즘>/<패턴>.npz
+(sizes: trials × points 압축 크기, delta: sizes - sizes[:, :1], prefix_len, n, title, key)와 같은 이름의 .png로 저장.
+key = sha256(패턴 정의, 알고리즘, seed, trials, points)이고, 같은 key의 .npz가 있으면 다시 계산하지 않는다
+(--force로 무시). 패턴 정의를 고치면 key가 바뀌어 자동으로 다시 계산된다.
+
+압축 길이는 attack_code/utils/incremental_size.py로 잰다: zlib은 trial 안에서 n이 바뀌어도 같은
+prefix(+ 공통 세그먼트)까지의 compressobj 상태를 재사용하고 나머지만 압축(--no-incremental이면 매번 전체).
+
+lz4/snappy는 선택 의존성(lz4, python-snappy): 없으면 그 알고리즘만 건너뜀. 그림은 matplotlib이 있을 때만.
+
+예:
+    python3 compression_curves.py --algo lz4-block lz4-frame snappy zlib-1 zlib-6 zlib-9 lzma
+    python3 compression_curves.py --pattern prefix_star_suffix copy_prefix --algo zlib-6 --trials 20 --no-plot
+"""
+import argparse
+import hashlib
+import json
+import lzma
+import os
+import random
+import string
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "attack_code"))
+
+from utils.incremental_size import IncrementalSizer  # noqa: E402
+
+BASE = ("jhebsrmefvaisogwryffeqwbioacednwphqljozpljtlrotqatkrplpwxzyodcvqtcexgywhhtgzdftbudljkgezhfxvf"
+        "dcfadgsxhcdkgbmuwbmmwgnolypmaeeidmmotmohqccqnfiiwdgkmsxerhtijbzbgxcgfbkghndlwpqlaokhgyuipnvhggkbjvkeahilfglg")
+FILLER_LEN = 16000
+FILLER_CHARS = string.ascii_uppercase
+
+# 기존 lz4_test.py / snappy_test.py의 여섯 패턴
+PATTERNS = {
+    "star": {
+        "title": "*^(n)",
+        "filler": 0, "segments": [("*", 0, 0, None)],
+    },
+    "prefix_star_suffix": {
+        "title": "prefix + *^(n) + suffix",
+        "filler": FILLER_LEN, "segments": [("*", 0, 0, None)],
+    },
+    "prefix_star100_suffix": {
+        "title": "prefix + *^(100 + n) + suffix",
+        "filler": FILLER_LEN, "segments": [("*", 100, 0, None)],
+    },
+    "two_phase": {
+        "title": "prefix + *^(100 + min(n, 100)) + ~^(max(n, 100)) + suffix",
+        "filler": FILLER_LEN, "segments": [("*", 100, 0, 100), ("~", 100, 100, None)],
+    },
+    "four_phase": {
+        "title": "prefix + *^(150 + min(n, 50)) + #^(150 + max(0, min(n - 50, 50))) + "
+                 "`^(150 + max(0, min(n - 100, 50))) + ~^(max(n, 150)) + suffix",
+        "filler": FILLER_LEN,
+        "segments": [("*", 150, 0, 50), ("#", 150, 50, 100), ("`", 150, 100, 150), ("~", 150, 150, None)],
+    },
+    "copy_prefix": {
+        "title": "prefix + X + X[:n] + suffix",
+        "filler": FILLER_LEN, "reserve": len(BASE), "segments": [(BASE, len(BASE), 0, 0), (BASE, 0, 0, None)],
+    },
+}
+
+
+# ----- 압축기 -----
+def get_compressor(name: str):
+    """알고리즘 이름 -> bytes->bytes. lz4/snappy 패키지가 없으면 ImportError."""
+    if name == "lz4-block":
+        import lz4.block  # 선택 의존성
+        return lambda data: lz4.block.compress(data, store_size=False)
+    if name == "lz4-frame":
+        import lz4.frame  # 선택 의존성
+        return lz4.frame.compress
+    if name == "snappy":
+        import snappy  # 선택 의존성(python-snappy)
+        return snappy.compress
+    if name.startswith("zlib-"):
+        level = int(name[5:])
+        return lambda data: zlib.compress(data, level)
+    if name == "lzma":
+        return lambda data: lzma.compress(data, check=lzma.CHECK_NONE)
+    raise ValueError(f"지원하지 않는 압축 알고리즘: {name}")
+
+
+ALGORITHMS = ["lz4-block", "lz4-frame", "snappy"] + [f"zlib-{lv}" for lv in range(1, 10)] + ["lzma"]
+
+
+# ----- 패턴 -----
+def segment_len(base, lo, hi, n):
+    grow = max(0, n - lo)
+    if hi is not None:
+        grow = min(grow, hi - lo)
+    return base + grow
+
+
+def render_middle(segments, n) -> bytes:
+    out = []
+    for src, base, lo, hi in segments:
+        length = segment_len(base, lo, hi, n)
+        out.append(src * length if len(src) == 1 else src[:length])
+    return "".join(out).encode("ascii")
+
+
+def trial_seed(seed: int, pattern: str, trial: int) -> int:
+    return int.from_bytes(hashlib.sha256(f"{seed}:{pattern}:{trial}".encode()).digest()[:8], "little")
+
+
+def curve_key(pattern: str, algo: str, seed: int, trials: int, points: int) -> str:
+    spec = json.dumps(PATTERNS[pattern], sort_keys=True)
+    return hashlib.sha256(f"{spec}|{algo}|{seed}|{trials}|{points}".encode()).hexdigest()
+
+
+# ----- 워커 -----
+def run_curve(pattern: str, algo: str, seed: int, trials: int, points: int, incremental: bool = True) -> dict:
+    spec = PATTERNS[pattern]
+    compress = get_compressor(algo)
+    if incremental and algo.startswith("zlib-"):
+        sizer = IncrementalSizer("zlib", int(algo[5:]))
+        size_of = sizer.size
+    else:
+        def size_of(data, stream=None):
+            return len(compress(data))
+    filler = spec["filler"]
+    trials = trials if filler else 1   # prefix/suffix가 없으면 trial마다 같은 문자열
+    middles = [render_middle(spec["segments"], n) for n in range(points)]
+    sizes = np.empty((trials, points), dtype=np.int64)
+    prefix_lens = np.zeros(trials, dtype=np.int64)
+    t0 = time.time()
+    for t in range(trials):
+        prefix = suffix = b""
+        if filler:
+            rng = random.Random(trial_seed(seed, pattern, t))
+            avail = filler - spec.get("reserve", 0)
+            plen = rng.randint(0, avail)
+            prefix = "".join(rng.choices(FILLER_CHARS, k=plen)).encode("ascii")
+            suffix = "".join(rng.choices(FILLER_CHARS, k=avail - plen)).encode("ascii")
+            prefix_lens[t] = plen
+        for n, middle in enumerate(middles):
+            sizes[t, n] = size_of(prefix + middle + suffix, t)
+    return {"pattern": pattern, "algo": algo, "sizes": sizes, "prefix_len": prefix_lens,
+            "seconds": time.time() - t0}
+
+
+# ----- 부모 -----
+def curve_path(out_dir, algo, pattern):
+    return os.path.join(out_dir, algo, pattern)
+
+
+def load_cached(path, key):
+    try:
+        with np.load(path + ".npz") as z:
+            if str(z["key"]) == key:
+                return {k: z[k] for k in z.files}
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+def save_curve(path, key, result, title, points):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sizes = result["sizes"]
+    np.savez_compressed(path + ".npz", sizes=sizes, delta=sizes - sizes[:, :1], prefix_len=result["prefix_len"],
+                        n=np.arange(points), title=np.array(title), key=np.array(result["key"]))
+
+
+def plot_curve(path, delta, title, algo, ylim):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.plot(np.arange(delta.shape[1]), delta.T)
+    ax.set(ylabel="compressed size at n - compressed size at n=0", xlabel="n", title=f"{title} [{algo}]")
+    ax.set_ylim([0, ylim])
+    ax.set_xlim([0, delta.shape[1] - 1])
+    ax.grid()
+    fig.savefig(path + ".png")
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compression curves of declared patterns across algorithms")
+    parser.add_argument("--pattern", nargs="+", default=list(PATTERNS), choices=list(PATTERNS))
+    parser.add_argument("--algo", nargs="+", default=["lz4-block", "lz4-frame", "snappy", "zlib-6", "lzma"],
+                        choices=ALGORITHMS)
+    parser.add_argument("--trials", type=int, default=100)
+    parser.add_argument("--points", type=int, default=len(BASE), help="n = 0..points-1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="curves", help="output directory (<out>/<algo>/<pattern>.npz/.png)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="recompute even if a matching .npz exists")
+    parser.add_argument("--no-plot", action="store_true")
+    parser.add_argument("--no-incremental", action="store_true", help="compress every string from scratch")
+    parser.add_argument("--ylim", type=int, default=200)
+    args = parser.parse_args()
+
+    algos = []
+    for algo in args.algo:
+        try:
+            get_compressor(algo)
+            algos.append(algo)
+        except ImportError as e:
+            print(f"[CURVE] skip {algo}: {e}", file=sys.stderr)
+
+    plot = not args.no_plot
+    if plot:
+        try:
+            import matplotlib  # noqa: F401
+        except ImportError:
+            print("[CURVE] matplotlib not installed, writing .npz only", file=sys.stderr)
+            plot = False
+
+    todo, curves = [], {}
+    for algo in algos:
+        for pattern in args.pattern:
+            key = curve_key(pattern, algo, args.seed, args.trials, args.points)
+            path = curve_path(args.out, algo, pattern)
+            cached = None if args.force else load_cached(path, key)
+            if cached is not None:
+                curves[(algo, pattern)] = cached["delta"]
+            else:
+                todo.append((algo, pattern, key))
+    print(f"[CURVE] {len(todo) + len(curves)} curves, {len(curves)} cached, {len(todo)} to compute",
+          file=sys.stderr)
+
+    t0 = time.time()
+    if todo:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futs = {pool.submit(run_curve, pattern, algo, args.seed, args.trials, args.points,
+                                    not args.no_incremental): (algo, pattern, key)
+                    for algo, pattern, key in todo}
+            for fut in as_completed(futs):
+                algo, pattern, key = futs[fut]
+                result = fut.result()
+                result["key"] = key
+                save_curve(curve_path(args.out, algo, pattern), key, result, PATTERNS[pattern]["title"], args.points)
+                curves[(algo, pattern)] = result["sizes"] - result["sizes"][:, :1]
+                print(f"[CURVE] {algo} {pattern}: {result['sizes'].shape[0]} trials in {result['seconds']:.1f}s",
+                      file=sys.stderr)
+
+    if plot:
+        for (algo, pattern), delta in curves.items():
+            plot_curve(curve_path(args.out, algo, pattern), delta, PATTERNS[pattern]["title"], algo, args.ylim)
+
+    # 요약: 압축 크기가 처음 늘어나는 n(trial 중앙값)과 n=points-1에서의 평균 증가량
+    print("algo,pattern,trials,first_growth_n_median,final_delta_mean")
+    for (algo, pattern), delta in sorted(curves.items()):
+        grown = delta > 0
+        first = np.where(grown.any(axis=1), grown.argmax(axis=1), -1)
+        print(f"{algo},{pattern},{delta.shape[0]},{np.median(first):.0f},{delta[:, -1].mean():.1f}")
+    print(f"[CURVE] done in {time.time() - t0:.1f}s -> {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
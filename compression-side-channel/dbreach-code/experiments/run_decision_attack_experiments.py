@@ -1,4 +1,5 @@
 import argparse
+import os
 import subprocess
 
 parser = argparse.ArgumentParser(description="Run experiments to test precision of k of n DBREACH attack")
@@ -9,26 +10,50 @@ parser.add_argument("--out", dest="outfile", action="store", help="output file t
 
 parser.add_argument("--data-type", dest="datatype", action="store", choices={"random", "english", "emails"}, help="type of data to extract from DB", required=True)
 
-parser.add_argument("--compress", dest="compress_algo", action="store", choices={"snappy", "zlib", "lz4"}, help="compression algorithm to use (MongoDB does not support LZ4)", required=True)
+parser.add_argument("--compress", dest="compress_algos", action="store", nargs="+", choices={"snappy", "zlib", "lz4", "lzma", "bzip2"}, help="compression algorithm(s) to use; MariaDB switches them at runtime (MongoDB supports only snappy and zlib)", required=True)
+
+parser.add_argument("--level", dest="levels", action="store", nargs="*", type=int, default=[], help="innodb_compression_level value(s) to sweep for zlib (MariaDB only)")
 
 parser.add_argument("--mode", dest="mode", action="store", choices={"demo", "complete"}, help="whether to perform all tests or just demo. Demo only tests attack with 1 secret inserted, whereas complete tests with different numbers", default="demo")
 
 args = parser.parse_args()
 
+# (알고리즘, 레벨) 조합. 레벨은 zlib에만 의미가 있음
+combos = []
+for algo in args.compress_algos:
+    if algo == "zlib" and args.levels:
+        combos += [(algo, level) for level in args.levels]
+    else:
+        combos.append((algo, None))
+
+def outfile_for(algo, level):
+    """조합이 하나면 --out 그대로, 여러 개면 out_<algo>[_l<level>].csv로 나눔."""
+    if len(combos) == 1:
+        return args.outfile
+    stem, ext = os.path.splitext(args.outfile)
+    return f"{stem}_{algo}" + (f"_l{level}" if level is not None else "") + ext
+
 if (args.database == "MongoDB"):
-    if args.compress_algo == "lz4":
-        raise Exception("MongoDB does not support the LZ4 compression algorithm")
-    python_args = ["python3", "-u", "../attack_code/test_decision_attack_mongo.py", "--" + args.datatype, "--" + args.compress_algo]
+    unsupported = [a for a in args.compress_algos if a not in ("snappy", "zlib")]
+    if unsupported:
+        raise Exception("MongoDB does not support compression algorithm(s): " + ", ".join(unsupported))
+    python_args = ["python3", "-u", "../attack_code/test_decision_attack_mongo.py", "--" + args.datatype]
     if args.mode == "demo":
-        python_args += ["--num_secrets", "1"]
+        secrets_args = ["--num_secrets", "1"]
     else:
-        python_args += ["--num_secrets" "1", "20", "40", "60", "80", "100", "120", "140", "160", "180", "200", "220", "240"]
-    subprocess.run(python_args, stdout=open(args.outfile, "a"))
+        secrets_args = ["--num_secrets", "1", "20", "40", "60", "80", "100", "120", "140", "160", "180", "200", "220", "240"]
+    for algo, _ in combos:
+        subprocess.run(python_args + ["--" + algo] + secrets_args, stdout=open(outfile_for(algo, None), "a"))
 elif (args.database == "MariaDB"):
     python_args = ["python3", "-u", "../attack_code/test_decision_attack_maria.py", "--" + args.datatype]
     if args.mode == "demo":
         python_args += ["--num_secrets", "1"]
     else:
-        python_args += ["--num_secrets" "1", "20", "40", "60", "80", "100", "120", "140", "160", "180", "200", "220", "240"]
-    print("WARNING: Prior to running this program with MariaDB, make sure your DB compression configuration matches the requested compression algorithm")
-    subprocess.run(python_args, stdout=open(args.outfile, "a"))
+        python_args += ["--num_secrets", "1", "20", "40", "60", "80", "100", "120", "140", "160", "180", "200", "220", "240"]
+    # 조합마다 서버 재시작 없이 SET GLOBAL로 바꿔서 실행(공격 스크립트가 trial마다 확인 후 테이블 재생성)
+    for algo, level in combos:
+        env = dict(os.environ, DBREACH_COMPRESSION_ALGO=algo)
+        if level is not None:
+            env["DBREACH_COMPRESSION_LEVEL"] = str(level)
+        print(f"[RUN] {algo} level={level} -> {outfile_for(algo, level)}")
+        subprocess.run(python_args, stdout=open(outfile_for(algo, level), "a"), env=env)
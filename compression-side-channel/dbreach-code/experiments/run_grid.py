@@ -0,0 +1,240 @@
+"""
+파라미터 그리드 실험 러너(한 프로세스, 컨트롤러 연결 재사용, SQLite 체크포인트/재개).
+
+db × 압축 알고리즘 × 데이터 종류 × k × n × 증폭 탐색(amp_search) × filler 세팅(filler_mode) ×
+AMPLIFY_MAX(amp_max) × filler 행 수(filler_rows) × 공격 방식 × trial 조합을 펼쳐
+공격 모듈을 직접 import해서 돌린다. trial이 끝날 때마다 결과와 guess별 점수를 SQLite에 커밋하므로
+중간에 죽어도 같은 명령으로 다시 실행하면 끝난 trial은 건너뛴다.
+trial별 후보/시크릿/filler RNG는 trial 키에서 시드를 뽑아, 재개해도 같은 trial은 같은 입력을 쓴다.
+--db mongo는 MongoDBController + MongoDBREACHer로 돈다. 압축은 DB_ALGOS에 있는 것만, filler 세팅/행 수는
+MariaDB 전용이라 첫 값 한 가지로만 돌고(나머지 조합은 건너뜀), amp_max는 MongoDBREACHer.ampMax로 넘긴다.
+
+예:
+    python3 run_grid.py --db simulated --compress zlib lz4 --data-type random english \\
+        --k 1 20 --n 500 1500 --amp-search linear gallop --filler-mode row bulk \\
+        --amp-max 200 300 --filler-rows 200 400 --trials 3 --checkpoint grid.sqlite
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import string
+import sys
+import time
+import zlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "attack_code"))
+
+import dbreacher_impl  # noqa: E402
+import dbreacher_mongo  # noqa: E402
+import decision_attacker  # noqa: E402
+import k_of_n_attacker  # noqa: E402
+
+MAX_ROW_SIZE = 200
+TABLE = "victimtable"
+MAX_SETUP_ATTEMPTS = 50
+# 증폭 상한: 보조행 페이즈 3개 × 100B (DBREACHerImpl.numAmpPhases)
+AMP_MAX_CAP = 300
+# db별로 쓸 수 있는 압축 알고리즘(그 밖의 조합은 건너뜀). WiredTiger는 block_compressor 이름.
+_MARIADB_ALGOS = ("zlib", "lz4", "snappy", "lzma", "bzip2")
+DB_ALGOS = {"MariaDB": _MARIADB_ALGOS, "simulated": _MARIADB_ALGOS, "mongo": ("snappy", "zlib", "zstd")}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    trial_key TEXT PRIMARY KEY,
+    db TEXT, algo TEXT, datatype TEXT, k INTEGER, n INTEGER,
+    amp_search TEXT, filler_mode TEXT, amp_max INTEGER, filler_rows INTEGER, attack TEXT, trial INTEGER,
+    status TEXT, accuracy REAL, setup_s REAL, measure_s REAL,
+    setups INTEGER, flushes INTEGER, finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    trial_key TEXT, guess TEXT, label INTEGER,
+    b_no REAL, b_guess REAL, b_yes REAL,
+    PRIMARY KEY (trial_key, guess)
+);
+"""
+
+parser = argparse.ArgumentParser(description="Run a grid of DBREACH experiments in-process with SQLite checkpointing")
+parser.add_argument("--db", nargs="+", choices=sorted(DB_ALGOS), default=["MariaDB"])
+parser.add_argument("--database-name", default="flask_db")
+parser.add_argument("--compress", nargs="+", default=["zlib"],
+                    choices=list(_MARIADB_ALGOS) + ["zstd"], help="zstd is mongo-only")
+parser.add_argument("--data-type", nargs="+", default=["random"], choices=["random", "english", "emails"])
+parser.add_argument("--k", nargs="+", type=int, default=[1], help="number of secrets")
+parser.add_argument("--n", nargs="+", type=int, default=[500], help="number of candidates (secrets included)")
+parser.add_argument("--amp-search", nargs="+", default=["linear"], choices=["linear", "gallop"],
+                    help="shrink-point search over the amplification rows")
+parser.add_argument("--filler-mode", nargs="+", default=["row"], choices=["row", "bulk"],
+                    help="how the filler rows are inserted during setup")
+parser.add_argument("--amp-max", nargs="+", type=int, default=[AMP_MAX_CAP],
+                    help=f"AMPLIFY_MAX: bytes of amplification before giving up (1..{AMP_MAX_CAP})")
+parser.add_argument("--filler-rows", nargs="+", type=int, default=[200], help="numFillerRows")
+parser.add_argument("--attack", nargs="+", default=["decision"], choices=["decision", "kofn"])
+parser.add_argument("--trials", type=int, default=1, help="trials per grid point")
+parser.add_argument("--checkpoint", default="grid.sqlite", help="SQLite file for finished trials and scores")
+parser.add_argument("--seed", type=int, default=0, help="master seed mixed into every trial seed")
+
+
+# ----- 체크포인트 -----
+def trial_key(point):
+    return "|".join(str(v) for v in point)
+
+
+# ----- 후보 -----
+def load_candidates(datatype, seed):
+    if datatype == "random":
+        rng = random.Random(seed)
+        return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(10, 20))) for _ in range(2000)]
+    name = "10000-english-long.txt" if datatype == "english" else "fake-emails.txt"
+    with open(os.path.join(ROOT, "resources", name)) as f:
+        return [line.strip().lower() for line in f if line.strip()]
+
+
+def filler_charset(datatype):
+    fset = set(string.printable) - set(string.ascii_lowercase) - {'*'}
+    if datatype == "emails":
+        fset -= {'_', '.', '@'}
+    return ''.join(sorted(fset))
+
+
+# ----- 컨트롤러(db별 하나, 알고리즘 바뀔 때만 SET GLOBAL / mongo는 다음 컬렉션의 block_compressor) -----
+_controllers = {}
+_active_algo = {}
+
+
+def get_controller(db, algo, database_name):
+    control = _controllers.get(db)
+    if control is None:
+        if db == "simulated":
+            from utils.simulated_mariadb import SimulatedMariaDBController
+            control = SimulatedMariaDBController(database_name)
+        elif db == "mongo":
+            import utils.mongodb_utils as mongo_utils
+            control = mongo_utils.MongoDBController(database_name)
+        else:
+            import utils.mariadb_utils as utils
+            control = utils.MariaDBController(database_name)
+        _controllers[db] = control
+    if _active_algo.get(db) != algo:
+        control.set_compression(algo)
+        _active_algo[db] = algo
+    return control
+
+
+# ----- trial -----
+def run_trial(control, dbname, datatype, k, n, amp_search, filler_mode, amp_max, filler_rows, attack, seed,
+              candidates):
+    rng = random.Random(seed)
+    picked = rng.sample(candidates, n)
+    secrets, guesses = picked[:k], picked
+    charset = filler_charset(datatype)
+
+    control.drop_table(TABLE)
+    control.create_basic_table(TABLE, varchar_len=MAX_ROW_SIZE, compressed=True, encrypted=True)
+    for i, secret in enumerate(secrets):
+        control.insert_row(TABLE, i + 1, secret)
+
+    if dbname == "mongo":
+        dbreach = dbreacher_mongo.MongoDBREACHer(control, TABLE, max(10000, k + 10), MAX_ROW_SIZE, charset, ord('*'),
+                                                 ampMax=amp_max, ampSearch=amp_search, rng=random.Random(seed + 1))
+    else:
+        dbreach = dbreacher_impl.DBREACHerImpl(control, TABLE, max(10000, k + 10), MAX_ROW_SIZE, charset, ord('*'),
+                                               ampSearch=amp_search, fillerMode=filler_mode,
+                                               rng=random.Random(seed + 1))
+        dbreach.regen_fillers(numFillerRows=filler_rows)
+        dbreach.ampMax = amp_max
+    if attack == "decision":
+        attacker = decision_attacker.decisionAttacker(dbreach, guesses, charset)
+    else:
+        attacker = k_of_n_attacker.kOfNAttacker(k, dbreach, guesses, True)
+
+    setup_s = measure_s = 0.0
+    setups = 0
+    ok = False
+    while not ok and setups < MAX_SETUP_ATTEMPTS:
+        setups += 1
+        t0 = time.time()
+        if not attacker.setUp():
+            setup_s += time.time() - t0
+            continue
+        t1 = time.time()
+        setup_s += t1 - t0
+        try:
+            ok = attacker.tryAllGuesses()
+        except RuntimeError:
+            ok = False
+        measure_s += time.time() - t1
+
+    result = {"status": "done" if ok else "failed", "accuracy": None, "setup_s": setup_s,
+              "measure_s": measure_s, "setups": setups, "flushes": dbreach.flushCount, "scores": []}
+    if not ok:
+        return result
+
+    secret_set = set(secrets)
+    if attack == "decision":
+        ref = attacker.getGuessAndReferenceScores()
+        ranked = sorted(((1 - (b - b_yes) / max(b_no, 1), g) for g, (b_no, b, b_yes) in ref), reverse=True)
+        result["scores"] = [(g, int(g in secret_set), b_no, b, b_yes) for g, (b_no, b, b_yes) in ref]
+        top = [g for _, g in ranked[:k]]
+    else:
+        result["scores"] = [(g, int(g in secret_set), None, 1.0 / s, None)
+                            for g, s in attacker.compressibilityScores.items()]
+        top = [g for _, g in attacker.getTopKGuesses()[:k]]
+    result["accuracy"] = sum(1 for g in top if g in secret_set) / k
+    return result
+
+
+def main():
+    args = parser.parse_args()
+    bad = [a for a in args.amp_max if not 1 <= a <= AMP_MAX_CAP]
+    if bad:
+        parser.error(f"--amp-max must be within 1..{AMP_MAX_CAP} ({AMP_MAX_CAP // 100} amplification phases "
+                     f"x 100 bytes), got {bad}")
+    db = sqlite3.connect(args.checkpoint)
+    db.executescript(_SCHEMA)
+    done = {row[0] for row in db.execute("SELECT trial_key FROM trials WHERE status = 'done'")}
+
+    grid = list(itertools.product(args.db, args.compress, args.data_type, args.k, args.n,
+                                  args.amp_search, args.filler_mode, args.amp_max, args.filler_rows,
+                                  args.attack, range(args.trials)))
+    todo = []
+    for point in grid:
+        key = trial_key(point)
+        if key not in done:
+            todo.append((key, point))
+    print(f"[GRID] {len(grid)} trials, {len(grid) - len(todo)} already done, {len(todo)} to run")
+
+    candidates = {}
+    for i, (key, point) in enumerate(todo):
+        dbname, algo, datatype, k, n, amp_search, filler_mode, amp_max, filler_rows, attack, trial = point
+        if k > n:
+            print(f"[GRID] skip {key}: k > n")
+            continue
+        if algo not in DB_ALGOS[dbname]:
+            print(f"[GRID] skip {key}: {dbname} has no {algo}")
+            continue
+        if dbname == "mongo" and (filler_mode, filler_rows) != (args.filler_mode[0], args.filler_rows[0]):
+            print(f"[GRID] skip {key}: filler mode/rows do not apply to mongo")
+            continue
+        seed = zlib.crc32(f"{args.seed}|{key}".encode())
+        if datatype not in candidates:
+            candidates[datatype] = load_candidates(datatype, args.seed)
+        control = get_controller(dbname, algo, args.database_name)
+        r = run_trial(control, dbname, datatype, k, n, amp_search, filler_mode, amp_max, filler_rows, attack, seed,
+                      candidates[datatype])
+        with db:
+            db.execute("DELETE FROM scores WHERE trial_key = ?", (key,))
+            db.execute("INSERT OR REPLACE INTO trials VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                       (key,) + point + (r["status"], r["accuracy"], r["setup_s"], r["measure_s"],
+                                         r["setups"], r["flushes"], time.time()))
+            db.executemany("INSERT OR REPLACE INTO scores VALUES (?,?,?,?,?,?)",
+                           [(key,) + s for s in r["scores"]])
+        print(f"[GRID] {i + 1}/{len(todo)} {key} status={r['status']} accuracy={r['accuracy']} "
+              f"setup={r['setup_s']:.1f}s measure={r['measure_s']:.1f}s")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+시뮬레이터 파라미터 스윕(ProcessPoolExecutor, 코어 수만큼 병렬).
+
+maxRowSize × numFillerRows × AMPLIFY_MAX(ampMax) × filler 문자셋 × compressChar × k × n × 데이터 종류 ×
+압축 알고리즘 × trial 조합마다 SimulatedMariaDBController로 공격 한 번을 돌리고,
+끝나는 순서대로 열 단위 디렉터리(utils/columnar.py 형식)에 스트리밍 기록한다.
+
+재현성: 마스터 시드와 작업 번호로 작업마다 독립 시드를 만든다(sha256).
+  → 어떤 워커가 어떤 순서로 처리하든 같은 작업은 같은 후보/시크릿/filler를 쓴다.
+확장성: 작업끼리 공유 상태가 없고(워커마다 자기 시뮬레이터), 부모는 결과 기록만 하므로
+  --workers(기본 os.cpu_count())에 선형으로 늘어난다. 대기 중인 작업 수는 workers*4로 제한.
+
+예:
+    python3 sim_sweep.py --out sweep.cols --max-row-size 200 250 --filler-rows 150 300 \\
+        --amp-max 200 300 --charset printable upper --k 1 5 --n 50 200 --data-type random english --trials 10
+"""
+import argparse
+import hashlib
+import itertools
+import os
+import random
+import string
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "attack_code"))
+os.environ.setdefault("DBREACH_LOG_LEVEL", "off")  # 워커 로그 끔(공격 모듈 import 전에)
+
+from utils.columnar import ColumnWriter  # noqa: E402
+
+CHARSETS = {
+    "printable": set(string.printable) - set(string.ascii_lowercase),
+    "upper": set(string.ascii_uppercase + string.digits),
+    "punct": set(string.punctuation + string.digits),
+}
+
+COLUMNS = {
+    "task": "i8", "seed": "i8",
+    "max_row_size": "i8", "filler_rows": "i8", "amp_max": "i8", "charset": "cat", "compress_char": "cat",
+    "k": "i8", "n": "i8", "datatype": "cat", "algo": "cat", "attack": "cat", "trial": "i8",
+    "status": "cat", "accuracy": "f8", "flushes": "i8", "setups": "i8", "seconds": "f8",
+}
+
+parser = argparse.ArgumentParser(description="Parallel parameter sweep of the DBREACH attack on the simulator")
+parser.add_argument("--out", required=True, help="output column directory")
+parser.add_argument("--max-row-size", nargs="+", type=int, default=[200])
+parser.add_argument("--filler-rows", nargs="+", type=int, default=[300], help="numFillerRows")
+parser.add_argument("--amp-max", nargs="+", type=int, default=[300], help="AMPLIFY_MAX (<= 300)")
+parser.add_argument("--charset", nargs="+", default=["printable"], choices=sorted(CHARSETS))
+parser.add_argument("--compress-char", nargs="+", default=["*"])
+parser.add_argument("--k", nargs="+", type=int, default=[1])
+parser.add_argument("--n", nargs="+", type=int, default=[100])
+parser.add_argument("--data-type", nargs="+", default=["random"], choices=["random", "english", "emails"])
+parser.add_argument("--compress", nargs="+", default=["zlib"], choices=["zlib", "lz4", "snappy", "lzma", "bzip2"])
+parser.add_argument("--attack", nargs="+", default=["kofn"], choices=["kofn", "decision"])
+parser.add_argument("--trials", type=int, default=1)
+parser.add_argument("--seed", type=int, default=0, help="master seed")
+parser.add_argument("--workers", type=int, default=os.cpu_count())
+parser.add_argument("--max-setup-attempts", type=int, default=20)
+
+
+def task_seed(master: int, task: int) -> int:
+    return int.from_bytes(hashlib.sha256(f"{master}:{task}".encode()).digest()[:8], "little") >> 1
+
+
+# ----- 워커 -----
+_candidates = {}
+
+
+def _load_candidates(datatype):
+    if datatype not in _candidates:
+        if datatype == "random":
+            rng = random.Random(0)
+            _candidates[datatype] = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(10, 20)))
+                                     for _ in range(2000)]
+        else:
+            name = "10000-english-long.txt" if datatype == "english" else "fake-emails.txt"
+            with open(os.path.join(ROOT, "resources", name)) as f:
+                _candidates[datatype] = [line.strip().lower() for line in f if line.strip()]
+    return _candidates[datatype]
+
+
+def run_task(task):
+    import dbreacher_impl
+    import decision_attacker
+    import k_of_n_attacker
+    from utils.simulated_mariadb import SimulatedMariaDBController
+
+    out = dict(task, status="done", accuracy=None, flushes=0, setups=0)
+    t0 = time.time()
+    try:
+        rng = random.Random(task["seed"])
+        picked = rng.sample(_load_candidates(task["datatype"]), task["n"])
+        secrets = set(picked[:task["k"]])
+        rng.shuffle(picked)
+        charset = CHARSETS[task["charset"]] - {task["compress_char"]}
+        if task["datatype"] == "emails":
+            charset -= {'_', '.', '@'}
+        charset = "".join(sorted(charset))
+
+        control = SimulatedMariaDBController(algorithm=task["algo"])
+        control.create_basic_table("victimtable", varchar_len=task["max_row_size"])
+        for i, s in enumerate(sorted(secrets)):
+            control.insert_row("victimtable", i + 1, s)
+        dbreach = dbreacher_impl.DBREACHerImpl(control, "victimtable", 10000, task["max_row_size"], charset,
+                                               ord(task["compress_char"]), ampSearch="gallop",
+                                               rng=random.Random(task["seed"] + 1))
+        dbreach.regen_fillers(numFillerRows=task["filler_rows"])
+        dbreach.ampMax = min(task["amp_max"], 100 * dbreach.numAmpPhases)
+        if task["attack"] == "kofn":
+            attacker = k_of_n_attacker.kOfNAttacker(task["k"], dbreach, picked, True)
+        else:
+            attacker = decision_attacker.decisionAttacker(dbreach, picked, charset)
+
+        ok = False
+        while not ok and out["setups"] < task["max_setup_attempts"]:
+            out["setups"] += 1
+            if attacker.setUp():
+                try:
+                    ok = attacker.tryAllGuesses()
+                except RuntimeError:
+                    ok = False
+        out["flushes"] = dbreach.flushCount
+        if not ok:
+            out["status"] = "failed"
+        elif task["attack"] == "kofn":
+            top = [g for _, g in attacker.getTopKGuesses()[:task["k"]]]
+            out["accuracy"] = sum(g in secrets for g in top) / task["k"]
+        else:
+            ref = attacker.getGuessAndReferenceScores()
+            ranked = sorted(((1 - (b - b_yes) / max(b_no, 1), g) for g, (b_no, b, b_yes) in ref), reverse=True)
+            out["accuracy"] = sum(g in secrets for _, g in ranked[:task["k"]]) / task["k"]
+    except Exception as e:
+        out["status"] = "error:" + type(e).__name__
+    out["seconds"] = time.time() - t0
+    return out
+
+
+# ----- 부모 -----
+def make_tasks(args):
+    grid = itertools.product(args.max_row_size, args.filler_rows, args.amp_max, args.charset, args.compress_char,
+                             args.k, args.n, args.data_type, args.compress, args.attack, range(args.trials))
+    for i, (mrs, rows, amp, cs, cc, k, n, dt, algo, attack, trial) in enumerate(grid):
+        yield {"task": i, "seed": task_seed(args.seed, i), "max_row_size": mrs, "filler_rows": rows,
+               "amp_max": amp, "charset": cs, "compress_char": cc, "k": k, "n": n, "datatype": dt,
+               "algo": algo, "attack": attack, "trial": trial, "max_setup_attempts": args.max_setup_attempts}
+
+
+def main():
+    args = parser.parse_args()
+    tasks = make_tasks(args)
+    done = 0
+    t0 = time.time()
+    with ColumnWriter(args.out, COLUMNS, flush_rows=256) as writer, \
+            ProcessPoolExecutor(max_workers=args.workers) as pool:
+        inflight = set()
+        for task in itertools.chain(tasks, [None]):
+            if task is not None:
+                inflight.add(pool.submit(run_task, task))
+                if len(inflight) < args.workers * 4:
+                    continue
+            while inflight and (task is None or len(inflight) >= args.workers * 4):
+                finished, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    writer.append(fut.result())
+                    done += 1
+                if done and done % 100 == 0:
+                    print(f"[SWEEP] {done} tasks, {done / (time.time() - t0):.1f}/s", file=sys.stderr)
+    print(f"[SWEEP] {done} tasks in {time.time() - t0:.1f}s -> {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
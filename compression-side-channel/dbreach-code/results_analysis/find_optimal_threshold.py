@@ -1,50 +1,108 @@
 import csv
 import numpy as np
-import matplotlib.pyplot as plt
 import sys
 
-text_type = sys.argv[1].replace("--", "")
-
-fig, ax = plt.subplots()
-ax.set(xlabel="threshold", ylabel="accuracy", title="Accuracy of decision attack for different threshold values")
-for c in ["snappy", "zlib"]:
-    true_labels = []
-    ref_scores = []
-    with open('decision-data-results/decision-data-mongo-' + text_type + '-' + c + '.csv') as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            if(row[0] == "0" or row[0] == "1"):
-                true_labels.append(int(row[0]))
-                ref_scores.append((int(row[2]) if row[2] != "0" else 1, int(row[3]), int(row[4])))
-            else:
-                pass
-    true_labels = np.array(true_labels)
-    pcts = [1 - (b_yes - b) / max(b_yes - b_no, 1) for b_no, b, b_yes in ref_scores]
-
-    print(len(pcts))
-
-    thresholds = np.arange(-0.5, 1.5, 0.001)
-    accuracies = []
-    for threshold in thresholds:
-        labels = np.array([pct >= threshold for pct in pcts])
-        accuracy = 1 - np.sum(np.abs(labels - true_labels)) / labels.shape[0]
-        accuracies.append(accuracy)
-
-    ax.plot(thresholds, accuracies, label=c)
-    
-    f = open(text_type + "_" + c+"_threshold_data.csv", "w")
-    f.write("threshold,accuracy\n")
-    for i in range(0,len(thresholds)):
-    	f.write(str(thresholds[i])+","+str(accuracies[i]) + "\n")
-    f.close()
-
-    maximum_accuracy = np.max(accuracies)
-    maximum_threshold = -0.5 + 0.001*np.argmax(accuracies)
-    print(c + ": maximum accuracy achieved: " + str(maximum_accuracy))
-    print(c + ": maximum accuracy threshold: " + str(maximum_threshold))
-
-plt.legend()
-ax.grid()
-plt.savefig("threshold-accuracy.png")
-plt.show()
+# 사용: python find_optimal_threshold.py --english [mongo|maria]
+# decision-data-results/decision-data-<db>-<text>-<algo>.csv 를 읽어
+#   - 알고리즘별, 알고리즘 x records_on_page별 최적 threshold/정확도 → <text>_optimal_thresholds.csv
+#   - 알고리즘별 threshold-정확도 곡선 → <text>_<algo>_threshold_data.csv, threshold-accuracy.png
+# graph_decision_accuracy_by_records.py는 <text>_optimal_thresholds.csv의 threshold를 사용한다.
 
+
+def load_decision_csv(path):
+    """(true_labels, records_on_page, pcts) 배열. 헤더 등 라벨이 0/1이 아닌 행은 건너뜀."""
+    labels, records, ref = [], [], []
+    with open(path) as csvfile:
+        for row in csv.reader(csvfile):
+            if row and (row[0] == "0" or row[0] == "1"):
+                labels.append(int(row[0]))
+                records.append(int(row[1]))
+                ref.append((int(row[2]) if row[2] != "0" else 1, int(row[3]), int(row[4])))
+    ref = np.array(ref, dtype=np.float64).reshape(-1, 3)
+    b_no, b, b_yes = ref[:, 0], ref[:, 1], ref[:, 2]
+    pcts = 1 - (b_yes - b) / np.maximum(b_yes - b_no, 1)
+    return np.array(labels, dtype=np.int64), np.array(records, dtype=np.int64), pcts
+
+
+def accuracy_curve(pcts, labels):
+    """
+    pct >= threshold 를 1로 예측할 때, 서로 다른 pct 값마다의 정확도.
+    정렬 한 번 + 누적합: O(N log N).
+    반환: (thresholds 내림차순, accuracies, all_negative_accuracy)
+      thresholds[i]를 threshold로 쓰면 pct >= thresholds[i]인 행이 모두 1로 예측됨.
+    """
+    order = np.argsort(-pcts, kind="stable")
+    s = pcts[order]
+    y = labels[order]
+    n = len(s)
+    n_pos = int(y.sum())
+    tp = np.cumsum(y)
+    fp = np.arange(1, n + 1) - tp
+    # 같은 값이 여러 개면 그 값의 마지막 위치에서만 자를 수 있음
+    last = np.r_[s[1:] != s[:-1], True]
+    tp, fp, thresholds = tp[last], fp[last], s[last]
+    acc = (tp + (n - n_pos - fp)) / n
+    return thresholds, acc, (n - n_pos) / n
+
+
+def optimal_threshold(pcts, labels):
+    """
+    정확도를 최대로 하는 threshold(정확한 최적점).
+    최적 구간 (다음 값, thresholds[i]] 의 중간값을 돌려준다(구간 안 어디든 정확도 동일).
+    반환: (threshold, accuracy)
+    """
+    if len(pcts) == 0:
+        return float("nan"), float("nan")
+    thresholds, acc, acc_none = accuracy_curve(pcts, labels)
+    i = int(np.argmax(acc))
+    if acc_none > acc[i]:
+        return float(thresholds[0]) + 1.0, float(acc_none)
+    lower = thresholds[i + 1] if i + 1 < len(thresholds) else thresholds[i] - 1.0
+    return float((thresholds[i] + lower) / 2), float(acc[i])
+
+
+def find_thresholds(path):
+    """[(records_on_page | "all", threshold, accuracy, rows)]"""
+    labels, records, pcts = load_decision_csv(path)
+    out = [("all",) + optimal_threshold(pcts, labels) + (len(pcts),)]
+    order = np.argsort(records, kind="stable")
+    keys, starts = np.unique(records[order], return_index=True)
+    for key, idx in zip(keys, np.split(order, starts[1:])):
+        out.append((int(key),) + optimal_threshold(pcts[idx], labels[idx]) + (len(idx),))
+    return out
+
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    text_type = sys.argv[1].replace("--", "")
+    db = sys.argv[2] if len(sys.argv) > 2 else "mongo"
+    algos = ["snappy", "zlib"] + (["lz4"] if db == "maria" else [])
+
+    fig, ax = plt.subplots()
+    ax.set(xlabel="threshold", ylabel="accuracy", title="Accuracy of decision attack for different threshold values")
+    summary = open(text_type + "_optimal_thresholds.csv", "w")
+    summary.write("algorithm,records_on_page,threshold,accuracy,rows\n")
+    for c in algos:
+        path = 'decision-data-results/decision-data-' + db + '-' + text_type + '-' + c + '.csv'
+        labels, _, pcts = load_decision_csv(path)
+        print(len(pcts))
+
+        thresholds, accuracies, _ = accuracy_curve(pcts, labels)
+        ax.step(thresholds, accuracies, where="post", label=c)
+        with open(text_type + "_" + c + "_threshold_data.csv", "w") as f:
+            f.write("threshold,accuracy\n")
+            for t, a in zip(thresholds[::-1], accuracies[::-1]):
+                f.write(f"{t!r},{a!r}\n")
+
+        for records_on_page, threshold, accuracy, rows in find_thresholds(path):
+            summary.write(f"{c},{records_on_page},{threshold!r},{accuracy!r},{rows}\n")
+            if records_on_page == "all":
+                print(c + ": maximum accuracy achieved: " + str(accuracy))
+                print(c + ": maximum accuracy threshold: " + str(threshold))
+    summary.close()
+
+    plt.legend()
+    ax.grid()
+    plt.savefig("threshold-accuracy.png")
+    plt.show()
@@ -1,40 +1,37 @@
 import csv
 import numpy as np
 import matplotlib.pyplot as plt
-from collections import defaultdict
 import sys
 
+from find_optimal_threshold import load_decision_csv
+
+# 사용: python graph_decision_accuracy_by_records.py --english [mongo|maria] [--per-bucket]
+# threshold는 find_optimal_threshold.py가 만든 <text>_optimal_thresholds.csv에서 읽는다.
+#   기본: 알고리즘별 전체 최적값("all") 하나를 모든 records_on_page에 적용
+#   --per-bucket: records_on_page별 최적값 사용(그 버킷에서 달성 가능한 최대 정확도)
+
 fig, ax = plt.subplots()
 ax.set(xlabel="Records on page", ylabel="accuracy", title="Accuracy of decision attack vs. number of records on page")
 
 text_type = sys.argv[1].replace("--", "")
+db = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else "mongo"
+per_bucket = "--per-bucket" in sys.argv
 
-# fill in thresholds with chosen t_yes values:
 thresholds = dict()
-thresholds["snappy"] = 0.492
-thresholds["zlib"] = 0.515 
-#thresholds["lz4"] = 0.78
-
-# if graphing for MariaDB, add "lz4" back to thist list & uncomment lz4 line above
-for c in ["snappy", "zlib"]:
-    ref_scores = defaultdict(lambda: [])
-    true_labels = defaultdict(lambda: [])
-    with open('decision-data-results/decision-data-mongo-' + text_type + '-' + c + '.csv') as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            if row[0]=="0" or row[0]=="1":
-                true_labels[int(row[1])].append(int(row[0]))
-                ref_scores[int(row[1])].append((int(row[2]) if row[2] != "0" else 1, int(row[3]), int(row[4])))
-
-    threshold = thresholds[c]
-    accuracies = []
-    for records_on_page in ref_scores.keys():
-        pcts = [1 - (b_yes - b) / max(b_yes - b_no, 1) for b_no, b, b_yes in ref_scores[records_on_page]]
-        labels = np.array([pct >= threshold for pct in pcts])
-        accuracy = 1 - np.sum(np.abs(labels - true_labels[records_on_page])) / labels.shape[0]
-        accuracies.append((records_on_page, accuracy))
+with open(text_type + "_optimal_thresholds.csv") as csvfile:
+    for row in csv.DictReader(csvfile):
+        thresholds[(row["algorithm"], row["records_on_page"])] = float(row["threshold"])
 
-    accuracies.sort()
+for c in sorted({algo for algo, _ in thresholds}):
+    true_labels, records, pcts = load_decision_csv('decision-data-results/decision-data-' + db + '-' + text_type + '-' + c + '.csv')
+
+    accuracies = []
+    for records_on_page in np.unique(records):
+        mask = records == records_on_page
+        threshold = thresholds.get((c, str(records_on_page)), thresholds[(c, "all")]) if per_bucket else thresholds[(c, "all")]
+        labels = pcts[mask] >= threshold
+        accuracy = np.mean(labels == true_labels[mask])
+        accuracies.append((int(records_on_page), float(accuracy)))
 
     print(c + ": " + str(accuracies))
 
@@ -46,4 +43,3 @@ plt.ylim([0.0,1.0])
 plt.yticks(np.arange(0, 1.0, 0.1))
 plt.savefig("decision-records-accuracy.png")
 plt.show()
-
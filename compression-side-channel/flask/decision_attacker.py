@@ -3,6 +3,10 @@ import os
 import time
 from typing import Iterable, List, Tuple, Dict, Optional
 import dbreacher
+import utils.attack_log as attack_log
+
+# verbose 진행 로그(행 단위 print 대신 attack_log 싱크로)
+_log = attack_log.get_logger()
 
 class decisionAttacker:
     """
@@ -52,19 +56,19 @@ class decisionAttacker:
             try:
                 self._b_yes[L] = self.dbreacher.getSYesReferenceScore(L)
                 if verbose:
-                    print(f"[REF] b_yes cached for L={L}: {self._b_yes[L]}")
+                    _log.info("REF", "b_yes cached for L=%d: %s", L, self._b_yes[L])
             except RuntimeError:
                 if verbose:
-                    print(f"[REF] b_yes failed for L={L} (boundary broke).")
+                    _log.warn("REF", "b_yes failed for L=%d (boundary broke).", L)
                 return False
         if L not in self._b_no:
             try:
                 self._b_no[L] = self.dbreacher.getSNoReferenceScore(L, self._fillerSeq)
                 if verbose:
-                    print(f"[REF] b_no cached for L={L}: {self._b_no[L]}")
+                    _log.info("REF", "b_no cached for L=%d: %s", L, self._b_no[L])
             except RuntimeError:
                 if verbose:
-                    print(f"[REF] b_no failed for L={L} (boundary broke).")
+                    _log.warn("REF", "b_no failed for L=%d (boundary broke).", L)
                 return False
         return True
 
@@ -80,7 +84,7 @@ class decisionAttacker:
 
         if not self.guesses:
             if verbose:
-                print("[WARN] no guesses to test.")
+                _log.warn("WARN", "no guesses to test.")
             return True
 
         for g in self.guesses:
@@ -91,11 +95,11 @@ class decisionAttacker:
             t0 = time.time()
             shrunk = self.dbreacher.insertGuessAndCheckIfShrunk(g)
             if verbose:
-                print(f"[GUESS] insert '{g}' (L={L}) -> shrunk={shrunk}")
+                _log.info("GUESS", "insert '%s' (L=%d) -> shrunk=%s", g, L, shrunk)
 
             if shrunk:
                 if verbose:
-                    print(f"[WARN] table shrunk too early on guess: '{g}'")
+                    _log.warn("WARN", "table shrunk too early on guess: '%s'", g)
                 return False
 
             try:
@@ -105,19 +109,18 @@ class decisionAttacker:
                     steps += 1
             except RuntimeError as e:
                 if verbose:
-                    print(f"[WARN] amplification failed ({e}). Need to re-setup.")
+                    _log.warn("WARN", "amplification failed (%s). Need to re-setup.", e)
                 return False
 
             b = self.dbreacher.getBytesShrunkForCurrentGuess()
             if b is None:
                 if verbose:
-                    print("[ERR] bytesShrunkForCurrentGuess is None; abandoning.")
+                    _log.warn("ERR", "bytesShrunkForCurrentGuess is None; abandoning.")
                 return False
 
             self._b_guess[g] = float(b)
             if verbose:
-                dt = time.time() - t0
-                print(f"[DONE] '{g}' -> bytesShrunk={b} (steps={steps}, {dt:.4f}s)")
+                _log.info("DONE", "'%s' -> bytesShrunk=%s (steps=%d, %.4fs)", g, b, steps, time.time() - t0)
 
         return True
 
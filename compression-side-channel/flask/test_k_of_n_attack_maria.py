@@ -4,9 +4,9 @@ import sys
 import time
 import random
 import string
-import atexit
 
 import utils.mariadb_utils as utils
+import utils.attack_log as attack_log
 import dbreacher_impl
 import decision_attacker
 
@@ -14,23 +14,6 @@ import decision_attacker
 os.environ.setdefault("DBREACH_LOG_FULL", "1")
 os.environ.setdefault("ATTACK_VERBOSE", "1")
 
-# ===================== Tee (콘솔+파일 동시 기록) =====================
-class _Tee:
-    def __init__(self, streams):
-        self.streams = streams
-    def write(self, s):
-        for st in self.streams:
-            try:
-                st.write(s)
-            except Exception:
-                pass
-    def flush(self):
-        for st in self.streams:
-            try:
-                st.flush()
-            except Exception:
-                pass
-
 # ===================== 인자 파싱 =====================
 mode = "--random"            # --random | --english | --emails
 secrets_to_try = [1]         # 기본 k
@@ -38,7 +21,7 @@ seed = None                  # 재현성용
 start_idx_override = None    # --start 로 강제 가능
 max_setup_attempts = 10      # 무한루프 방지
 num_fillers = 200            # 논문 기본
-logfile = None               # 로그 저장 경로 (옵션)
+logfile = None               # 로그 저장 경로 (옵션, 콘솔 출력과 같은 텍스트)
 # dbreacher_impl 튜닝용(환경변수로 전달)
 amplify_max_cli = None       # 300(기본), 400~500 권장 가능
 pause_s_cli = None           # 증폭 step 사이 대기(초)
@@ -111,24 +94,14 @@ if amplify_max_cli is not None:
 if pause_s_cli is not None:
     os.environ["DBREACH_PAUSE_S"] = str(pause_s_cli)
 
-# ===================== 로그 파일 tee 설정 =====================
-_log_fp = None
+# ===================== 로그 싱크 설정 =====================
+# --logfile: 예전 tee와 같은 텍스트 로그([TAG] 줄 + 결과 CSV 행). 콘솔에도 그대로 찍고, 파일 쓰기는 백그라운드 스레드.
+# JSONL이 필요하면 --logfile 대신 DBREACH_LOG_SINK=경로.jsonl[.gz] (결과 행은 tag "CSV"로 함께 기록).
 if logfile:
-    # line-buffered 텍스트 파일
-    _log_fp = open(logfile, "w", buffering=1, encoding="utf-8", errors="replace")
-    sys.stdout = _Tee([sys.__stdout__, _log_fp])
-    sys.stderr = _Tee([sys.__stderr__, _log_fp])
-
-def _close_log():
-    global _log_fp
-    try:
-        if _log_fp:
-            _log_fp.flush()
-            _log_fp.close()
-    except Exception:
-        pass
-
-atexit.register(_close_log)
+    _log = attack_log.configure(sink=logfile, fmt="text", echo=True)
+else:
+    _log = attack_log.get_logger()
+results = attack_log.results()
 
 # ===================== 상수/초기화 =====================
 maxRowSize = 200                   # 논문 기본
@@ -140,7 +113,8 @@ _rng = random.Random(seed) if seed is not None else random.Random()
 
 def env_report(ctrl: utils.MariaDBController):
     try:
-        print("[ENV] MariaDB variables snapshot:")
+        # 예전 로그와 같은 모양: [ENV] 헤더 아래 "  name=val" 줄들(한 레코드로)
+        lines = ["MariaDB variables snapshot:"]
         for like in ("innodb_page_size",
                      "innodb_compression_algorithm",
                      "innodb_file_per_table",
@@ -148,9 +122,10 @@ def env_report(ctrl: utils.MariaDBController):
                      "innodb_encrypt_log"):
             ctrl.cur.execute(f"SHOW VARIABLES LIKE '{like}';")
             for name, val in ctrl.cur.fetchall():
-                print(f"  {name}={val}")
+                lines.append(f"  {name}={val}")
+        _log.info("ENV", "%s", "\n".join(lines))
     except Exception as e:
-        print(f"[ENV] warn: failed to read variables: {e}")
+        _log.warn("ENV", "warn: failed to read variables: %s", e)
 
 # DB 연결 (컨테이너 내부 주소/계정)
 control = utils.MariaDBController(
@@ -185,7 +160,7 @@ elif mode == "--emails":
         for line in f:
             possibilities.append(line.strip().lower())
 else:
-    print(f"[WARN] unknown mode {mode}, fallback --random")
+    _log.warn("WARN", "unknown mode %s, fallback --random", mode)
     for _ in range(2000):
         size = _rng.randint(10, 20)
         secret = "".join(_rng.choices(string.ascii_lowercase, k=size))
@@ -198,7 +173,8 @@ if mode == "--emails":
 fillerCharSet = ''.join(sorted(fset))
 
 # CSV 헤더
-print("records_on_page,k,accuracy_n_500,accuracy_n_750,accuracy_n_1000,accuracy_n_1250,accuracy_n_1500,setup_time,per_guess_time")
+results.write_row("records_on_page", "k", "accuracy_n_500", "accuracy_n_750", "accuracy_n_1000",
+                  "accuracy_n_1250", "accuracy_n_1500", "setup_time", "per_guess_time")
 
 # ===================== k 루프 =====================
 for num_secrets in secrets_to_try:
@@ -215,7 +191,7 @@ for num_secrets in secrets_to_try:
         correct_guesses = set()
         for sidx in range(num_secrets):
             secret = possibilities[(trial + sidx) % len(possibilities)]
-            print(f"[SETUP] INSERT secret id={sidx+1} val='{secret}'")
+            _log.debug("SETUP", "INSERT secret id=%d val='%s'", sidx + 1, secret)
             control.insert_row(table, sidx + 1, secret)
             guesses.append(secret)
             correct_guesses.add(secret)
@@ -257,21 +233,21 @@ for num_secrets in secrets_to_try:
         while not success and attempt < max_setup_attempts:
             attempt += 1
             ok = attacker.setUp()
-            print(f"[MAIN] setUp attempt {attempt}/{max_setup_attempts} -> {ok}")
+            _log.info("MAIN", "setUp attempt %d/%d -> %s", attempt, max_setup_attempts, ok)
             if not ok:
                 continue
             try:
                 success = attacker.tryAllGuesses(verbose=True)
             except RuntimeError as e:
-                print(f"[MAIN] tryAllGuesses raised: {e} (will retry)")
+                _log.warn("MAIN", "tryAllGuesses raised: %s (will retry)", e)
                 success = False
 
         setupEnd = time.time()
 
         if not success:
-            print(f"[MAIN] failed to stabilize after {max_setup_attempts} attempts; aborting this trial.")
+            _log.warn("MAIN", "failed to stabilize after %d attempts; aborting this trial.", max_setup_attempts)
             # 그래도 CSV 한 줄은 남김(측정 실패 표시)
-            print(f"0,{num_secrets},0,0,0,0,0,{setupEnd - setupStart},0")
+            results.write_row(0, num_secrets, 0, 0, 0, 0, 0, setupEnd - setupStart, 0)
             continue
 
         # 참조 포함 점수 취득
@@ -282,15 +258,15 @@ for num_secrets in secrets_to_try:
         pcts.sort(reverse=True)
 
         # 디버그 출력(상위 50개)
-        print("[RESULT] raw refScores (g, (b_no, b, b_yes)):")
+        _log.info("RESULT", "raw refScores (g, (b_no, b, b_yes)):")
         for g, (b_no, b, b_yes) in refScores:
-            print(f"  g='{g}'  b_no={b_no}  b={b}  b_yes={b_yes}")
+            _log.debug("RESULT", "  g='%s'  b_no=%s  b=%s  b_yes=%s", g, b_no, b, b_yes)
 
-        print("[RESULT] ranking by pct (pct, guess):")
+        _log.info("RESULT", "ranking by pct (pct, guess):")
         for pct, g in pcts[:50]:
-            print(f"  pct={pct:.6f}  g='{g}'")
+            _log.info("RESULT", "  pct=%.6f  g='%s'", pct, g)
         if len(pcts) > 50:
-            print(f"  ... and {len(pcts)-50} more")
+            _log.info("RESULT", "  ... and %d more", len(pcts) - 50)
 
         # 상위 k 정확도
         def topk_acc(pool):
@@ -308,4 +284,6 @@ for num_secrets in secrets_to_try:
 
         # CSV: records_on_page는 실제 삽입된 filler 행 수로 기록
         records_on_page = getattr(dbreach, "rowsAdded", 0)
-        print(f"{records_on_page},{num_secrets},{accuracy_500},{accuracy_750},{accuracy_1000},{accuracy_1250},{accuracy_1500},{setupEnd - setupStart},{per_guess_time}")
+        results.write_row(records_on_page, num_secrets,
+                          accuracy_500, accuracy_750, accuracy_1000, accuracy_1250, accuracy_1500,
+                          setupEnd - setupStart, per_guess_time)
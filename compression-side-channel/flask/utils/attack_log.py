@@ -0,0 +1,218 @@
+# utils/attack_log.py
+"""
+DBREACH 공격 코드용 레벨 로그 + 결과 CSV 스트림.
+
+- 레벨이 꺼져 있으면 호출 즉시 반환(포맷 문자열/인자 조합을 만들지 않음).
+  로그는 log.debug("AMP", "alloc %s -> %s", old, new)처럼 %-포맷 인자로 넘긴다.
+- 싱크:
+    stdout                  : 기존 print와 같은 "[TAG] msg" 형식, 동기 출력(순서 보존)
+    그 밖의 경로(.gz 가능)  : 백그라운드 스레드가 배치로 기록. 기존 tee 로그와 같은 "[TAG] msg" 텍스트(덮어씀)
+    *.jsonl / *.jsonl.gz    : 같은 방식으로 JSON 한 줄({"t","lvl","tag","msg"})씩 이어 씀(opt-in)
+- 결과 CSV 행은 results()의 별도 스트림(DBREACH_CSV_OUT, 기본 stdout)으로 보내고,
+  로그 싱크가 파일이면 거기에도 같은 순서로 남긴다(텍스트는 CSV 줄 그대로, JSONL은 tag "CSV").
+
+환경변수:
+  DBREACH_LOG_LEVEL  debug | info | warn | off
+                     (미지정 시 DBREACH_LOG_FULL=1이면 debug(행 값 전체 포함), 0이면 info)
+  DBREACH_LOG_SINK   stdout(기본) | 경로(텍스트) | 경로.jsonl | 경로.jsonl.gz
+  DBREACH_CSV_OUT    결과 CSV 경로(기본 stdout)
+(스크립트 인자로 바꿀 때는 configure(level=..., sink=..., echo=...))
+"""
+import atexit
+import gzip
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+OFF = 100
+
+_LEVELS = {"debug": DEBUG, "info": INFO, "warn": WARN, "off": OFF}
+_LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARN: "warn"}
+
+_BATCH = 512
+
+
+def _render(fmt, args):
+    return fmt % args if args else fmt
+
+
+class _StdoutSink:
+    def write(self, ts, level, tag, fmt, args):
+        print(f"[{tag}] {_render(fmt, args)}")
+
+    def close(self):
+        sys.stdout.flush()
+
+
+class _FileSink:
+    """
+    레코드를 큐에 넣기만 하고, 포맷/직렬화/쓰기는 writer 스레드에서 배치로.
+    fmt: text("[TAG] msg", 덮어씀) | jsonl(이어 씀). echo=True면 콘솔에도 동기 출력(예전 tee처럼).
+    """
+
+    def __init__(self, path: str, fmt: str = "jsonl", echo: bool = False):
+        mode = "a" if fmt == "jsonl" else "w"
+        if path.endswith(".gz"):
+            self._fp = gzip.open(path, mode + "t", encoding="utf-8", compresslevel=1)
+        else:
+            self._fp = open(path, mode, encoding="utf-8", errors="replace")
+        self.fmt = fmt
+        self.echo = echo
+        self._q = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name="attack-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, ts, level, tag, fmt, args):
+        if self.echo:
+            print(f"[{tag}] {_render(fmt, args)}")
+        self._q.put((ts, level, tag, fmt, args))
+
+    def write_line(self, line: str):
+        """태그 없는 줄(결과 CSV 행). 로그 줄과 같은 큐라 순서가 유지됨."""
+        self._q.put((time.time(), None, None, line, ()))
+
+    def _format(self, rec):
+        ts, level, tag, fmt, args = rec
+        msg = _render(fmt, args)
+        if self.fmt == "text":
+            return msg if tag is None else f"[{tag}] {msg}"
+        if tag is None:
+            return json.dumps({"t": ts, "lvl": "result", "tag": "CSV", "msg": msg})
+        return json.dumps({"t": ts, "lvl": _LEVEL_NAMES.get(level, level), "tag": tag, "msg": msg})
+
+    def _drain(self):
+        while True:
+            batch = [self._q.get()]
+            try:
+                while len(batch) < _BATCH:
+                    batch.append(self._q.get_nowait())
+            except queue.Empty:
+                pass
+            lines = []
+            stop = False
+            for rec in batch:
+                if rec is None:
+                    stop = True
+                    continue
+                lines.append(self._format(rec))
+            if lines:
+                self._fp.write("\n".join(lines) + "\n")
+            if stop:
+                self._fp.close()
+                return
+
+    def close(self):
+        self._q.put(None)
+        self._thread.join()
+
+
+class AttackLogger:
+    def __init__(self, level: int = INFO, sink=None):
+        self.level = level
+        self.sink = sink or _StdoutSink()
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, tag: str, fmt: str, *args):
+        if level < self.level:
+            return
+        self.sink.write(time.time(), level, tag, fmt, args)
+
+    def debug(self, tag: str, fmt: str, *args):
+        if DEBUG < self.level:
+            return
+        self.sink.write(time.time(), DEBUG, tag, fmt, args)
+
+    def info(self, tag: str, fmt: str, *args):
+        if INFO < self.level:
+            return
+        self.sink.write(time.time(), INFO, tag, fmt, args)
+
+    def warn(self, tag: str, fmt: str, *args):
+        if WARN < self.level:
+            return
+        self.sink.write(time.time(), WARN, tag, fmt, args)
+
+    def close(self):
+        self.sink.close()
+
+
+class ResultWriter:
+    """결과 CSV 전용 스트림(로그와 분리). 행 단위로 flush. 로그 싱크가 파일이면 거기에도 남김."""
+
+    def __init__(self, path: str = None):
+        self._own = bool(path) and path != "-"
+        self._fp = open(path, "a", buffering=1, encoding="utf-8") if self._own else sys.stdout
+
+    def write_row(self, *fields):
+        line = ",".join(str(f) for f in fields)
+        self._fp.write(line + "\n")
+        self._fp.flush()
+        mirror = getattr(get_logger().sink, "write_line", None)
+        if mirror is not None:
+            mirror(line)
+
+    def close(self):
+        if self._own:
+            self._fp.close()
+
+
+def _level_from_env() -> int:
+    name = os.getenv("DBREACH_LOG_LEVEL")
+    if name:
+        return _LEVELS.get(name.lower(), INFO)
+    return DEBUG if os.getenv("DBREACH_LOG_FULL", "1") != "0" else INFO
+
+
+def _make_sink(target: str, fmt: str = None, echo: bool = False):
+    if target in ("stdout", "-", ""):
+        return _StdoutSink()
+    if fmt is None:
+        fmt = "jsonl" if target.endswith((".jsonl", ".jsonl.gz")) else "text"
+    return _FileSink(target, fmt, echo)
+
+
+def _sink_from_env():
+    return _make_sink(os.getenv("DBREACH_LOG_SINK", "stdout"))
+
+
+_logger = None
+_results = None
+
+
+def get_logger() -> AttackLogger:
+    global _logger
+    if _logger is None:
+        _logger = AttackLogger(_level_from_env(), _sink_from_env())
+        atexit.register(_logger.close)
+    return _logger
+
+
+def configure(level: str = None, sink: str = None, fmt: str = None, echo: bool = False) -> AttackLogger:
+    """
+    스크립트 인자로 레벨/싱크를 바꿀 때(환경변수 대신). 이미 get_logger()를 받아 둔 모듈에도 반영됨.
+    fmt: text | jsonl(기본은 확장자로 판단), echo: 파일 싱크일 때 콘솔에도 출력.
+    """
+    logger = get_logger()
+    if level is not None:
+        logger.level = _LEVELS.get(level.lower(), INFO)
+    if sink is not None:
+        old = logger.sink
+        logger.sink = _make_sink(sink, fmt, echo)
+        old.close()
+    return logger
+
+
+def results() -> ResultWriter:
+    global _results
+    if _results is None:
+        _results = ResultWriter(os.getenv("DBREACH_CSV_OUT"))
+        atexit.register(_results.close)
+    return _results